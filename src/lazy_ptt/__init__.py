@@ -1,6 +1,23 @@
 """Runtime package for the lazy_ptt push-to-talk workflow."""
 
+from __future__ import annotations
+
+from typing import Any
+
 from .config import AppConfig, load_config
-from .services import PTTDaemon, PTTOutcome, PTTService
 
 __all__ = ["AppConfig", "load_config", "PTTDaemon", "PTTOutcome", "PTTService"]
+
+_SERVICE_EXPORTS = ("PTTDaemon", "PTTOutcome", "PTTService")
+
+
+def __getattr__(name: str) -> Any:
+    # The service layer imports numpy, openai and the audio stack; only pay
+    # for it when it is actually used (PEP 562).
+    if name in _SERVICE_EXPORTS:
+        from . import services
+
+        value = getattr(services, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Completed idempotent responses kept at most; the oldest are evicted first.
+IDEMPOTENCY_MAX_ENTRIES = 1024
+
+
+def request_fingerprint(route: str, **parts: Any) -> str:
+    """Content hash identifying an API call: route, input and options."""
+
+    canonical = json.dumps({"route": route, **parts}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Runs at most one computation per key at a time.
+
+    Callers arriving while a computation for the same key is in flight wait
+    for it and share its result (or exception) instead of starting their own.
+    Keys are forgotten as soon as the computation finishes, so this only
+    de-duplicates concurrent work; see `IdempotencyCache` for repeats.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, "Future[Any]"] = {}
+        self._lock = threading.Lock()
+
+    def _claim(self, key: str) -> Tuple["Future[Any]", bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _settle(
+        self,
+        key: str,
+        future: "Future[Any]",
+        result: Any = None,
+        exc: Optional[BaseException] = None,
+    ) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return `(result, shared)`; `shared` is True for callers that piggybacked."""
+
+        future, leader = self._claim(key)
+        if not leader:
+            return future.result(), True
+        try:
+            result = func()
+        except BaseException as exc:
+            self._settle(key, future, exc=exc)
+            raise
+        self._settle(key, future, result)
+        return result, False
+
+    async def do_async(self, key: str, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        future, leader = self._claim(key)
+        if not leader:
+            # Shielded so a disconnecting follower never cancels the shared call.
+            return await asyncio.shield(asyncio.wrap_future(future)), True
+        try:
+            result = await func()
+        except BaseException as exc:
+            self._settle(key, future, exc=exc)
+            raise
+        self._settle(key, future, result)
+        return result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class IdempotencyConflictError(ValueError):
+    """An `Idempotency-Key` was reused for a different request."""
+
+
+class IdempotencyCache:
+    """Completed responses by `Idempotency-Key`, kept for `ttl_seconds`."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = IDEMPOTENCY_MAX_ENTRIES) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, fingerprint: str) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, stored_fingerprint, value = entry
+            if expires <= now:
+                del self._entries[key]
+                return None
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyConflictError(
+                f"Idempotency-Key {key!r} was already used for a different request"
+            )
+        return value
+
+    def put(self, key: str, fingerprint: str, value: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, fingerprint, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
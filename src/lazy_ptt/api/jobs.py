@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import ApiConfig
+from ..timing import StageTimer, collect_timings, log_timings
+
+LOGGER = logging.getLogger(__name__)
+
+_STOP = object()
+
+QUEUED = "queued"
+TRANSCRIBING = "transcribing"
+ENHANCING = "enhancing"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is rejected by admission control."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Job queue is full; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    """An audio file moving through the STT and enhancement worker pools."""
+
+    job_id: str
+    audio_path: Path
+    options: Dict[str, Any]
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    error: Optional[str] = None
+    outcome: Any = None
+    timer: StageTimer = field(default_factory=StageTimer, repr=False)
+    done: "Future[Any]" = field(default_factory=Future, repr=False)
+
+    def _set_status(self, status: str) -> None:
+        self.status = status
+        self.updated_at = time.time()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+
+class JobManager:
+    """Bounded two-stage worker pool behind `POST /jobs`.
+
+    Uploaded audio waits in a bounded STT queue; when that queue is full new
+    jobs are refused with a retry hint instead of piling onto the model.
+    Transcripts then go to a separate enhancement pool, so network-bound
+    OpenAI calls never hold an STT worker.
+    """
+
+    def __init__(self, service_getter: Callable[[], Any], config: ApiConfig) -> None:
+        self.service_getter = service_getter
+        self.config = config
+        self._stt_queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, config.max_queued_jobs))
+        # Admission is bounded at the STT queue; the enhancement queue only
+        # ever holds jobs that were already admitted.
+        self._enhance_queue: "queue.Queue[Any]" = queue.Queue()
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._stt_seconds = 5.0  # moving average used for Retry-After
+
+    # -- lifecycle -------------------------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            if self._workers:
+                return
+            for index in range(max(1, self.config.stt_workers)):
+                self._spawn(self._stt_loop, f"lazy-ptt-job-stt-{index}")
+            for index in range(max(1, self.config.enhance_workers)):
+                self._spawn(self._enhance_loop, f"lazy-ptt-job-enhance-{index}")
+
+    def _spawn(self, target: Callable[[], None], name: str) -> None:
+        worker = threading.Thread(target=target, name=name, daemon=True)
+        worker.start()
+        self._workers.append(worker)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in range(max(1, self.config.stt_workers)):
+            self._stt_queue.put(_STOP)
+        for _ in range(max(1, self.config.enhance_workers)):
+            self._enhance_queue.put(_STOP)
+        for worker in workers:
+            worker.join(timeout)
+
+    # -- submission ------------------------------------------------------
+
+    def submit(self, audio_path: Path, **options: Any) -> Job:
+        self.start()
+        self._prune()
+        job = Job(job_id=uuid.uuid4().hex, audio_path=audio_path, options=options)
+        try:
+            self._stt_queue.put_nowait(job)
+        except queue.Full:
+            raise QueueFullError(self.retry_after()) from None
+        with self._lock:
+            self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up."""
+
+        workers = max(1, self.config.stt_workers)
+        return max(1, round(self._stt_seconds * (self._stt_queue.qsize() / workers)))
+
+    def depths(self) -> Dict[str, int]:
+        return {"stt": self._stt_queue.qsize(), "enhance": self._enhance_queue.qsize()}
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.config.job_ttl_seconds
+        with self._lock:
+            expired = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.finished and job.updated_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    # -- workers ---------------------------------------------------------
+
+    def _stt_loop(self) -> None:
+        while True:
+            job = self._stt_queue.get()
+            if job is _STOP:
+                return
+            job._set_status(TRANSCRIBING)
+            started = time.perf_counter()
+            try:
+                with collect_timings(job.timer):
+                    transcription = self.service_getter().transcribe_file(job.audio_path)
+            except Exception as exc:
+                self._fail(job, exc)
+                continue
+            finally:
+                job.audio_path.unlink(missing_ok=True)
+                elapsed = time.perf_counter() - started
+                self._stt_seconds = 0.8 * self._stt_seconds + 0.2 * elapsed
+            job._set_status(ENHANCING)
+            self._enhance_queue.put((job, transcription))
+
+    def _enhance_loop(self) -> None:
+        while True:
+            item = self._enhance_queue.get()
+            if item is _STOP:
+                return
+            job, transcription = item
+            try:
+                with collect_timings(job.timer):
+                    outcome = self.service_getter().complete_transcription(
+                        transcription, **job.options
+                    )
+            except Exception as exc:
+                self._fail(job, exc)
+                continue
+            job.outcome = outcome
+            job._set_status(SUCCEEDED)
+            log_timings(
+                "api_job",
+                job.timer.as_dict(),
+                job_id=job.job_id,
+                audio_seconds=getattr(transcription, "duration", None),
+            )
+            job.done.set_result(outcome)
+
+    def _fail(self, job: Job, exc: BaseException) -> None:
+        LOGGER.warning("Job %s failed: %s", job.job_id, exc)
+        job.error = f"{type(exc).__name__}: {exc}"
+        job._set_status(FAILED)
+        job.done.set_result(None)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from ..audio.wav import WHISPER_SAMPLE_RATE, Pcm16Decoder
+from ..config import ConfigError
+from ..timing import StageTimer, collect_timings, log_timings
+
+LOGGER = logging.getLogger(__name__)
+
+# WebSocket close codes (RFC 6455).
+CLOSE_NORMAL = 1000
+CLOSE_UNSUPPORTED = 1003
+CLOSE_TOO_BIG = 1009
+CLOSE_ERROR = 1011
+
+_OPTION_KEYS = ("story_id", "story_title", "auto_move")
+
+
+def _normalize(word: str) -> str:
+    return word.strip(".,!?;:\"'").lower()
+
+
+class StablePrefix:
+    """Tracks which words of successive partial hypotheses have settled.
+
+    A word becomes stable once two consecutive decodes agree on it and on
+    everything before it. Stable words are never retracted, so clients can
+    render them as committed text and only repaint the unstable tail.
+    `seal()` commits everything last shown when the decode window moves on;
+    later hypotheses only cover audio after that point.
+    """
+
+    def __init__(self) -> None:
+        self._previous: List[str] = []
+        self._tail: List[str] = []
+        self._sealed = 0
+        self.stable: List[str] = []
+
+    def update(self, hypothesis: str) -> Tuple[str, str]:
+        words = hypothesis.split()
+        settled = self.stable[self._sealed :]
+        agreed = _common_prefix(self._previous, words)
+        kept = _common_prefix(settled, words)
+        if kept == len(settled) and agreed > kept:
+            self.stable = self.stable + words[kept:agreed]
+            kept = agreed
+        self._previous = words
+        # Past a disagreement with the stable words the hypothesis no longer
+        # lines up with them, so the tail starts where the two diverge.
+        self._tail = words[kept:]
+        return " ".join(self.stable), " ".join(self._tail)
+
+    def seal(self) -> None:
+        self.stable = self.stable + self._tail
+        self._sealed = len(self.stable)
+        self._previous = []
+        self._tail = []
+
+
+def _common_prefix(left: List[str], right: List[str]) -> int:
+    count = 0
+    for old, new in zip(left, right):
+        if _normalize(old) != _normalize(new):
+            break
+        count += 1
+    return count
+
+
+def _start_problem(control: Dict[str, Any]) -> Optional[str]:
+    """Why a `start` message is unacceptable, or None if it is fine."""
+
+    unknown = sorted(set(control) - {"type", "sample_rate", *_OPTION_KEYS})
+    if unknown:
+        return f"Unknown start option(s): {', '.join(unknown)}"
+    rate = control.get("sample_rate", WHISPER_SAMPLE_RATE)
+    if isinstance(rate, bool) or rate != WHISPER_SAMPLE_RATE:
+        return f"Only {WHISPER_SAMPLE_RATE} Hz PCM16 is supported"
+    for key in ("story_id", "story_title"):
+        value = control.get(key)
+        if value is not None and (not isinstance(value, str) or not value.strip()):
+            return f"{key} must be a non-empty string"
+    if not isinstance(control.get("auto_move", False), bool):
+        return "auto_move must be true or false"
+    return None
+
+
+class LiveSession:
+    """One `/ws/listen` connection: PCM frames in, partial transcripts out.
+
+    Protocol: an optional `{"type": "start", ...}` text message carrying
+    `story_id`, `story_title`, `auto_move` and `sample_rate`; binary frames of
+    16 kHz mono little-endian PCM16; then `{"type": "end"}`. Unknown or
+    malformed start options close the socket with an error. While audio
+    arrives the trailing `window_seconds` are decoded greedily every
+    `partial_seconds` of new audio and `{"type": "partial", "stable",
+    "unstable"}` is pushed whenever the text changes; once the window is full
+    the text shown so far is sealed as stable and a fresh window starts. On
+    end the full buffer is transcribed and enhanced and a `{"type": "result",
+    ...}` message with the `ProcessAudioResponse` fields is sent before the
+    socket closes.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        service: Any,
+        respond: Callable[[Any], Dict[str, Any]],
+        partial_seconds: float = 1.0,
+        max_seconds: Optional[float] = None,
+        window_seconds: float = 10.0,
+    ) -> None:
+        self.websocket = websocket
+        self.service = service
+        self.respond = respond
+        self.partial_samples = max(1, int(partial_seconds * WHISPER_SAMPLE_RATE))
+        self.max_samples = int(max_seconds * WHISPER_SAMPLE_RATE) if max_seconds else None
+        self.window_samples = max(self.partial_samples, int(window_seconds * WHISPER_SAMPLE_RATE))
+        self.decoder = Pcm16Decoder()
+        self.prefix = StablePrefix()
+        self.options: Dict[str, Any] = {}
+        self._decoded_at = 0
+        self._window_start = 0
+        self._last_sent: Optional[Tuple[str, str]] = None
+        self._partial: Optional["asyncio.Task[None]"] = None
+
+    async def run(self) -> None:
+        try:
+            if not await self._receive_audio():
+                return
+            if self._partial is not None:
+                await self._partial  # keep partials ordered before the result
+            samples = self.decoder.finish()
+            if not samples.size:
+                await self._fail(CLOSE_UNSUPPORTED, "No audio received")
+                return
+            outcome = await run_in_threadpool(self._finish, samples)
+            await self.websocket.send_json({"type": "result", **self.respond(outcome)})
+            await self.websocket.close(CLOSE_NORMAL)
+        except WebSocketDisconnect:
+            LOGGER.debug("Live client disconnected")
+        except Exception as exc:
+            # Like the SSE endpoint's `error` event: the client gets the reason,
+            # not just a bare 1011 close.
+            if not isinstance(exc, ConfigError):
+                LOGGER.exception("Live session failed")
+            await self._fail(CLOSE_ERROR, str(exc), type(exc).__name__)
+        finally:
+            if self._partial is not None and not self._partial.done():
+                self._partial.cancel()
+
+    async def _receive_audio(self) -> bool:
+        """Consume messages until `end`; False if the session was aborted."""
+
+        while True:
+            message = await self.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return False
+            data = message.get("bytes")
+            if data is not None:
+                self.decoder.feed(data)
+                count = self.decoder.sample_count
+                if self.max_samples is not None and count > self.max_samples:
+                    await self._fail(CLOSE_TOO_BIG, "Recording exceeds ptt.max_record_seconds")
+                    return False
+                self._maybe_decode_partial(count)
+                continue
+            try:
+                control = json.loads(message.get("text") or "")
+            except ValueError:
+                await self._fail(CLOSE_UNSUPPORTED, "Control messages must be JSON")
+                return False
+            kind = control.get("type") if isinstance(control, dict) else None
+            if kind == "end":
+                return True
+            if kind == "start":
+                problem = _start_problem(control)
+                if problem is not None:
+                    await self._fail(CLOSE_UNSUPPORTED, problem)
+                    return False
+                self.options.update(
+                    {key: control[key] for key in _OPTION_KEYS if key in control}
+                )
+                continue
+            await self._fail(CLOSE_UNSUPPORTED, f"Unknown message type {kind!r}")
+            return False
+
+    def _maybe_decode_partial(self, count: int) -> None:
+        if count - self._decoded_at < self.partial_samples:
+            return
+        if self._partial is not None and not self._partial.done():
+            return  # never queue decodes behind a slow one; catch up next time
+        if count - self._window_start > self.window_samples:
+            self.prefix.seal()
+            self._window_start = self._decoded_at
+        self._decoded_at = count
+        samples = self.decoder.finish()[self._window_start : count]
+        self._partial = asyncio.create_task(self._send_partial(samples))
+
+    async def _send_partial(self, samples: Any) -> None:
+        try:
+            text = await run_in_threadpool(self.service.preview_samples, samples)
+        except Exception as exc:  # partials are best effort
+            LOGGER.debug("Partial decode failed: %s", exc)
+            return
+        update = self.prefix.update(text)
+        if update != self._last_sent:
+            self._last_sent = update
+            stable, unstable = update
+            await self.websocket.send_json(
+                {"type": "partial", "stable": stable, "unstable": unstable}
+            )
+
+    def _finish(self, samples: Any) -> Any:
+        timer = StageTimer()
+        with collect_timings(timer):
+            transcription = self.service.transcribe_samples(samples)
+            outcome = self.service.complete_transcription(transcription, **self.options)
+        timings = timer.as_dict()
+        outcome.timings = timings
+        log_timings(
+            "api_live",
+            timings,
+            story_id=getattr(getattr(outcome, "saved_prompt", None), "story_id", None),
+            audio_seconds=round(samples.size / WHISPER_SAMPLE_RATE, 3),
+        )
+        return outcome
+
+    async def _fail(self, code: int, detail: str, error_type: Optional[str] = None) -> None:
+        message = {"type": "error", "detail": detail}
+        if error_type is not None:
+            message["error_type"] = error_type
+        try:
+            await self.websocket.send_json(message)
+            await self.websocket.close(code)
+        except (WebSocketDisconnect, RuntimeError):
+            pass
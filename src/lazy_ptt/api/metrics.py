@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Seconds; spans a cached text request up to a long dictation on CPU.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (16e3, 64e3, 256e3, 1e6, 4e6, 16e6, 64e6)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # One short critical section per update; no registry-wide lock.
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Mapping[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:  # pragma: no cover - abstract
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (+Inf last), sum, count.
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+                self._series[key] = series
+            series[0][index] += 1
+            series[1][0] += value
+            series[1][1] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[1][1]) if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            snapshot = [
+                (key, list(counts), list(totals))
+                for key, (counts, totals) in sorted(self._series.items())
+            ]
+        lines: List[str] = []
+        names = (*self.labelnames, "le")
+        for key, counts, (total, count) in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                labels = _format_labels(names, (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {_format_value(count)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-local metrics rendered in the Prometheus text exposition format."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, namespace: str = "lazy_ptt") -> None:
+        self.namespace = namespace
+        self._metrics: List[_Metric] = []
+
+    def _register(self, metric: _Metric) -> Any:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(
+            Histogram(f"{self.namespace}_{name}", documentation, labelnames, buckets)
+        )
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class ApiMetrics:
+    """The metric set exported by the lazy-ptt API."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.requests = r.counter(
+            "http_requests_total", "HTTP requests handled.", ("method", "route", "status")
+        )
+        self.in_flight = r.gauge("http_requests_in_flight", "HTTP requests being handled.")
+        self.request_seconds = r.histogram(
+            "http_request_duration_seconds", "HTTP request latency.", ("route",)
+        )
+        self.stage_seconds = r.histogram(
+            "stage_duration_seconds", "Pipeline stage latency.", ("stage",)
+        )
+        self.pipeline_seconds = r.histogram(
+            "pipeline_duration_seconds", "End-to-end pipeline latency.", ("event",)
+        )
+        self.model_loads = r.counter("model_loads_total", "Whisper model loads.")
+        self.model_loaded = r.gauge("model_loaded", "1 when the Whisper model is in memory.")
+        self.upload_bytes = r.histogram(
+            "upload_bytes", "Size of uploaded audio files.", buckets=SIZE_BUCKETS
+        )
+        self.errors = r.counter("errors_total", "Errors by exception type.", ("type",))
+        self.job_queue_depth = r.gauge(
+            "job_queue_depth", "Jobs waiting per worker pool.", ("stage",)
+        )
+        self.stt_batch_size = r.gauge(
+            "stt_batch_size", "Mean transcription batch size of the in-process batcher."
+        )
+        self.jobs_rejected = r.counter("jobs_rejected_total", "Jobs refused with 429.")
+        self.coalesced_requests = r.counter(
+            "coalesced_requests_total",
+            "Requests answered by an identical request already in flight.",
+            ("route",),
+        )
+        self.idempotent_replays = r.counter(
+            "idempotent_replays_total", "Responses replayed for a repeated Idempotency-Key."
+        )
+
+    def observe_timings(self, record: Mapping[str, Any]) -> None:
+        """Timing sink: fold one pipeline timing record into the histograms."""
+
+        stages = record.get("stages_ms", {})
+        for stage, ms in stages.items():
+            self.stage_seconds.observe(ms / 1000.0, stage=stage)
+        self.pipeline_seconds.observe(
+            record.get("total_ms", 0.0) / 1000.0, event=str(record.get("event", "unknown"))
+        )
+        if "model_load" in stages:
+            self.record_model_load()
+
+    def record_model_load(self) -> None:
+        self.model_loads.inc()
+        self.model_loaded.set(1)
+
+    def record_error(self, exc: BaseException) -> None:
+        self.errors.inc(type=type(exc).__name__)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware counting requests; cheaper than `BaseHTTPMiddleware`."""
+
+    def __init__(self, app: Any, metrics: ApiMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = {"code": 500}
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        metrics = self.metrics
+        metrics.in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            metrics.record_error(exc)
+            raise
+        finally:
+            metrics.in_flight.dec()
+            # The router stores the matched route in the scope; using its path
+            # template keeps label cardinality bounded.
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            metrics.request_seconds.observe(time.perf_counter() - started, route=route)
+            metrics.requests.inc(
+                method=scope.get("method", ""), route=route, status=str(status["code"])
+            )
@@ -1,15 +1,55 @@
 from __future__ import annotations
 
-import tempfile
+import asyncio
+import copy
+import ipaddress
+import json
+import logging
+import mimetypes
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import (
+    FastAPI,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    WebSocket,
+)
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
-from ..config import AppConfig, ConfigError, load_config
+from ..config import ApiConfig, AppConfig, ConfigError, ConfigWatcher, load_config
+from ..services.history import install_timing_history
 from ..services.ptt_service import PTTService
+from ..timing import add_timing_sink, remove_timing_sink
+from .coalesce import (
+    IdempotencyCache,
+    IdempotencyConflictError,
+    SingleFlight,
+    request_fingerprint,
+)
+from .jobs import Job, JobManager, QueueFullError
+from .live import CLOSE_ERROR, LiveSession
+from .metrics import ApiMetrics, MetricsMiddleware, MetricsRegistry
+from .uploads import (
+    ReceivedAudio,
+    UploadLimitMiddleware,
+    UploadTooLargeError,
+    iter_upload_file,
+    receive_audio,
+)
+
+LOGGER = logging.getLogger(__name__)
 
 
 class EnhanceTextRequest(BaseModel):
@@ -19,6 +59,13 @@ class EnhanceTextRequest(BaseModel):
     auto_move: bool = False
 
 
+class AmendRequest(BaseModel):
+    story_id: str = Field(min_length=1)
+    text: str = Field(min_length=1)
+    story_title: Optional[str] = None
+    auto_move: bool = False
+
+
 class ProcessAudioResponse(BaseModel):
     story_id: str
     prompt_path: str
@@ -27,13 +74,376 @@ class ProcessAudioResponse(BaseModel):
     transcription_text: str
 
 
+class EnhanceBatchRequest(BaseModel):
+    items: List[EnhanceTextRequest] = Field(min_length=1)
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    ok: bool
+    status_code: int = 200
+    result: Optional[ProcessAudioResponse] = None
+    error: Optional[str] = None
+    timings: Dict[str, float] = Field(default_factory=dict)
+
+
+class EnhanceBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    created_at: float
+    updated_at: float
+    error: Optional[str] = None
+    result: Optional[ProcessAudioResponse] = None
+    timings: Dict[str, float] = Field(default_factory=dict)
+
+
+class IndexedPromptResponse(BaseModel):
+    story_id: str
+    prompt_path: str
+    location: str
+    work_type: Optional[str] = None
+    summary: Optional[str] = None
+    revision: int = 1
+    updated_at: Optional[str] = None
+    snippet: Optional[str] = None
+
+
+class PromptPageResponse(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    next_offset: Optional[int] = None
+    items: List[IndexedPromptResponse]
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 def _service_from_env() -> PTTService:
     config: AppConfig = load_config()
+    install_timing_history(config)
     return PTTService.from_config(config)
 
 
-def build_app(service_factory=_service_from_env) -> FastAPI:
-    app = FastAPI(title="lazy-ptt API", version="0.1.0")
+class ServiceHolder:
+    """Owns the one `PTTService` shared by every request of an API process.
+
+    The service is built on first use (or by the app lifespan at startup) and
+    reused afterwards. `reload` builds a replacement first and swaps it in
+    atomically, so in-flight requests finish on the instance they started with
+    and a failing reload leaves the current service in place.
+
+    With a `watcher`, edits to `.env` or the config YAML are picked up by
+    `get` (checked at most once per watcher interval) and applied via
+    `apply_config`, without rebuilding unaffected components. Changes go to a
+    shallow copy that is then swapped in like a reload, so a running request
+    never sees a half-applied config.
+    """
+
+    def __init__(self, factory: Callable[[], Any], watcher: Optional[ConfigWatcher] = None) -> None:
+        self._factory = factory
+        self._service: Optional[Any] = None
+        self._lock = threading.Lock()
+        self.watcher = watcher
+        self.generation = 0
+
+    def get(self) -> Any:
+        service = self._service
+        if service is None:
+            with self._lock:
+                if self._service is None:
+                    self._service = self._factory()
+                    self.generation += 1
+                service = self._service
+        if self.watcher is not None:
+            service = self._apply_changes(service)
+        return service
+
+    def _apply_changes(self, service: Any) -> Any:
+        assert self.watcher is not None
+        config = self.watcher.poll()
+        if config is None or not hasattr(service, "apply_config"):
+            return service
+        try:
+            with self._lock:
+                if self._service is not service:
+                    return self._service  # reloaded meanwhile
+                updated = copy.copy(service)
+                updated.apply_config(config)
+                self._service = updated
+                return updated
+        except Exception as exc:
+            LOGGER.error("Could not apply the changed configuration: %s", exc)
+            return service
+
+    def reload(self) -> Any:
+        service = self._factory()
+        with self._lock:
+            previous, self._service = self._service, service
+            self.generation += 1
+        _close_storage(previous)
+        LOGGER.info("API service reloaded (generation %d)", self.generation)
+        return service
+
+    @property
+    def loaded(self) -> bool:
+        return self._service is not None
+
+    def close(self) -> None:
+        with self._lock:
+            previous, self._service = self._service, None
+        _close_storage(previous)
+
+
+def _close_storage(service: Any) -> None:
+    """Commit a retired service's write-behind prompt files.
+
+    Requests still running on it fall back to synchronous writes.
+    """
+
+    close = getattr(getattr(service, "storage", None), "close", None)
+    if callable(close):
+        close()
+
+
+def _is_loopback(request: Request) -> bool:
+    """Whether `request` came from this machine (admin routes are local-only)."""
+
+    host = request.client.host if request.client is not None else ""
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _warm_up(service: Any, metrics: Optional[ApiMetrics] = None) -> None:
+    """Load the Whisper model in the background so `/ready` flips once it is usable."""
+
+    transcriber = getattr(service, "transcriber", None)
+    load = getattr(transcriber, "load", None)
+    if load is None:
+        return
+
+    def run() -> None:
+        loaded = bool(getattr(transcriber, "is_loaded", False))
+        try:
+            load()
+        except Exception as exc:
+            LOGGER.warning("Whisper model preload failed: %s", exc)
+            return
+        # The preload runs outside any timed request, so count it here.
+        if metrics is not None and not loaded:
+            metrics.record_model_load()
+
+    threading.Thread(target=run, name="lazy-ptt-model-preload", daemon=True).start()
+
+
+def build_app(
+    service_factory=_service_from_env,
+    metrics: Optional[ApiMetrics] = None,
+    config_watcher: Optional[ConfigWatcher] = None,
+) -> FastAPI:
+    services = ServiceHolder(service_factory, config_watcher)
+
+    def reload_service() -> Any:
+        service = services.reload()
+        _warm_up(service, metrics)
+        return service
+
+    def _reload_logged() -> None:
+        try:
+            reload_service()
+        except Exception as exc:
+            LOGGER.error("API service reload failed; keeping the current one: %s", exc)
+
+    jobs: Dict[str, JobManager] = {}
+    jobs_lock = threading.Lock()
+
+    def api_settings() -> ApiConfig:
+        config = getattr(services.get(), "config", None)
+        return getattr(config, "api", None) or ApiConfig()
+
+    def job_manager() -> JobManager:
+        with jobs_lock:
+            if "manager" not in jobs:
+                jobs["manager"] = JobManager(services.get, api_settings())
+            return jobs["manager"]
+
+    # Identical concurrent requests share one pipeline run; completed results
+    # are replayed for a repeated Idempotency-Key.
+    flights = SingleFlight()
+    replays: Dict[str, IdempotencyCache] = {}
+
+    batch_pool: Dict[str, ThreadPoolExecutor] = {}
+
+    def batch_executor() -> ThreadPoolExecutor:
+        """Dedicated workers for batch items, sized to the enhancer's request limit."""
+
+        with jobs_lock:
+            if "executor" not in batch_pool:
+                openai = getattr(getattr(services.get(), "config", None), "openai", None)
+                batch_pool["executor"] = ThreadPoolExecutor(
+                    max_workers=max(1, getattr(openai, "max_concurrency", 4)),
+                    thread_name_prefix="lazy-ptt-batch",
+                )
+            return batch_pool["executor"]
+
+    def idempotency_cache() -> IdempotencyCache:
+        with jobs_lock:
+            if "cache" not in replays:
+                replays["cache"] = IdempotencyCache(api_settings().idempotency_ttl_seconds)
+            return replays["cache"]
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        # Timing sinks are process-wide; register this app's only while it runs.
+        add_timing_sink(metrics.observe_timings)
+        try:
+            _warm_up(services.get(), metrics)
+        except ConfigError as exc:
+            # Keep serving: requests report the problem as 400s until it is fixed
+            # and the service is reloaded.
+            LOGGER.error("API service could not be created: %s", exc)
+        loop = asyncio.get_running_loop()
+        hup = getattr(signal, "SIGHUP", None)
+        if hup is not None:
+            try:
+                loop.add_signal_handler(hup, lambda: loop.run_in_executor(None, _reload_logged))
+            except (NotImplementedError, RuntimeError, ValueError):
+                hup = None  # not the main thread, or unsupported platform
+        try:
+            yield
+        finally:
+            if hup is not None:
+                loop.remove_signal_handler(hup)
+            with jobs_lock:
+                manager = jobs.pop("manager", None)
+            if manager is not None:
+                await loop.run_in_executor(None, manager.stop)
+            with jobs_lock:
+                executor = batch_pool.pop("executor", None)
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            services.close()
+            remove_timing_sink(metrics.observe_timings)
+
+    app = FastAPI(title="lazy-ptt API", version="0.1.0", lifespan=lifespan)
+    app.state.services = services
+    metrics = metrics or ApiMetrics()
+    app.state.metrics = metrics
+
+    def upload_limit() -> int:
+        try:
+            return api_settings().max_upload_bytes
+        except ConfigError:  # handlers report this; keep the default gate meanwhile
+            return ApiConfig().max_upload_bytes
+
+    # Added first so it runs inside the metrics middleware and 413s are counted.
+    app.add_middleware(UploadLimitMiddleware, limit=upload_limit, on_reject=metrics.record_error)
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    def _bad_request(exc: ConfigError) -> HTTPException:
+        metrics.record_error(exc)
+        return HTTPException(status_code=400, detail=str(exc))
+
+    async def _receive_upload(
+        request: Request, audio: Optional[UploadFile], allow_samples: bool
+    ) -> ReceivedAudio:
+        """Stream a multipart file or a raw `audio/*` request body in fixed-size chunks."""
+
+        limit = api_settings().max_upload_bytes
+        if audio is not None:
+            chunks = iter_upload_file(audio)
+            suffix = Path(audio.filename or "upload").suffix or ".wav"
+        else:
+            # An oversized Content-Length was already refused by UploadLimitMiddleware.
+            chunks = request.stream()
+            content_type = request.headers.get("content-type", "").split(";")[0].strip()
+            suffix = mimetypes.guess_extension(content_type) or ".wav"
+        try:
+            received = await receive_audio(chunks, limit, suffix, allow_samples=allow_samples)
+        except UploadTooLargeError as exc:
+            metrics.record_error(exc)
+            raise HTTPException(status_code=413, detail=str(exc)) from exc
+        metrics.upload_bytes.observe(received.size)
+        if not received.size:
+            received.cleanup()
+            raise HTTPException(status_code=400, detail="No audio uploaded")
+        return received
+
+    def _replayed(
+        fingerprint: str, idempotency_key: Optional[str], response: Response
+    ) -> Optional[ProcessAudioResponse]:
+        if not idempotency_key:
+            return None
+        try:
+            cached = idempotency_cache().get(idempotency_key, fingerprint)
+        except IdempotencyConflictError as exc:
+            metrics.record_error(exc)
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        if cached is not None:
+            metrics.idempotent_replays.inc()
+            response.headers["Idempotent-Replayed"] = "true"
+        return cached
+
+    def _shared(
+        route: str,
+        fingerprint: str,
+        idempotency_key: Optional[str],
+        response: Response,
+        result: ProcessAudioResponse,
+        shared: bool,
+    ) -> ProcessAudioResponse:
+        if shared:
+            metrics.coalesced_requests.inc(route=route)
+            response.headers["X-Coalesced"] = "true"
+        if idempotency_key:
+            idempotency_cache().put(idempotency_key, fingerprint, result)
+        return result
+
+    def _deduplicated(
+        route: str,
+        fingerprint: str,
+        idempotency_key: Optional[str],
+        response: Response,
+        compute: Callable[[], ProcessAudioResponse],
+    ) -> ProcessAudioResponse:
+        cached = _replayed(fingerprint, idempotency_key, response)
+        if cached is not None:
+            return cached
+        result, shared = flights.do(fingerprint, compute)
+        return _shared(route, fingerprint, idempotency_key, response, result, shared)
+
+    async def _deduplicated_async(
+        route: str,
+        fingerprint: str,
+        idempotency_key: Optional[str],
+        response: Response,
+        compute: Callable[[], Awaitable[ProcessAudioResponse]],
+    ) -> ProcessAudioResponse:
+        cached = _replayed(fingerprint, idempotency_key, response)
+        if cached is not None:
+            return cached
+        result, shared = await flights.do_async(fingerprint, compute)
+        return _shared(route, fingerprint, idempotency_key, response, result, shared)
+
+    def _job_response(job: Job) -> JobStatusResponse:
+        return JobStatusResponse(
+            job_id=job.job_id,
+            status=job.status,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+            error=job.error,
+            result=_response_from_outcome(job.outcome) if job.outcome is not None else None,
+            timings=job.timer.as_dict() if job.finished else {},
+        )
 
     def _response_from_outcome(outcome) -> ProcessAudioResponse:
         return ProcessAudioResponse(
@@ -45,47 +455,249 @@ def build_app(service_factory=_service_from_env) -> FastAPI:
         )
 
     @app.post("/enhance-text", response_model=ProcessAudioResponse)
-    def enhance_text(req: EnhanceTextRequest):  # type: ignore[valid-type]
-        try:
-            service = service_factory()
-            outcome = service.enhance_text(
-                req.text,
-                story_id=req.story_id,
-                story_title=req.story_title,
-                auto_move=req.auto_move,
-            )
-            return _response_from_outcome(outcome)
+    def enhance_text(  # type: ignore[valid-type]
+        req: EnhanceTextRequest,
+        response: Response,
+        idempotency_key: Optional[str] = Header(None),
+    ):
+        def compute() -> ProcessAudioResponse:
+            try:
+                service = services.get()
+                outcome = service.enhance_text(
+                    req.text,
+                    story_id=req.story_id,
+                    story_title=req.story_title,
+                    auto_move=req.auto_move,
+                )
+                return _response_from_outcome(outcome)
+            except ConfigError as exc:
+                raise _bad_request(exc) from exc
+
+        fingerprint = request_fingerprint("/enhance-text", **req.model_dump())
+        return _deduplicated("/enhance-text", fingerprint, idempotency_key, response, compute)
+
+    @app.post("/enhance-text/batch", response_model=EnhanceBatchResponse)
+    async def enhance_text_batch(req: EnhanceBatchRequest):  # type: ignore[valid-type]
+        """Enhance many briefs concurrently; results keep request order.
+
+        Failures are reported per item, so one bad brief never fails the batch.
+        """
+
+        try:
+            limit = api_settings().batch_max_items
+            executor = batch_executor()
         except ConfigError as exc:
-            raise HTTPException(status_code=400, detail=str(exc)) from exc
+            raise _bad_request(exc) from exc
+        if len(req.items) > limit:
+            raise HTTPException(
+                status_code=413, detail=f"Batch has {len(req.items)} items; the limit is {limit}"
+            )
+
+        def run(index: int, item: EnhanceTextRequest) -> BatchItemResult:
+            def compute() -> Any:
+                return services.get().enhance_text(
+                    item.text,
+                    story_id=item.story_id,
+                    story_title=item.story_title,
+                    auto_move=item.auto_move,
+                )
+
+            try:
+                # Duplicates within a batch, or of a request in flight, share one run.
+                outcome, _shared = flights.do(
+                    request_fingerprint("/enhance-text/batch", **item.model_dump()), compute
+                )
+            except ConfigError as exc:
+                metrics.record_error(exc)
+                return BatchItemResult(index=index, ok=False, status_code=400, error=str(exc))
+            except Exception as exc:
+                metrics.record_error(exc)
+                LOGGER.exception("Batch item %d failed", index)
+                return BatchItemResult(
+                    index=index, ok=False, status_code=500, error=f"{type(exc).__name__}: {exc}"
+                )
+            return BatchItemResult(
+                index=index,
+                ok=True,
+                result=_response_from_outcome(outcome),
+                timings=getattr(outcome, "timings", None) or {},
+            )
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, run, index, item)
+                for index, item in enumerate(req.items)
+            )
+        )
+        succeeded = sum(1 for result in results if result.ok)
+        return EnhanceBatchResponse(
+            succeeded=succeeded, failed=len(results) - succeeded, results=list(results)
+        )
+
+    @app.post("/enhance-text/stream")
+    async def enhance_text_stream(req: EnhanceTextRequest):  # type: ignore[valid-type]
+        """Server-sent events: accepted, transcription, summary, section..., stored.
+
+        Failures after the stream has started arrive as an `error` event.
+        """
+
+        loop = asyncio.get_running_loop()
+        events: "asyncio.Queue[Optional[Tuple[str, Dict[str, Any]]]]" = asyncio.Queue()
+
+        def emit(event: str, data: Dict[str, Any]) -> None:
+            loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+        def run() -> None:
+            try:
+                outcome = services.get().enhance_text(
+                    req.text,
+                    story_id=req.story_id,
+                    story_title=req.story_title,
+                    auto_move=req.auto_move,
+                    on_progress=emit,
+                )
+                emit("stored", _response_from_outcome(outcome).model_dump())
+            except Exception as exc:
+                metrics.record_error(exc)
+                if not isinstance(exc, ConfigError):
+                    LOGGER.exception("Streaming enhancement failed")
+                emit("error", {"detail": str(exc), "type": type(exc).__name__})
+            finally:
+                loop.call_soon_threadsafe(events.put_nowait, None)
+
+        async def stream() -> AsyncIterator[str]:
+            yield _sse("accepted", {"text_length": len(req.text)})
+            worker = loop.run_in_executor(None, run)
+            while True:
+                item = await events.get()
+                if item is None:
+                    break
+                yield _sse(*item)
+            await worker
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.post("/amend", response_model=ProcessAudioResponse)
+    def amend(  # type: ignore[valid-type]
+        req: AmendRequest,
+        response: Response,
+        idempotency_key: Optional[str] = Header(None),
+    ):
+        def compute() -> ProcessAudioResponse:
+            try:
+                service = services.get()
+                outcome = service.amend_text(
+                    req.text,
+                    story_id=req.story_id,
+                    story_title=req.story_title,
+                    auto_move=req.auto_move,
+                )
+                return _response_from_outcome(outcome)
+            except ConfigError as exc:
+                raise _bad_request(exc) from exc
+
+        # Amendments are not idempotent by nature, so de-duplication matters most here.
+        fingerprint = request_fingerprint("/amend", **req.model_dump())
+        return _deduplicated("/amend", fingerprint, idempotency_key, response, compute)
 
     @app.post("/process-audio", response_model=ProcessAudioResponse)
     async def process_audio(  # type: ignore[valid-type]
-        audio: UploadFile = File(...),
+        request: Request,
+        response: Response,
+        audio: Optional[UploadFile] = File(None),
         story_id: Optional[str] = None,
         story_title: Optional[str] = None,
         auto_move: bool = False,
+        idempotency_key: Optional[str] = Header(None),
     ):
         try:
-            service = service_factory()
-            # Persist upload to a temp file to let existing pipeline handle formats.
-            suffix = Path(audio.filename or "upload").suffix or ".wav"
-            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-                data = await audio.read()
-                tmp.write(data)
-                tmp_path = Path(tmp.name)
+            service = services.get()
+        except ConfigError as exc:
+            raise _bad_request(exc) from exc
+        received = await _receive_upload(
+            request, audio, allow_samples=hasattr(service, "process_audio_samples")
+        )
+        options = {"story_id": story_id, "story_title": story_title, "auto_move": auto_move}
+
+        async def compute() -> ProcessAudioResponse:
             try:
-                outcome = await run_in_threadpool(
-                    service.process_audio_file,
-                    tmp_path,
-                    story_id=story_id,
-                    story_title=story_title,
-                    auto_move=auto_move,
-                )
-            finally:
-                tmp_path.unlink(missing_ok=True)
-            return _response_from_outcome(outcome)
+                if received.samples is not None:
+                    outcome = await run_in_threadpool(
+                        service.process_audio_samples, received.samples, **options
+                    )
+                else:
+                    outcome = await run_in_threadpool(
+                        service.process_audio_file, received.path, **options
+                    )
+                return _response_from_outcome(outcome)
+            except ConfigError as exc:
+                raise _bad_request(exc) from exc
+
+        fingerprint = request_fingerprint("/process-audio", audio=received.sha256, **options)
+        try:
+            return await _deduplicated_async(
+                "/process-audio", fingerprint, idempotency_key, response, compute
+            )
+        finally:
+            received.cleanup()
+
+    @app.post("/jobs", status_code=202, response_model=JobStatusResponse)
+    async def submit_job(  # type: ignore[valid-type]
+        request: Request,
+        audio: Optional[UploadFile] = File(None),
+        story_id: Optional[str] = None,
+        story_title: Optional[str] = None,
+        auto_move: bool = False,
+    ):
+        try:
+            manager = job_manager()
+        except ConfigError as exc:
+            raise _bad_request(exc) from exc
+        received = await _receive_upload(request, audio, allow_samples=False)
+        assert received.path is not None
+        try:
+            job = manager.submit(
+                received.path, story_id=story_id, story_title=story_title, auto_move=auto_move
+            )
+        except QueueFullError as exc:
+            received.cleanup()
+            metrics.jobs_rejected.inc()
+            raise HTTPException(
+                status_code=429,
+                detail=str(exc),
+                headers={"Retry-After": str(exc.retry_after)},
+            ) from exc
+        return JSONResponse(
+            _job_response(job).model_dump(),
+            status_code=202,
+            headers={"Location": f"/jobs/{job.job_id}"},
+        )
+
+    @app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+    async def job_status(  # type: ignore[valid-type]
+        job_id: str,
+        wait: float = Query(0.0, ge=0.0, description="Long-poll up to this many seconds."),
+    ):
+        try:
+            manager = job_manager()
         except ConfigError as exc:
-            raise HTTPException(status_code=400, detail=str(exc)) from exc
+            raise _bad_request(exc) from exc
+        job = manager.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job {job_id}")
+        timeout = min(wait, manager.config.max_wait_seconds)
+        if timeout > 0 and not job.finished:
+            try:
+                # Shielded so a timed-out poll never cancels the job's future.
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job.done)), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return _job_response(job)
 
     @app.post("/listen-once", response_model=ProcessAudioResponse)
     def listen_once(  # type: ignore[valid-type]
@@ -94,18 +706,105 @@ def build_app(service_factory=_service_from_env) -> FastAPI:
         auto_move: bool = False,
     ):
         try:
-            service = service_factory()
+            service = services.get()
             outcome = service.listen_once(
                 story_id=story_id, story_title=story_title, auto_move=auto_move
             )
             return _response_from_outcome(outcome)
         except ConfigError as exc:
-            raise HTTPException(status_code=400, detail=str(exc)) from exc
+            raise _bad_request(exc) from exc
+
+    @app.websocket("/ws/listen")
+    async def ws_listen(websocket: WebSocket):
+        await websocket.accept()
+        try:
+            service = services.get()
+            settings = api_settings()
+        except ConfigError as exc:
+            metrics.record_error(exc)
+            await websocket.send_json({"type": "error", "detail": str(exc)})
+            await websocket.close(CLOSE_ERROR)
+            return
+        ptt = getattr(getattr(service, "config", None), "ptt", None)
+        session = LiveSession(
+            websocket,
+            service,
+            lambda outcome: _response_from_outcome(outcome).model_dump(),
+            partial_seconds=settings.live_partial_seconds,
+            window_seconds=settings.live_window_seconds,
+            max_seconds=getattr(ptt, "max_record_seconds", None),
+        )
+        await session.run()
+
+    def prompt_index() -> Any:
+        try:
+            service = services.get()
+        except ConfigError as exc:
+            raise _bad_request(exc) from exc
+        index = getattr(getattr(service, "storage", None), "index", None)
+        if index is None:
+            raise HTTPException(status_code=404, detail="The prompt index is disabled")
+        return index
+
+    @app.get("/prompts", response_model=PromptPageResponse)
+    def list_prompts(  # type: ignore[valid-type]
+        limit: int = Query(20, ge=1, le=200),
+        offset: int = Query(0, ge=0),
+        work_type: Optional[str] = None,
+        location: Optional[str] = Query(None, pattern="^(staging|project-management)$"),
+    ):
+        page = prompt_index().list(limit, offset, work_type=work_type, location=location)
+        return page.to_dict()
+
+    @app.get("/prompts/search", response_model=PromptPageResponse)
+    def search_prompts(  # type: ignore[valid-type]
+        q: str = Query(..., min_length=1, description="Words that must all appear."),
+        limit: int = Query(20, ge=1, le=200),
+        offset: int = Query(0, ge=0),
+    ):
+        return prompt_index().search(q, limit, offset).to_dict()
+
+    @app.get("/metrics")
+    def prometheus_metrics():  # type: ignore[valid-type]
+        manager = jobs.get("manager")
+        if manager is not None:
+            for stage, depth in manager.depths().items():
+                metrics.job_queue_depth.set(depth, stage=stage)
+        if services.loaded:
+            stats = getattr(getattr(services.get(), "transcriber", None), "stats", None)
+            if callable(stats):
+                metrics.stt_batch_size.set(stats()["mean_batch_size"])
+        return PlainTextResponse(metrics.registry.render(), media_type=MetricsRegistry.CONTENT_TYPE)
+
+    @app.get("/ready")
+    def ready():  # type: ignore[valid-type]
+        try:
+            service = services.get()
+        except ConfigError as exc:
+            metrics.record_error(exc)
+            return JSONResponse({"ready": False, "detail": str(exc)}, status_code=503)
+        loaded = bool(getattr(getattr(service, "transcriber", None), "is_loaded", False))
+        metrics.model_loaded.set(1 if loaded else 0)
+        return JSONResponse(
+            {"ready": loaded, "model_loaded": loaded}, status_code=200 if loaded else 503
+        )
+
+    @app.post("/admin/reload")
+    def reload(request: Request):  # type: ignore[valid-type]
+        # Anyone who can reach the API could otherwise force rebuilds; remote
+        # operators use SIGHUP instead.
+        if not _is_loopback(request):
+            raise HTTPException(status_code=403, detail="/admin/reload is local-only")
+        try:
+            reload_service()
+        except ConfigError as exc:
+            raise _bad_request(exc) from exc
+        return {"reloaded": True, "generation": services.generation}
 
     return app
 
 
-app = build_app()
+app = build_app(config_watcher=ConfigWatcher())
 
 
 def main() -> None:
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..audio.wav import Pcm16Decoder, parse_wav_header
+
+UPLOAD_CHUNK_BYTES = 1 << 20
+# Enough to reach the `data` chunk of any reasonable WAV header (incl. LIST/bext).
+HEADER_SNIFF_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised as soon as a streamed upload exceeds the configured limit."""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(f"Upload exceeds the {limit} byte limit")
+        self.limit = limit
+
+
+class UploadLimitMiddleware:
+    """Pure ASGI middleware applying the upload limit before a body is parsed.
+
+    FastAPI spools a multipart form to disk before the handler runs, so a
+    check in the handler would come after the whole file had arrived. Here
+    a declared `Content-Length` over `limit()` is refused without reading
+    the body. A chunked body is cut off as soon as it crosses the limit, and
+    whatever error the app reports for the truncated body becomes a 413.
+    """
+
+    BODY_METHODS = ("POST", "PUT", "PATCH")
+
+    def __init__(
+        self,
+        app: Any,
+        limit: Callable[[], int],
+        on_reject: Optional[Callable[[BaseException], None]] = None,
+    ) -> None:
+        self.app = app
+        self.limit = limit
+        self.on_reject = on_reject
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope.get("method") not in self.BODY_METHODS:
+            await self.app(scope, receive, send)
+            return
+        limit = self.limit()
+        declared = dict(scope.get("headers") or []).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > limit:
+            await self._reject(send, limit)
+            return
+        state = {"received": 0, "exceeded": False, "replied": False}
+
+        async def limited_receive() -> Dict[str, Any]:
+            message = await receive()
+            if message["type"] == "http.request":
+                state["received"] += len(message.get("body", b""))
+                if state["received"] > limit:
+                    state["exceeded"] = True
+                    raise UploadTooLargeError(limit)
+            return message
+
+        async def guarded_send(message: Dict[str, Any]) -> None:
+            if not state["exceeded"]:
+                await send(message)
+            elif message["type"] == "http.response.start" and not state["replied"]:
+                await self._reject(send, limit)
+                state["replied"] = True
+            # otherwise: drop the body of the app's response to the truncated request
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not state["exceeded"] or state["replied"]:
+                raise
+            await self._reject(send, limit)
+
+    async def _reject(self, send: Any, limit: int) -> None:
+        error = UploadTooLargeError(limit)
+        if self.on_reject is not None:
+            self.on_reject(error)
+        body = json.dumps({"detail": str(error)}).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+@dataclass
+class ReceivedAudio:
+    """An upload that was either decoded to samples or spooled to a temp file."""
+
+    size: int
+    path: Optional[Path] = None
+    samples: Optional[np.ndarray] = None
+    sha256: str = ""
+
+    def cleanup(self) -> None:
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+async def iter_upload_file(upload: Any) -> AsyncIterator[bytes]:
+    """Chunks of a Starlette `UploadFile` (already spooled to disk by the parser)."""
+
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def receive_audio(
+    chunks: AsyncIterator[bytes],
+    max_bytes: int,
+    suffix: str = ".wav",
+    allow_samples: bool = True,
+) -> ReceivedAudio:
+    """Consume an upload chunk by chunk, enforcing `max_bytes` while streaming.
+
+    16 kHz mono PCM16 WAV is decoded straight into a sample array (when
+    `allow_samples`). Whisper needs the whole clip at once, so peak memory
+    for these uploads scales with the cap: up to `2 * max_bytes` (float32
+    samples are twice the size of PCM16) plus one chunk. Anything else is
+    written to a temp file for the format-agnostic decoder, in constant
+    memory.
+    """
+
+    size = 0
+    digest = hashlib.sha256()
+    head = b""
+    decoder: Optional[Pcm16Decoder] = None
+    handle: Optional[BinaryIO] = None
+    path: Optional[Path] = None
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLargeError(max_bytes)
+            digest.update(chunk)
+            if decoder is not None:
+                decoder.feed(chunk)
+                continue
+            if handle is not None:
+                handle.write(chunk)
+                continue
+            head += chunk
+            wav = parse_wav_header(head)
+            if wav is None and len(head) < HEADER_SNIFF_BYTES:
+                continue  # header may still be incomplete
+            if allow_samples and wav is not None and wav.whisper_native:
+                decoder = Pcm16Decoder(wav.data_size, max_bytes)
+                decoder.feed(head[wav.data_offset :])
+            else:
+                handle, path = _spool(suffix)
+                handle.write(head)
+            head = b""
+        if decoder is not None:
+            return ReceivedAudio(size=size, samples=decoder.finish(), sha256=digest.hexdigest())
+        if handle is None:
+            # Short upload that never completed a header: hand it to the decoder.
+            wav = parse_wav_header(head)
+            if allow_samples and wav is not None and wav.whisper_native:
+                decoder = Pcm16Decoder(wav.data_size, max_bytes)
+                decoder.feed(head[wav.data_offset :])
+                return ReceivedAudio(
+                    size=size, samples=decoder.finish(), sha256=digest.hexdigest()
+                )
+            handle, path = _spool(suffix)
+            handle.write(head)
+        handle.close()
+        handle = None
+        return ReceivedAudio(size=size, path=path, sha256=digest.hexdigest())
+    except BaseException:
+        if handle is not None:
+            handle.close()
+        if path is not None:
+            path.unlink(missing_ok=True)
+        raise
+
+
+def _spool(suffix: str) -> Tuple[BinaryIO, Path]:
+    fd, name = tempfile.mkstemp(suffix=suffix, prefix="lazy-ptt-upload-")
+    return os.fdopen(fd, "wb"), Path(name)
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Any, List, Tuple
 
-try:
-    import sounddevice as sd  # type: ignore
-except (ImportError, OSError):  # pragma: no cover - handle missing library or PortAudio
-    sd = None
+
+def load_sounddevice() -> Any:
+    """Import sounddevice on first use; the import initialises PortAudio.
+
+    Returns None when the package or the PortAudio library is missing.
+    """
+
+    try:
+        import sounddevice as sd  # type: ignore
+    except (ImportError, OSError):  # pragma: no cover - handle missing library or PortAudio
+        return None
+    return sd
 
 
 class DeviceError(RuntimeError):
@@ -18,6 +26,7 @@ def list_input_devices() -> List[Tuple[int, str]]:
     If sounddevice is unavailable, returns an empty list.
     """
 
+    sd = load_sounddevice()
     if sd is None:
         return []
     devices = []
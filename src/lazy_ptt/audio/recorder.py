@@ -4,14 +4,15 @@ import io
 import threading
 import wave
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
 
-try:
+from ..timing import timed
+from .devices import load_sounddevice
+
+if TYPE_CHECKING:
     import sounddevice as sd  # type: ignore
-except (ImportError, OSError):  # pragma: no cover - handle missing library or PortAudio
-    sd = None
 
 
 @dataclass
@@ -68,6 +69,7 @@ class AudioRecorder:
 
         self._buffers.clear()
 
+        sd = load_sounddevice()
         if sd is None:
             raise AudioCaptureError(
                 "sounddevice dependency missing. Install it with "
@@ -111,7 +113,8 @@ class AudioRecorder:
                 )
             )
 
-        wav_bytes = self._to_wav(audio)
+        with timed("encode"):
+            wav_bytes = self._to_wav(audio)
         return AudioBuffer(
             wav_bytes=wav_bytes,
             sample_rate=self.sample_rate,
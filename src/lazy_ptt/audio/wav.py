@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+# Whisper models consume 16 kHz mono float32 samples.
+WHISPER_SAMPLE_RATE = 16_000
+WAVE_FORMAT_PCM = 1
+_UNKNOWN_SIZES = (0, 0xFFFFFFFF)  # streamed WAVs leave the data size unset
+
+
+@dataclass(frozen=True)
+class WavFormat:
+    """Layout of a RIFF/WAVE stream up to the start of its sample data."""
+
+    audio_format: int
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    data_offset: int
+    data_size: Optional[int]
+
+    @property
+    def whisper_native(self) -> bool:
+        """16 kHz mono 16-bit PCM: samples can be fed to Whisper without resampling."""
+
+        return (
+            self.audio_format == WAVE_FORMAT_PCM
+            and self.channels == 1
+            and self.sample_rate == WHISPER_SAMPLE_RATE
+            and self.bits_per_sample == 16
+        )
+
+
+def parse_wav_header(head: bytes) -> Optional[WavFormat]:
+    """Parse the chunks before `data`; None if `head` is not (yet) a complete WAV header."""
+
+    if len(head) < 12 or head[:4] != b"RIFF" or head[8:12] != b"WAVE":
+        return None
+    offset = 12
+    fmt: Optional[tuple] = None
+    while offset + 8 <= len(head):
+        chunk_id, size = struct.unpack_from("<4sI", head, offset)
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            if body + 16 > len(head):
+                return None
+            fmt = struct.unpack_from("<HHIIHH", head, body)
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            audio_format, channels, sample_rate, _byte_rate, _align, bits = fmt
+            return WavFormat(
+                audio_format=audio_format,
+                channels=channels,
+                sample_rate=sample_rate,
+                bits_per_sample=bits,
+                data_offset=body,
+                data_size=None if size in _UNKNOWN_SIZES else size,
+            )
+        offset = body + size + (size & 1)  # chunks are word aligned
+    return None
+
+
+class Pcm16Decoder:
+    """Incrementally converts little-endian PCM16 bytes to float32 samples.
+
+    When the WAV header declares the data size the output array is allocated
+    once up front, so decoding never holds more than the samples plus one
+    input chunk. float32 samples take twice the bytes of PCM16, so that is
+    about twice the data size. The header is untrusted: `max_bytes` caps the
+    allocation, so a header claiming gigabytes cannot allocate more than the
+    caller would ever accept. Without a declared size the array is sized for
+    `max_bytes` instead (untouched pages cost no memory on most systems), so
+    the bound holds either way: at most `2 * max_bytes` plus one chunk.
+    """
+
+    def __init__(self, data_size: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        self._carry = b""
+        self._filled = 0
+        self._parts: List[np.ndarray] = []
+        self._remaining = data_size
+        if max_bytes is not None:
+            data_size = min(data_size, max_bytes) if data_size else max_bytes
+        self._samples: Optional[np.ndarray] = (
+            np.empty(data_size // 2, dtype=np.float32) if data_size else None
+        )
+
+    def feed(self, data: bytes) -> None:
+        if self._remaining is not None:
+            data = data[: self._remaining]  # ignore trailing chunks (LIST, id3...)
+            self._remaining -= len(data)
+        if self._carry:
+            data = self._carry + data
+        usable = len(data) - (len(data) & 1)
+        self._carry = data[usable:]
+        if not usable:
+            return
+        block = np.frombuffer(data[:usable], dtype="<i2").astype(np.float32)
+        block /= 32768.0
+        if self._samples is not None:
+            end = min(self._filled + block.size, self._samples.size)
+            self._samples[self._filled : end] = block[: end - self._filled]
+            self._filled = end
+        else:
+            self._parts.append(block)
+            self._filled += block.size
+
+    @property
+    def sample_count(self) -> int:
+        return self._filled
+
+    def finish(self) -> np.ndarray:
+        """Samples decoded so far; may be called repeatedly while feeding."""
+
+        if self._samples is not None:
+            return self._samples[: self._filled]
+        if not self._parts:
+            return np.zeros(0, dtype=np.float32)
+        if len(self._parts) > 1:
+            self._parts = [np.concatenate(self._parts)]  # collapse so frames are joined once
+        return self._parts[0]
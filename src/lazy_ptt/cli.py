@@ -1,22 +1,32 @@
 from __future__ import annotations
 
 import argparse
+import dataclasses
+import json
 import logging
 import sys
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from .config import AppConfig, ConfigError, load_config
-from .services.daemon import PTTDaemon
-from .services.ptt_service import PTTService
-from .audio.devices import list_input_devices
+from .config import AppConfig, ConfigError, load_config, parse_workspace
+from .timing import TIMINGS_LOGGER, format_timings
 
+# Everything heavier than config/timing (numpy, openai, faster-whisper,
+# sounddevice, pynput) is imported inside the handlers that need it, so
+# `--help`, `create-feature` or a command forwarded to the daemon start fast.
+if TYPE_CHECKING:
+    from .services.ptt_service import PTTService
 
-def _configure_logging(verbose: bool) -> None:
+
+def _configure_logging(verbose: bool, timings: bool = False) -> None:
     level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(
         level=level,
         format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
     )
+    # Structured per-stage timing records are opt-in on the command line.
+    TIMINGS_LOGGER.setLevel(logging.INFO if verbose or timings else logging.WARNING)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -31,6 +41,26 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Enable verbose logging output.",
     )
+    parser.add_argument(
+        "--compact-transcript",
+        action="store_true",
+        help="Strip fillers and repeated phrases from the brief before enhancement.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-stage latency for each run and log it as JSON records.",
+    )
+    parser.add_argument(
+        "--defer-enhancement",
+        action="store_true",
+        help="Save transcripts as drafts immediately and enhance them from a background queue.",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run in this process even when a daemon is listening on its control socket.",
+    )
 
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -69,6 +99,26 @@ def build_parser() -> argparse.ArgumentParser:
         help="Keep prompt in staging instead of moving to project-management (auto-move is DEFAULT).",
     )
 
+    amend = subparsers.add_parser(
+        "amend",
+        help="Update an existing prompt from a follow-up note instead of regenerating it.",
+    )
+    target = amend.add_mutually_exclusive_group(required=True)
+    target.add_argument("prompt_path", type=Path, nargs="?", help="Path to the saved prompt.")
+    target.add_argument("--story", dest="amend_story_id", help="Story ID to amend.")
+    amend.add_argument("--text", help="Follow-up note.")
+    amend.add_argument("--file", type=Path, help="Path to a text file containing the note.")
+    amend.add_argument("--audio", type=Path, help="Audio file to transcribe as the note.")
+    amend.add_argument("--story-title", help="Optional story title.")
+    amend.add_argument(
+        "--no-auto-move",
+        action="store_true",
+        help=(
+            "Keep prompt in staging instead of moving to project-management "
+            "(auto-move is DEFAULT)."
+        ),
+    )
+
     create = subparsers.add_parser(
         "create-feature",
         help="Move a generated prompt into project-management.",
@@ -87,6 +137,101 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Print a summary to stdout after each capture.",
     )
+    daemon.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Capture the next brief while earlier ones are still transcribed/enhanced.",
+    )
+    daemon.add_argument(
+        "--isolate-inference",
+        action="store_true",
+        help="Run STT/enhancement in a separate, restartable worker process.",
+    )
+    daemon.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="Disable the crash-safe job journal (unfinished captures are not resumed).",
+    )
+    daemon.add_argument(
+        "--no-config-reload",
+        action="store_true",
+        help="Ignore edits to .env/config YAML until restart (applied live by default).",
+    )
+    daemon.add_argument(
+        "--no-control-socket",
+        action="store_true",
+        help="Do not accept forwarded enhance-text/process-audio/amend commands.",
+    )
+    daemon.add_argument(
+        "--workspace",
+        action="append",
+        dest="workspaces",
+        metavar="[NAME=]PATH",
+        help="Also serve this project root, sharing the loaded model (repeatable).",
+    )
+    daemon.add_argument(
+        "--queue-size",
+        type=int,
+        default=4,
+        help="Maximum captures waiting per pipeline stage (with --pipeline).",
+    )
+
+    listing = subparsers.add_parser("list", help="List saved prompts, most recent first.")
+    listing.add_argument("--work-type", help="Only prompts of this work type (e.g. FEATURE).")
+    listing.add_argument(
+        "--location",
+        choices=("staging", "project-management"),
+        help="Only prompts in staging or only those moved to project-management.",
+    )
+    search = subparsers.add_parser(
+        "search", help="Full-text search over saved prompts (summary, plan, original brief)."
+    )
+    search.add_argument("query", nargs="+", help="Words that must all appear.")
+    for command in (listing, search):
+        command.add_argument("--limit", type=int, default=20, help="Results per page.")
+        command.add_argument("--offset", type=int, default=0, help="Results to skip.")
+        command.add_argument("--json", action="store_true", help="Print the page as JSON.")
+
+    subparsers.add_parser(
+        "reindex", help="Rebuild the prompt index from the prompts on disk."
+    )
+
+    workspace = subparsers.add_parser(
+        "workspace",
+        help="List the running daemon's workspaces, or make NAME the active one.",
+    )
+    workspace.add_argument("name", nargs="?", help="Workspace to record into from now on.")
+
+    subparsers.add_parser(
+        "drain-queue",
+        help="Enhance every pending deferred draft now (retries failures later).",
+    )
+
+    stats = subparsers.add_parser(
+        "stats", help="Show latency percentiles from the recorded timing history."
+    )
+    stats.add_argument(
+        "--window",
+        action="append",
+        dest="windows",
+        help="Time window such as 1h, 24h or 7d (repeatable; default: 24h, 7d, 30d).",
+    )
+    stats.add_argument("--json", action="store_true", help="Print the summary as JSON.")
+
+    model_server = subparsers.add_parser(
+        "model-server",
+        help="Serve one shared Whisper model over a Unix socket (see whisper.server_socket).",
+    )
+    model_server.add_argument(
+        "--socket",
+        type=Path,
+        help="Socket path (default: whisper.server_socket or .lazy-ptt/whisper.sock).",
+    )
+    model_server.add_argument(
+        "--lazy-load",
+        action="store_true",
+        help="Load the model on the first request instead of at startup.",
+    )
 
     subparsers.add_parser("devices", help="List input audio devices and indices.")
 
@@ -113,7 +258,33 @@ def _load_text(args: argparse.Namespace) -> str:
 
 def _resolve_config(args: argparse.Namespace) -> AppConfig:
     # Precedence: built-in defaults < --config YAML < environment variables.
-    return load_config(args.config) if getattr(args, "config", None) else load_config()
+    config = load_config(args.config) if getattr(args, "config", None) else load_config()
+    return _apply_cli_overrides(config, args)
+
+
+def _apply_cli_overrides(config: AppConfig, args: argparse.Namespace) -> AppConfig:
+    if getattr(args, "compact_transcript", False):
+        config = dataclasses.replace(
+            config, compaction=dataclasses.replace(config.compaction, enabled=True)
+        )
+    if getattr(args, "defer_enhancement", False) or args.command == "drain-queue":
+        config = dataclasses.replace(
+            config, deferred=dataclasses.replace(config.deferred, enabled=True)
+        )
+    return config
+
+
+def _print_compaction(outcome) -> None:
+    if getattr(outcome, "compaction", None) is not None:
+        print(f"Brief compacted: {outcome.compaction.describe()}")
+    if getattr(outcome, "deferred", False):
+        print("⏳ Draft saved; enhancement queued (processed by the daemon or `drain-queue`)")
+
+
+def _print_timings(outcome, args: argparse.Namespace) -> None:
+    if getattr(args, "timings", False):
+        print("Stage timings:")
+        print(format_timings(getattr(outcome, "timings", {})))
 
 
 def cmd_listen(service: PTTService, args: argparse.Namespace) -> int:
@@ -131,6 +302,8 @@ def cmd_listen(service: PTTService, args: argparse.Namespace) -> int:
         print("📦 Prompt kept in staging (use --no-auto-move to disable auto-move)")
     print(f"Detected work type: {outcome.enhanced.work_type}")
     print(f"Summary: {outcome.enhanced.summary}")
+    _print_compaction(outcome)
+    _print_timings(outcome, args)
     return 0
 
 
@@ -149,6 +322,8 @@ def cmd_enhance_text(service: PTTService, args: argparse.Namespace) -> int:
     else:
         print("📦 Prompt kept in staging (use --no-auto-move to disable auto-move)")
     print(f"Detected work type: {outcome.enhanced.work_type}")
+    _print_compaction(outcome)
+    _print_timings(outcome, args)
     return 0
 
 
@@ -166,15 +341,45 @@ def cmd_process_audio(service: PTTService, args: argparse.Namespace) -> int:
     else:
         print("📦 Prompt kept in staging (use --no-auto-move to disable auto-move)")
     print(f"Detected work type: {outcome.enhanced.work_type}")
+    _print_compaction(outcome)
+    _print_timings(outcome, args)
+    return 0
+
+
+def cmd_amend(service: PTTService, args: argparse.Namespace) -> int:
+    if args.audio:
+        transcription = service.transcriber.transcribe_file(
+            args.audio, language=service.config.ptt.language
+        )
+        text = transcription.text
+    else:
+        text = _load_text(args)
+    auto_move = not args.no_auto_move  # DEFAULT is True (auto-move enabled)
+    outcome = service.amend_text(
+        text,
+        prompt_path=args.prompt_path,
+        story_id=args.amend_story_id,
+        story_title=args.story_title,
+        auto_move=auto_move,
+    )
+    print(
+        f"Prompt amended: {outcome.saved_prompt.prompt_path} "
+        f"(revision {outcome.saved_prompt.revision})"
+    )
+    print(f"Detected work type: {outcome.enhanced.work_type}")
+    _print_compaction(outcome)
+    _print_timings(outcome, args)
     return 0
 
 
-def cmd_create_feature(service: PTTService, args: argparse.Namespace) -> int:
-    storage = service.storage
+def cmd_create_feature(config: AppConfig, args: argparse.Namespace) -> int:
+    from .prompt.manager import PromptStorage
+
+    storage = PromptStorage.from_config(config)
     saved = storage.load_saved_prompt(args.prompt_path)
     dest = storage.relocate_to_project_management(
         saved,
-        service.config.paths.project_management_root,
+        config.paths.project_management_root,
         story_title=args.story_title,
     )
     print(f"Prompt moved to project-management: {dest}")
@@ -191,22 +396,240 @@ def cmd_daemon(service: PTTService, args: argparse.Namespace) -> int:
                 f"[{status}] Prompt: {outcome.saved_prompt.prompt_path} "
                 f"({outcome.enhanced.work_type})"
             )
+            _print_compaction(outcome)
+            _print_timings(outcome, args)
 
     print(f"🎤 Daemon started. Press {service.config.ptt.hotkey} to capture voice anytime.")
     print(f"Auto-move: {'✅ ENABLED (saves to project-management)' if auto_move else '❌ DISABLED (saves to staging)'}")
     print(f"Working directory: {Path.cwd()}")
     print("")
 
+    from .input.hotkey import PersistentHotkeyListener
+    from .services.daemon import PTTDaemon
+
+    workspaces = None
+    if service.config.workspaces or args.workspaces:
+        from .services.workspaces import WorkspaceRegistry
+
+        if args.isolate_inference:
+            print("❌ --isolate-inference serves a single project; drop it to use workspaces.")
+            return 2
+        try:
+            requested = [*service.config.workspaces, *map(parse_workspace, args.workspaces or [])]
+            workspaces = WorkspaceRegistry.from_config(service, requested)
+        except ConfigError as exc:
+            print(f"❌ {exc}")
+            return 2
+        for entry in workspaces:
+            hotkey = f" (hotkey {entry.hotkey})" if entry.hotkey else ""
+            print(f"Workspace {entry.name}: {entry.root}{hotkey}")
+        print(f"Active workspace: {workspaces.active.name} (switch with `lazy-ptt workspace`)")
+        print("")
+
+    worker = None
+    if args.isolate_inference:
+        from .services.worker_process import InferenceWorkerProcess
+
+        worker = InferenceWorkerProcess(service.config)
+        worker.start()
+
+    journal = None
+    if not args.no_journal:
+        from .services.journal import JobJournal
+
+        journal = JobJournal(service.config.paths.state_dir / "journal.sqlite3")
+
+    watcher = None
+    if not args.no_config_reload:
+        from .config import ConfigWatcher
+
+        watcher = ConfigWatcher(
+            getattr(args, "config", None), transform=lambda c: _apply_cli_overrides(c, args)
+        )
+        watcher.poll()  # baseline: the config the daemon starts with
+
     daemon = PTTDaemon(
         service,
+        journal=journal,
+        config_watcher=watcher,
+        workspaces=workspaces,
+        hotkey_events=PersistentHotkeyListener(service.config.ptt.hotkey),
+        processor=worker,
         auto_move=auto_move,
         on_cycle=_log_cycle if args.verbose_cycle else None,
+        pipelined=args.pipeline,
+        queue_size=args.queue_size,
+        log_pipeline_stats=args.verbose_cycle,
+    )
+
+    control = None
+    if not args.no_control_socket:
+        from .services.control import CONTROL_SOCKET_FILENAME, ControlServer
+
+        try:
+            control = ControlServer(
+                daemon.services,
+                service.config.paths.state_dir / CONTROL_SOCKET_FILENAME,
+                workspaces=workspaces,
+            )
+        except ConfigError as exc:
+            print(f"⚠️  Control socket disabled: {exc}")
+        else:
+            control.start()
+            if worker is None:
+                # Forwarded commands should pay transcription time only, not the model load.
+                threading.Thread(
+                    target=service.transcriber.load, name="lazy-ptt-warmup", daemon=True
+                ).start()
+
+    try:
+        with daemon.stop_on_sigterm():
+            daemon.run()
+    finally:
+        if control is not None:
+            control.stop()
+        if worker is not None:
+            worker.stop()
+        if journal is not None:
+            journal.close()
+    return 0
+
+
+def _prompt_index(config: AppConfig):
+    from .prompt.index import open_prompt_index
+
+    index = open_prompt_index(config)
+    if index is None:
+        print("The prompt index is disabled or unavailable (PTT_PROMPT_INDEX).")
+    return index
+
+
+def _print_prompt_page(page, args: argparse.Namespace) -> None:
+    if args.json:
+        print(json.dumps(page.to_dict(), indent=2))
+        return
+    if not page.total:
+        print("No prompts found.")
+        if args.command == "list":
+            print("Prompts saved before the index existed appear after `lazy-ptt reindex`.")
+        return
+    for item in page.items:
+        print(f"{item.story_id}  [{item.work_type}]  {item.updated_at or ''}  ({item.location})")
+        print(f"    {item.snippet or item.summary}")
+        print(f"    {item.prompt_path}")
+    shown = f"{page.offset + 1}-{page.offset + len(page.items)}" if page.items else "none"
+    more = f"; next page: --offset {page.next_offset}" if page.next_offset is not None else ""
+    print(f"Showing {shown} of {page.total}{more}")
+
+
+def cmd_list(config: AppConfig, args: argparse.Namespace) -> int:
+    index = _prompt_index(config)
+    if index is None:
+        return 1
+    page = index.list(
+        limit=args.limit, offset=args.offset, work_type=args.work_type, location=args.location
     )
-    daemon.run()
+    _print_prompt_page(page, args)
+    return 0
+
+
+def cmd_search(config: AppConfig, args: argparse.Namespace) -> int:
+    index = _prompt_index(config)
+    if index is None:
+        return 1
+    _print_prompt_page(index.search(" ".join(args.query), args.limit, args.offset), args)
+    return 0
+
+
+def cmd_reindex(config: AppConfig, _args: argparse.Namespace) -> int:
+    from .prompt.index import index_roots
+
+    index = _prompt_index(config)
+    if index is None:
+        return 1
+    count = index.rebuild(index_roots(config), config.prompt.metadata_filename)
+    print(f"Indexed {count} prompt(s) into {index.path}")
+    return 0
+
+
+def cmd_workspace(config: AppConfig, args: argparse.Namespace) -> int:
+    from .services.control import CONTROL_SOCKET_FILENAME, DaemonClient
+
+    client = DaemonClient.connect(config.paths.state_dir / CONTROL_SOCKET_FILENAME, config)
+    if client is None:
+        print("No daemon is running for this project (start one with `lazy-ptt daemon`).")
+        return 1
+    try:
+        workspaces = client.activate_workspace(args.name) if args.name else client.workspaces()
+    finally:
+        client.close()
+    for workspace in workspaces:
+        marker = "*" if workspace["active"] else " "
+        hotkey = f"  [{workspace['hotkey']}]" if workspace["hotkey"] else ""
+        print(f"{marker} {workspace['name']}: {workspace['root']}{hotkey}")
+    return 0
+
+
+def cmd_drain_queue(service: PTTService, _args: argparse.Namespace) -> int:
+    from .services.deferred import DeferredEnhancementWorker
+
+    queue = service.enhancement_queue
+    assert queue is not None
+    worker = DeferredEnhancementWorker(service, queue)
+    completed = worker.run_pending()
+    remaining = len(queue)
+    print(f"Enhanced {completed} queued draft(s); {remaining} still pending.")
+    return 0 if remaining == 0 else 1
+
+
+def cmd_stats(config: AppConfig, args: argparse.Namespace) -> int:
+    from .services.history import format_summaries, history_for_config, summarize
+
+    history = history_for_config(config)
+    if history is None:
+        print("Timing history is disabled (PTT_TIMING_HISTORY=false).")
+        return 1
+    windows = args.windows or ["24h", "7d", "30d"]
+    summaries = summarize(history.load(), windows)
+    if args.json:
+        print(json.dumps([summary.to_dict() for summary in summaries], indent=2))
+    else:
+        print(format_summaries(summaries), end="")
+    return 0
+
+
+def cmd_model_server(service: PTTService, args: argparse.Namespace) -> int:
+    from .stt.server import SOCKET_FILENAME, ModelServer
+    from .stt.whisper import WhisperTranscriber
+
+    whisper = service.config.whisper
+    socket_path = args.socket or whisper.server_socket or (
+        service.config.paths.state_dir / SOCKET_FILENAME
+    )
+    # The server owns the model, so it must never be a client of itself.
+    transcriber = WhisperTranscriber(dataclasses.replace(whisper, server_socket=None))
+    server = ModelServer(
+        transcriber,
+        socket_path,
+        max_batch_size=whisper.batch_max_size,
+        max_wait_seconds=whisper.batch_max_wait_ms / 1000.0,
+    )
+    try:
+        if not args.lazy_load:
+            transcriber.load()
+        print(f"🧠 Model server ({whisper.model_size}) listening on {socket_path}")
+        print(f"Clients: set PTT_WHISPER_SERVER_SOCKET={socket_path}")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
     return 0
 
 
 def cmd_devices(_service: PTTService | None, _args: argparse.Namespace) -> int:
+    from .audio.devices import list_input_devices
+
     devices = list_input_devices()
     if not devices:
         print(
@@ -274,6 +697,8 @@ def cmd_init(_service: PTTService | None, args: argparse.Namespace) -> int:
 
     # 3. Check audio devices
     print("\n3️⃣  Checking audio devices...")
+    from .audio.devices import list_input_devices
+
     devices = list_input_devices()
     if not devices:
         print("   ⚠️  No audio devices found. Please check PortAudio installation.")
@@ -361,23 +786,58 @@ COMMAND_HANDLERS = {
     "listen": cmd_listen,
     "enhance-text": cmd_enhance_text,
     "process-audio": cmd_process_audio,
-    "create-feature": cmd_create_feature,
+    "amend": cmd_amend,
     "daemon": cmd_daemon,
+    "drain-queue": cmd_drain_queue,
+    "model-server": cmd_model_server,
     "devices": cmd_devices,
     "init": cmd_init,
 }
 
+# Commands that only need the resolved configuration, not a `PTTService`.
+CONFIG_COMMAND_HANDLERS = {
+    "create-feature": cmd_create_feature,
+    "stats": cmd_stats,
+    "workspace": cmd_workspace,
+    "list": cmd_list,
+    "search": cmd_search,
+    "reindex": cmd_reindex,
+}
+
+
+# Commands a running daemon can execute on the CLI's behalf.
+DAEMON_COMMANDS = ("enhance-text", "process-audio", "amend")
+
+
+def _daemon_client(config: AppConfig, args: argparse.Namespace):
+    if args.command not in DAEMON_COMMANDS or args.no_daemon:
+        return None
+    # The daemon runs with its own settings; per-invocation overrides need a local service.
+    if args.compact_transcript or args.defer_enhancement:
+        return None
+    from .services.control import CONTROL_SOCKET_FILENAME, DaemonClient
+
+    return DaemonClient.connect(config.paths.state_dir / CONTROL_SOCKET_FILENAME, config)
+
 
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
-    _configure_logging(args.verbose)
+    _configure_logging(args.verbose, args.timings)
     # Commands that do not require full service wiring
     if args.command in ("devices", "init"):
         return COMMAND_HANDLERS[args.command](None, args)
     try:
         config = _resolve_config(args)
-        service = PTTService.from_config(config)
+        if args.command in CONFIG_COMMAND_HANDLERS:
+            return CONFIG_COMMAND_HANDLERS[args.command](config, args)
+        service = _daemon_client(config, args)
+        if service is None:
+            from .services.history import install_timing_history
+            from .services.ptt_service import PTTService
+
+            install_timing_history(config)
+            service = PTTService.from_config(config)
     except ConfigError as exc:
         parser.error(str(exc))
         return 2
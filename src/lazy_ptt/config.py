@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import functools
 import json
+import logging
 import os
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field, fields, is_dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yaml
-from dotenv import load_dotenv
+from dotenv import dotenv_values, find_dotenv
 try:  # Python 3.9+ importlib.resources modern API
     from importlib.resources import files as _res_files  # type: ignore
 except Exception:  # pragma: no cover - fallback for very old Python
@@ -21,6 +25,13 @@ class ProjectPaths:
     repository_root: Path
     project_management_root: Path
     prompt_output_root: Path
+    state_root: Optional[Path] = None
+
+    @property
+    def state_dir(self) -> Path:
+        """Directory for runtime state (queues, journals, sockets)."""
+
+        return self.state_root or (self.repository_root / ".lazy-ptt")
 
 
 @dataclass(frozen=True)
@@ -44,6 +55,15 @@ class WhisperConfig:
     device: str
     compute_type: str
     download_root: Path
+    # Set to use a shared `lazy-ptt model-server` instead of an in-process model.
+    server_socket: Optional[Path] = None
+    # Decode profile; changes apply to a running daemon/API without a model reload.
+    beam_size: int = 5
+    vad_filter: bool = True
+    # Batch concurrent in-process transcriptions (API workers without a model server).
+    batching: bool = False
+    batch_max_size: int = 8
+    batch_max_wait_ms: float = 10.0
 
 
 @dataclass(frozen=True)
@@ -55,6 +75,7 @@ class OpenAIConfig:
     temperature: float
     max_output_tokens: int
     base_url: Optional[str]
+    max_concurrency: int = 4
 
 
 @dataclass(frozen=True)
@@ -63,6 +84,60 @@ class PromptConfig:
 
     filename_pattern: str
     metadata_filename: str
+    index: bool = True
+    write_behind: bool = False
+
+
+@dataclass(frozen=True)
+class CompactionConfig:
+    """Deterministic transcript clean-up applied before prompt enhancement."""
+
+    enabled: bool = False
+    max_repeat_ngram: int = 4
+
+
+@dataclass(frozen=True)
+class DeferredConfig:
+    """Save transcripts as drafts immediately and enhance them from a durable queue."""
+
+    enabled: bool = False
+    poll_seconds: float = 5.0
+    retry_base_seconds: float = 15.0
+    retry_max_seconds: float = 900.0
+
+
+@dataclass(frozen=True)
+class TimingHistoryConfig:
+    """Rotating on-disk log of per-cycle stage timings (read by `lazy-ptt stats`)."""
+
+    enabled: bool = True
+    max_bytes: int = 5_000_000
+    backups: int = 5
+
+
+@dataclass(frozen=True)
+class ApiConfig:
+    """Admission control and worker pool for the REST API's asynchronous jobs."""
+
+    max_queued_jobs: int = 16
+    stt_workers: int = 1
+    enhance_workers: int = 2
+    job_ttl_seconds: float = 3600.0
+    max_wait_seconds: float = 30.0
+    max_upload_bytes: int = 100 * 1024 * 1024
+    live_partial_seconds: float = 1.0
+    live_window_seconds: float = 10.0
+    idempotency_ttl_seconds: float = 86400.0
+    batch_max_items: int = 50
+
+
+@dataclass(frozen=True)
+class WorkspaceConfig:
+    """An extra project root served by the same daemon (see `WorkspaceRegistry`)."""
+
+    name: str
+    root: Path
+    hotkey: Optional[str] = None
 
 
 @dataclass(frozen=True)
@@ -74,10 +149,17 @@ class AppConfig:
     whisper: WhisperConfig
     openai: OpenAIConfig
     prompt: PromptConfig
+    compaction: CompactionConfig = field(default_factory=CompactionConfig)
+    deferred: DeferredConfig = field(default_factory=DeferredConfig)
+    timing_history: TimingHistoryConfig = field(default_factory=TimingHistoryConfig)
+    api: ApiConfig = field(default_factory=ApiConfig)
+    workspaces: Tuple[WorkspaceConfig, ...] = ()
 
 
 DEFAULT_CONFIG_PATH = Path("config") / "defaults.yaml"
 
+LOGGER = logging.getLogger(__name__)
+
 
 class ConfigError(RuntimeError):
     """Raised when mandatory configuration values are missing or invalid."""
@@ -97,6 +179,7 @@ def _load_yaml(path: Path, *, strict: bool) -> Dict[str, Any]:
         raise ConfigError(f"Invalid YAML in {path}: {exc}") from exc
 
 
+@functools.lru_cache(maxsize=1)
 def _load_builtin_defaults() -> Dict[str, Any]:
     """Load defaults shipped inside the package (works for wheels/sdists)."""
 
@@ -143,6 +226,19 @@ def _coerce_float(value: Optional[str], default: float) -> float:
         raise ConfigError(f"Expected float value, received {value!r}") from exc
 
 
+def _coerce_bool(value: Optional[str], default: bool) -> bool:
+    if value in (None, ""):
+        return default
+    if isinstance(value, bool):
+        return value
+    lowered = str(value).strip().lower()
+    if lowered in ("1", "true", "yes", "on"):
+        return True
+    if lowered in ("0", "false", "no", "off"):
+        return False
+    raise ConfigError(f"Expected boolean value, received {value!r}")
+
+
 def _optional_str(value: Optional[str]) -> Optional[str]:
     if value is None:
         return None
@@ -150,6 +246,49 @@ def _optional_str(value: Optional[str]) -> Optional[str]:
     return stripped or None
 
 
+def _optional_path(base_dir: Path, value: Optional[str]) -> Optional[Path]:
+    value = _optional_str(value)
+    if value is None:
+        return None
+    return (base_dir / Path(value).expanduser()).resolve()
+
+
+def parse_workspace(spec: str, base_dir: Optional[Path] = None) -> WorkspaceConfig:
+    """Parse a `[NAME=]ROOT` workspace spec; the name defaults to the directory name."""
+
+    name, sep, root = spec.partition("=")
+    if not sep:
+        name, root = "", spec
+    root = root.strip()
+    if not root:
+        raise ConfigError(f"Workspace {spec!r} has no root directory")
+    path = ((base_dir or Path.cwd()) / Path(root).expanduser()).resolve()
+    return WorkspaceConfig(name=name.strip() or path.name, root=path)
+
+
+def _workspace_configs(base_dir: Path, value: Any) -> Tuple[WorkspaceConfig, ...]:
+    if isinstance(value, str):
+        entries: List[Any] = [item for item in value.split(os.pathsep) if item.strip()]
+    else:
+        entries = list(value or [])
+    workspaces: List[WorkspaceConfig] = []
+    for entry in entries:
+        if isinstance(entry, str):
+            workspaces.append(parse_workspace(entry, base_dir))
+        elif isinstance(entry, dict) and entry.get("root"):
+            workspace = parse_workspace(str(entry["root"]), base_dir)
+            workspaces.append(
+                WorkspaceConfig(
+                    name=str(entry.get("name") or workspace.name),
+                    root=workspace.root,
+                    hotkey=_optional_str(entry.get("hotkey")),
+                )
+            )
+        else:
+            raise ConfigError(f"Invalid workspace entry {entry!r}; expected a path or a root")
+    return tuple(workspaces)
+
+
 def _resolve_base_dir() -> Path:
     """Determine the root directory for relative outputs and caches."""
 
@@ -159,30 +298,129 @@ def _resolve_base_dir() -> Path:
     return Path.cwd().resolve()
 
 
-def load_config(config_path: Optional[Path] = None) -> AppConfig:
+_CONFIG_LOCK = threading.RLock()
+# (config_path, base_dir) -> (fingerprint of every input, config built from them)
+_CONFIG_CACHE: Dict[Tuple[Optional[str], Optional[str]], Tuple[Tuple[Any, ...], "AppConfig"]] = {}
+# Variables set from `.env` by `_refresh_dotenv`, with the value that was set.
+_DOTENV_APPLIED: Dict[str, str] = {}
+_DOTENV_STATE: Dict[str, Any] = {"path": None, "stamp": None}
+
+
+def _stamp(path: Optional[Path]) -> Optional[Tuple[int, int]]:
+    if path is None:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _refresh_dotenv() -> Optional[Path]:
+    """Apply `.env` to the environment again whenever the file changed.
+
+    Like `load_dotenv()`, variables already set in the real environment win.
+    Values that came from an earlier version of the file are updated or
+    removed, so edits to `.env` reach a long-running process.
+    """
+
+    found = find_dotenv()
+    path = Path(found) if found else None
+    stamp = _stamp(path)
+    if path == _DOTENV_STATE["path"] and stamp == _DOTENV_STATE["stamp"]:
+        return path
+    values = {k: v for k, v in (dotenv_values(path) if path else {}).items() if v is not None}
+    for key, applied in list(_DOTENV_APPLIED.items()):
+        if os.environ.get(key) != applied:
+            del _DOTENV_APPLIED[key]  # changed by someone else; no longer ours
+        elif key not in values:
+            del os.environ[key]
+            del _DOTENV_APPLIED[key]
+    for key, value in values.items():
+        if key in os.environ and key not in _DOTENV_APPLIED:
+            continue
+        os.environ[key] = value
+        _DOTENV_APPLIED[key] = value
+    _DOTENV_STATE.update(path=path, stamp=stamp)
+    return path
+
+
+def config_sources(
+    config_path: Optional[Path] = None, base_dir: Optional[Path] = None
+) -> List[Path]:
+    """Files whose modification invalidates the cached configuration."""
+
+    if config_path is not None:
+        sources = [Path(config_path)]
+    else:
+        sources = [((base_dir or Path.cwd()) / DEFAULT_CONFIG_PATH).resolve()]
+    found = find_dotenv()
+    if found:
+        sources.append(Path(found))
+    return sources
+
+
+def load_config(
+    config_path: Optional[Path] = None, base_dir: Optional[Path] = None
+) -> AppConfig:
     """Load configuration with precedence: built-in defaults < file overrides < env vars.
 
     - Built-in defaults are packaged at lazy_ptt/data/defaults.yaml.
     - If `config_path` is provided, its values overlay built-ins (strict load).
     - Else, if repo-local config/defaults.yaml exists, overlay it (lenient load).
     - Environment variables finally override everything.
+
+    `base_dir` loads the configuration of another project root (a daemon
+    workspace): its `config/defaults.yaml` is overlaid instead of the working
+    directory's, and the path variables (`PROJECT_MANAGEMENT_ROOT`,
+    `PTT_OUTPUT_ROOT`, `LAZY_PTT_STATE_DIR`, `LAZY_PTT_HOME`), which describe
+    this process's own project, are ignored.
+
+    The result is cached: until `.env`, the YAML file (by mtime and size), the
+    environment or the working directory change, repeated calls return the
+    very same `AppConfig` object without re-reading anything.
     """
 
-    load_dotenv()
+    with _CONFIG_LOCK:
+        _refresh_dotenv()
+        key = (
+            None if config_path is None else str(config_path),
+            None if base_dir is None else str(base_dir),
+        )
+        fingerprint = (
+            tuple(_stamp(path) for path in config_sources(config_path, base_dir)),
+            os.getcwd(),
+            frozenset(os.environ.items()),
+        )
+        cached = _CONFIG_CACHE.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        config = _build_config(config_path, base_dir)
+        _CONFIG_CACHE[key] = (fingerprint, config)
+        return config
+
+
+def _build_config(config_path: Optional[Path], workspace_root: Optional[Path] = None) -> AppConfig:
     defaults = _load_builtin_defaults()
+    local_config = (workspace_root or Path()) / DEFAULT_CONFIG_PATH
     if config_path is not None:
         defaults = _deep_merge(defaults, _load_yaml(config_path, strict=True))
-    elif DEFAULT_CONFIG_PATH.exists():
-        defaults = _deep_merge(defaults, _load_yaml(DEFAULT_CONFIG_PATH, strict=False))
+    elif local_config.exists():
+        defaults = _deep_merge(defaults, _load_yaml(local_config, strict=False))
 
-    base_dir = _resolve_base_dir()
-    project_management_root_env = os.getenv("PROJECT_MANAGEMENT_ROOT")
+    if workspace_root is None:
+        base_dir = _resolve_base_dir()
+        path_env = os.getenv
+    else:
+        base_dir = Path(workspace_root).expanduser().resolve()
+        path_env = _no_env
+    project_management_root_env = path_env("PROJECT_MANAGEMENT_ROOT")
     if project_management_root_env:
         project_management_root = Path(project_management_root_env).expanduser().resolve()
     else:
         project_management_root = (base_dir / "project-management").resolve()
 
-    prompt_output_root_env = os.getenv("PTT_OUTPUT_ROOT")
+    prompt_output_root_env = path_env("PTT_OUTPUT_ROOT")
     if prompt_output_root_env:
         prompt_output_root = Path(prompt_output_root_env).expanduser().resolve()
     else:
@@ -195,6 +433,10 @@ def load_config(config_path: Optional[Path] = None) -> AppConfig:
     whisper_defaults = defaults.get("whisper", {})
     openai_defaults = defaults.get("openai", {})
     prompt_defaults = defaults.get("prompt", {})
+    compaction_defaults = defaults.get("compaction", {})
+    deferred_defaults = defaults.get("deferred", {})
+    history_defaults = defaults.get("timing_history", {})
+    api_defaults = defaults.get("api", {})
 
     openai_api_key = os.getenv("OPENAI_API_KEY")
     if not openai_api_key:
@@ -203,10 +445,16 @@ def load_config(config_path: Optional[Path] = None) -> AppConfig:
             "Provide it via environment variable or .env file."
         )
 
+    state_dir_env = path_env("LAZY_PTT_STATE_DIR")
     paths = ProjectPaths(
         repository_root=base_dir,
         project_management_root=project_management_root,
         prompt_output_root=prompt_output_root,
+        state_root=(
+            Path(state_dir_env).expanduser().resolve()
+            if state_dir_env
+            else (base_dir / ".lazy-ptt").resolve()
+        ),
     )
 
     ptt_config = PTTConfig(
@@ -242,6 +490,26 @@ def load_config(config_path: Optional[Path] = None) -> AppConfig:
         download_root=(
             base_dir / whisper_defaults.get("download_root", ".cache/whisper")
         ).resolve(),
+        server_socket=_optional_path(
+            base_dir,
+            os.getenv("PTT_WHISPER_SERVER_SOCKET") or whisper_defaults.get("server_socket"),
+        ),
+        beam_size=_coerce_int(
+            os.getenv("PTT_WHISPER_BEAM_SIZE"), whisper_defaults.get("beam_size", 5)
+        ),
+        vad_filter=_coerce_bool(
+            os.getenv("PTT_WHISPER_VAD_FILTER"), whisper_defaults.get("vad_filter", True)
+        ),
+        batching=_coerce_bool(
+            os.getenv("PTT_WHISPER_BATCHING"), whisper_defaults.get("batching", False)
+        ),
+        batch_max_size=_coerce_int(
+            os.getenv("PTT_WHISPER_BATCH_MAX_SIZE"), whisper_defaults.get("batch_max_size", 8)
+        ),
+        batch_max_wait_ms=_coerce_float(
+            os.getenv("PTT_WHISPER_BATCH_MAX_WAIT_MS"),
+            whisper_defaults.get("batch_max_wait_ms", 10.0),
+        ),
     )
 
     openai_config = OpenAIConfig(
@@ -254,6 +522,9 @@ def load_config(config_path: Optional[Path] = None) -> AppConfig:
             os.getenv("OPENAI_MAX_OUTPUT_TOKENS"), openai_defaults.get("max_output_tokens", 1800)
         ),
         base_url=_optional_str(os.getenv("OPENAI_BASE_URL")),
+        max_concurrency=_coerce_int(
+            os.getenv("OPENAI_MAX_CONCURRENCY"), openai_defaults.get("max_concurrency", 4)
+        ),
     )
 
     prompt_config = PromptConfig(
@@ -265,6 +536,86 @@ def load_config(config_path: Optional[Path] = None) -> AppConfig:
             "PTT_PROMPT_METADATA_FILENAME",
             prompt_defaults.get("metadata_filename", "prompt-metadata.json"),
         ),
+        index=_coerce_bool(os.getenv("PTT_PROMPT_INDEX"), prompt_defaults.get("index", True)),
+        write_behind=_coerce_bool(
+            os.getenv("PTT_PROMPT_WRITE_BEHIND"), prompt_defaults.get("write_behind", False)
+        ),
+    )
+
+    compaction_config = CompactionConfig(
+        enabled=_coerce_bool(
+            os.getenv("PTT_COMPACT_TRANSCRIPT"), compaction_defaults.get("enabled", False)
+        ),
+        max_repeat_ngram=_coerce_int(
+            os.getenv("PTT_COMPACT_MAX_NGRAM"), compaction_defaults.get("max_repeat_ngram", 4)
+        ),
+    )
+
+    deferred_config = DeferredConfig(
+        enabled=_coerce_bool(
+            os.getenv("PTT_DEFER_ENHANCEMENT"), deferred_defaults.get("enabled", False)
+        ),
+        poll_seconds=_coerce_float(
+            os.getenv("PTT_DEFER_POLL_SECONDS"), deferred_defaults.get("poll_seconds", 5.0)
+        ),
+        retry_base_seconds=_coerce_float(
+            os.getenv("PTT_DEFER_RETRY_BASE_SECONDS"),
+            deferred_defaults.get("retry_base_seconds", 15.0),
+        ),
+        retry_max_seconds=_coerce_float(
+            os.getenv("PTT_DEFER_RETRY_MAX_SECONDS"),
+            deferred_defaults.get("retry_max_seconds", 900.0),
+        ),
+    )
+
+    timing_history_config = TimingHistoryConfig(
+        enabled=_coerce_bool(
+            os.getenv("PTT_TIMING_HISTORY"), history_defaults.get("enabled", True)
+        ),
+        max_bytes=_coerce_int(
+            os.getenv("PTT_TIMING_HISTORY_MAX_BYTES"),
+            history_defaults.get("max_bytes", 5_000_000),
+        ),
+        backups=_coerce_int(
+            os.getenv("PTT_TIMING_HISTORY_BACKUPS"), history_defaults.get("backups", 5)
+        ),
+    )
+
+    api_config = ApiConfig(
+        max_queued_jobs=_coerce_int(
+            os.getenv("PTT_API_MAX_QUEUED_JOBS"), api_defaults.get("max_queued_jobs", 16)
+        ),
+        stt_workers=_coerce_int(
+            os.getenv("PTT_API_STT_WORKERS"), api_defaults.get("stt_workers", 1)
+        ),
+        enhance_workers=_coerce_int(
+            os.getenv("PTT_API_ENHANCE_WORKERS"), api_defaults.get("enhance_workers", 2)
+        ),
+        job_ttl_seconds=_coerce_float(
+            os.getenv("PTT_API_JOB_TTL_SECONDS"), api_defaults.get("job_ttl_seconds", 3600.0)
+        ),
+        max_wait_seconds=_coerce_float(
+            os.getenv("PTT_API_MAX_WAIT_SECONDS"), api_defaults.get("max_wait_seconds", 30.0)
+        ),
+        max_upload_bytes=_coerce_int(
+            os.getenv("PTT_API_MAX_UPLOAD_BYTES"),
+            api_defaults.get("max_upload_bytes", 100 * 1024 * 1024),
+        ),
+        live_partial_seconds=_coerce_float(
+            os.getenv("PTT_API_LIVE_PARTIAL_SECONDS"),
+            api_defaults.get("live_partial_seconds", 1.0),
+        ),
+        live_window_seconds=_coerce_float(
+            os.getenv("PTT_API_LIVE_WINDOW_SECONDS"),
+            api_defaults.get("live_window_seconds", 10.0),
+        ),
+        idempotency_ttl_seconds=_coerce_float(
+            os.getenv("PTT_API_IDEMPOTENCY_TTL_SECONDS"),
+            api_defaults.get("idempotency_ttl_seconds", 86400.0),
+        ),
+        batch_max_items=_coerce_int(
+            os.getenv("PTT_API_BATCH_MAX_ITEMS"), api_defaults.get("batch_max_items", 50)
+        ),
     )
 
     return AppConfig(
@@ -273,9 +624,82 @@ def load_config(config_path: Optional[Path] = None) -> AppConfig:
         whisper=whisper_config,
         openai=openai_config,
         prompt=prompt_config,
+        compaction=compaction_config,
+        deferred=deferred_config,
+        timing_history=timing_history_config,
+        api=api_config,
+        workspaces=_workspace_configs(
+            base_dir, os.getenv("PTT_WORKSPACES") or defaults.get("workspaces")
+        ),
     )
 
 
+def _no_env(_name: str) -> Optional[str]:
+    return None
+
+
+def diff_config(old: AppConfig, new: AppConfig) -> Dict[str, Tuple[Any, Any]]:
+    """Settings that differ between two configs, as `{"section.field": (old, new)}`."""
+
+    changes: Dict[str, Tuple[Any, Any]] = {}
+    for section in fields(AppConfig):
+        before, after = getattr(old, section.name), getattr(new, section.name)
+        if before == after:
+            continue
+        if not is_dataclass(before):
+            changes[section.name] = (before, after)
+            continue
+        for item in fields(before):
+            old_value, new_value = getattr(before, item.name), getattr(after, item.name)
+            if old_value != new_value:
+                changes[f"{section.name}.{item.name}"] = (old_value, new_value)
+    return changes
+
+
+class ConfigWatcher:
+    """Reports a changed configuration to long-running processes.
+
+    `poll` re-runs `load_config` at most every `interval_seconds`; thanks to
+    its cache that is a few `stat` calls unless something changed. It returns
+    the new config (passed through `transform`, e.g. CLI overrides) when the
+    result differs from the previous one, and None otherwise. Invalid edits
+    are logged once and ignored until fixed.
+    """
+
+    def __init__(
+        self,
+        config_path: Optional[Path] = None,
+        transform: Optional[Callable[[AppConfig], AppConfig]] = None,
+        interval_seconds: float = 1.0,
+    ) -> None:
+        self.config_path = config_path
+        self.transform = transform
+        self.interval_seconds = interval_seconds
+        self._current: Optional[AppConfig] = None
+        self._checked = 0.0
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def poll(self) -> Optional[AppConfig]:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked < self.interval_seconds:
+                return None
+            self._checked = now
+            try:
+                config = load_config(self.config_path)
+            except ConfigError as exc:
+                if str(exc) != self._last_error:
+                    LOGGER.warning("Ignoring invalid configuration change: %s", exc)
+                    self._last_error = str(exc)
+                return None
+            self._last_error = None
+            previous, self._current = self._current, config
+            if previous is None or config is previous:
+                return None  # first poll only records the baseline
+            return self.transform(config) if self.transform else config
+
+
 def dump_config(config: AppConfig) -> Dict[str, Any]:
     """Helper for debugging and unit tests."""
 
@@ -284,14 +708,25 @@ def dump_config(config: AppConfig) -> Dict[str, Any]:
             "repository_root": str(config.paths.repository_root),
             "project_management_root": str(config.paths.project_management_root),
             "prompt_output_root": str(config.paths.prompt_output_root),
+            "state_dir": str(config.paths.state_dir),
         },
         "ptt": config.ptt.__dict__,
         "whisper": {
             **config.whisper.__dict__,
             "download_root": str(config.whisper.download_root),
+            "server_socket": (
+                str(config.whisper.server_socket) if config.whisper.server_socket else None
+            ),
         },
         "openai": config.openai.__dict__,
         "prompt": config.prompt.__dict__,
+        "compaction": config.compaction.__dict__,
+        "deferred": config.deferred.__dict__,
+        "timing_history": config.timing_history.__dict__,
+        "api": config.api.__dict__,
+        "workspaces": [
+            {**workspace.__dict__, "root": str(workspace.root)} for workspace in config.workspaces
+        ],
     }
 
 
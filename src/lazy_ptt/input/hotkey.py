@@ -1,19 +1,115 @@
 from __future__ import annotations
 
+import queue
 import threading
-from dataclasses import dataclass
-from typing import Callable, Optional
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Optional, Set
 
-try:
+if TYPE_CHECKING:
     from pynput import keyboard
-except Exception:  # pragma: no cover - allow import in headless CI
-    keyboard = None  # type: ignore
+
+
+def _keyboard() -> Any:
+    """pynput's keyboard module, imported on first use: it connects to the display server."""
+
+    try:
+        from pynput import keyboard
+    except Exception:  # pragma: no cover - allow use in headless CI
+        return None
+    return keyboard
 
 
 class HotkeyListenerError(RuntimeError):
     """Raised when the hotkey listener encounters an unrecoverable error."""
 
 
+MODIFIER_ALIASES = {
+    "ctrl": "ctrl",
+    "control": "ctrl",
+    "alt": "alt",
+    "option": "alt",
+    "alt_gr": "alt",
+    "shift": "shift",
+    "cmd": "cmd",
+    "super": "cmd",
+    "win": "cmd",
+    "meta": "cmd",
+}
+
+
+@dataclass(frozen=True)
+class HotkeySpec:
+    """Parsed hotkey such as `<f12>`, `space` or `<ctrl>+<alt>+h`."""
+
+    key: str
+    modifiers: FrozenSet[str] = frozenset()
+
+
+def _canonical_part(part: str) -> str:
+    part = part.strip().lower()
+    if len(part) > 2 and part.startswith("<") and part.endswith(">"):
+        part = part[1:-1]
+    return part
+
+
+def _canonical_modifier(name: str) -> Optional[str]:
+    base = name
+    for suffix in ("_l", "_r"):
+        if base.endswith(suffix):
+            base = base[: -len(suffix)]
+    return MODIFIER_ALIASES.get(base)
+
+
+def parse_hotkey(spec: str) -> HotkeySpec:
+    """Parse a pynput-style hotkey string into a key plus required modifiers."""
+
+    parts = [_canonical_part(part) for part in spec.split("+") if part.strip()]
+    if not parts:
+        raise HotkeyListenerError(f"Invalid hotkey: {spec!r}")
+    key = parts[-1]
+    modifiers = set()
+    for part in parts[:-1]:
+        modifier = _canonical_modifier(part)
+        if modifier is None:
+            raise HotkeyListenerError(f"Unknown modifier {part!r} in hotkey {spec!r}")
+        modifiers.add(modifier)
+    # A lone modifier (e.g. `<ctrl_r>`) is a valid push-to-talk key on its own.
+    return HotkeySpec(key=_canonical_modifier(key) or key, modifiers=frozenset(modifiers))
+
+
+def key_name(key: Any) -> Optional[str]:
+    """Normalise a pynput `Key`/`KeyCode` to the names used by `HotkeySpec`."""
+
+    char = getattr(key, "char", None)
+    if char:
+        return str(char).lower()
+    name = getattr(key, "name", None)
+    if name:
+        return _canonical_modifier(name) or str(name).lower()
+    vk = getattr(key, "vk", None)
+    if vk is not None:
+        return f"vk{vk}"
+    return None
+
+
+class _ModifierState:
+    """Tracks which modifiers are currently held down."""
+
+    def __init__(self) -> None:
+        self.held: Set[str] = set()
+
+    def update(self, name: Optional[str], pressed: bool) -> None:
+        if name and name in MODIFIER_ALIASES.values():
+            if pressed:
+                self.held.add(name)
+            else:
+                self.held.discard(name)
+
+    def satisfies(self, spec: HotkeySpec) -> bool:
+        return spec.modifiers.issubset(self.held)
+
+
 @dataclass
 class HotkeyCallbacks:
     """Callback container used by `HotkeyListener`."""
@@ -27,34 +123,38 @@ class HotkeyListener:
 
     def __init__(self, hotkey: str = "space") -> None:
         self.hotkey = hotkey.lower()
+        self.spec = parse_hotkey(hotkey)
         self._listener: Optional[keyboard.Listener] = None
         self._is_active = threading.Event()
+        self._modifiers = _ModifierState()
 
     def _matches_hotkey(self, key: keyboard.Key | keyboard.KeyCode) -> bool:
-        if isinstance(key, keyboard.Key):
-            return key.name == self.hotkey
-        if isinstance(key, keyboard.KeyCode):
-            return key.char == self.hotkey
-        return False
+        return key_name(key) == self.spec.key and self._modifiers.satisfies(self.spec)
 
     def start(self, callbacks: HotkeyCallbacks) -> None:
         """Begin listening for hotkey events."""
 
         if self._listener is not None:
             raise HotkeyListenerError("Hotkey listener already running")
+        keyboard = _keyboard()
         if keyboard is None:
             raise HotkeyListenerError(
                 "pynput is unavailable or no GUI backend is present; hotkey listening is disabled."
             )
+        pressed = threading.Event()
 
         def on_press(key: keyboard.Key | keyboard.KeyCode) -> None:
-            if self._matches_hotkey(key):
+            if self._matches_hotkey(key) and not pressed.is_set():
+                pressed.set()
                 callbacks.on_press()
+            self._modifiers.update(key_name(key), True)
 
-        def on_release(key: keyboard.Key | keyboard.KeyCode) -> bool:
-            if self._matches_hotkey(key):
+        def on_release(key: keyboard.Key | keyboard.KeyCode) -> Optional[bool]:
+            self._modifiers.update(key_name(key), False)
+            if key_name(key) == self.spec.key and pressed.is_set():
                 callbacks.on_release()
-            return False  # allow listener to terminate on release
+                return False  # allow listener to terminate on release
+            return None
 
         self._listener = keyboard.Listener(on_press=on_press, on_release=on_release)
         self._listener.start()
@@ -79,3 +179,128 @@ class HotkeyListener:
 
     def is_running(self) -> bool:
         return self._is_active.is_set()
+
+
+@dataclass
+class HotkeyEvent:
+    """A debounced press or release of a bound hotkey."""
+
+    kind: str  # "press" | "release"
+    binding: str
+    timestamp: float = field(default_factory=time.monotonic)
+
+
+class PersistentHotkeyListener:
+    """Single OS keyboard hook that lives for the whole process.
+
+    Press/release transitions of every bound hotkey are pushed onto a queue.
+    Auto-repeat presses while the key is held are ignored, and a release is only
+    emitted once no new press follows within `debounce_seconds` (X11 reports
+    auto-repeat as release/press pairs). When several bindings share a key
+    (`<f12>` and `<ctrl>+<f12>`), a press fires only the one requiring the
+    most of the held modifiers.
+    """
+
+    DEFAULT_BINDING = "default"
+
+    def __init__(self, hotkey: Optional[str] = None, debounce_seconds: float = 0.04) -> None:
+        self.debounce_seconds = debounce_seconds
+        self.events: "queue.Queue[HotkeyEvent]" = queue.Queue()
+        self._bindings: Dict[str, HotkeySpec] = {}
+        self._active: Set[str] = set()
+        self._pending_release: Dict[str, threading.Timer] = {}
+        self._modifiers = _ModifierState()
+        self._lock = threading.Lock()
+        self._listener: Optional[keyboard.Listener] = None
+        if hotkey:
+            self.bind(self.DEFAULT_BINDING, hotkey)
+
+    def bind(self, name: str, hotkey: str) -> None:
+        with self._lock:
+            self._bindings[name] = parse_hotkey(hotkey)
+
+    def _emit(self, kind: str, binding: str) -> None:
+        self.events.put(HotkeyEvent(kind=kind, binding=binding))
+
+    def _match(self, name: Optional[str]) -> Optional[str]:
+        matches = [
+            (binding, spec)
+            for binding, spec in self._bindings.items()
+            if spec.key == name and self._modifiers.satisfies(spec)
+        ]
+        for binding, _spec in matches:
+            if binding in self._active:
+                return binding  # auto-repeat of the binding already down
+        if not matches:
+            return None
+        return max(matches, key=lambda match: len(match[1].modifiers))[0]
+
+    def _on_press(self, key: Any) -> None:
+        name = key_name(key)
+        with self._lock:
+            binding = self._match(name)
+            if binding is not None:
+                timer = self._pending_release.pop(binding, None)
+                if timer is not None:
+                    timer.cancel()  # release/press pair from auto-repeat
+                elif binding not in self._active:  # otherwise auto-repeat while held
+                    self._active.add(binding)
+                    self._emit("press", binding)
+            self._modifiers.update(name, True)
+
+    def _on_release(self, key: Any) -> None:
+        name = key_name(key)
+        with self._lock:
+            self._modifiers.update(name, False)
+            for binding, spec in self._bindings.items():
+                if spec.key != name or binding not in self._active:
+                    continue
+                if self.debounce_seconds <= 0:
+                    self._finish_release(binding, locked=True)
+                    continue
+                timer = threading.Timer(self.debounce_seconds, self._finish_release, (binding,))
+                timer.daemon = True
+                self._pending_release[binding] = timer
+                timer.start()
+
+    def _finish_release(self, binding: str, locked: bool = False) -> None:
+        if not locked:
+            with self._lock:
+                self._finish_release(binding, locked=True)
+            return
+        self._pending_release.pop(binding, None)
+        if binding in self._active:
+            self._active.discard(binding)
+            self._emit("release", binding)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[HotkeyEvent]:
+        """Next hotkey event, or None when `timeout` expires."""
+
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def start(self) -> None:
+        if self._listener is not None:
+            return
+        keyboard = _keyboard()
+        if keyboard is None:
+            raise HotkeyListenerError(
+                "pynput is unavailable or no GUI backend is present; hotkey listening is disabled."
+            )
+        self._listener = keyboard.Listener(on_press=self._on_press, on_release=self._on_release)
+        self._listener.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            for timer in self._pending_release.values():
+                timer.cancel()
+            self._pending_release.clear()
+            self._active.clear()
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def is_running(self) -> bool:
+        return self._listener is not None
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List
+
+# Hesitation sounds that never carry meaning in a dictated brief.
+FILLER_PATTERN = re.compile(
+    r"(?:,\s*)?(?<![\w'-])(?:u+m+|u+h+|e+r+m+|e+r+|a+h+|h+m+|m+h*m+)(?![\w'-]),?",
+    re.IGNORECASE,
+)
+# Discourse markers are only dropped when set off by a comma, so that
+# "I mean the API" or "you know the config" survive untouched.
+DISCOURSE_PATTERN = re.compile(
+    r"(?:,\s*)?(?<![\w'-])(?:you know|i mean|basically),",
+    re.IGNORECASE,
+)
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_WORD_NORMALIZER = re.compile(r"[^\w']+")
+
+
+@dataclass
+class CompactionResult:
+    """Compacted transcript plus the size reduction it achieved."""
+
+    text: str
+    original_chars: int
+    compacted_chars: int
+    original_tokens: int
+    compacted_tokens: int
+
+    @property
+    def saved_chars(self) -> int:
+        return self.original_chars - self.compacted_chars
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+    @property
+    def char_reduction(self) -> float:
+        if not self.original_chars:
+            return 0.0
+        return self.saved_chars / self.original_chars
+
+    def describe(self) -> str:
+        return (
+            f"{self.original_chars} → {self.compacted_chars} chars "
+            f"(-{self.char_reduction:.0%}), "
+            f"~{self.original_tokens} → {self.compacted_tokens} tokens"
+        )
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, deterministic token estimate (words and punctuation marks)."""
+
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def _normalize_word(word: str) -> str:
+    return _WORD_NORMALIZER.sub("", word.lower())
+
+
+def collapse_repeats(text: str, max_ngram: int = 4) -> str:
+    """Collapse immediately repeated words/phrases ("the the", "I want I want to").
+
+    The earlier copy is dropped so that the punctuation of the final, completed
+    phrase is kept. Longer phrases are collapsed first.
+    """
+
+    words: List[str] = text.split()
+    for size in range(max(1, max_ngram), 0, -1):
+        index = 0
+        while index + 2 * size <= len(words):
+            first = [_normalize_word(w) for w in words[index : index + size]]
+            second = [_normalize_word(w) for w in words[index + size : index + 2 * size]]
+            if all(first) and first == second:
+                del words[index : index + size]
+                continue
+            index += 1
+    return " ".join(words)
+
+
+def normalize_whitespace(text: str) -> str:
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s+([,.;:!?])", r"\1", text)
+    text = re.sub(r"([,;:])(?:\s*[,;:])+", r"\1", text)
+    text = re.sub(r"[,;:]\s*([.!?])", r"\1", text)
+    text = re.sub(r"^[\s,;:.]+", "", text)
+    return text.strip()
+
+
+def compact_transcript(text: str, max_ngram: int = 4) -> CompactionResult:
+    """Remove fillers, collapse repeated phrases and normalise whitespace.
+
+    The transformation is purely local and deterministic so it can run on every
+    transcript before the brief is sent to the enhancement model.
+    """
+
+    original = text.strip()
+    compacted = FILLER_PATTERN.sub(" ", original)
+    compacted = DISCOURSE_PATTERN.sub(" ", compacted)
+    compacted = normalize_whitespace(compacted)
+    compacted = collapse_repeats(compacted, max_ngram=max_ngram)
+    compacted = normalize_whitespace(compacted)
+    if compacted and compacted[0].islower() and original[:1].isupper():
+        compacted = compacted[0].upper() + compacted[1:]
+    if not compacted:
+        # Never hand an empty brief to the enhancer; fall back to the raw text.
+        compacted = original
+    return CompactionResult(
+        text=compacted,
+        original_chars=len(original),
+        compacted_chars=len(compacted),
+        original_tokens=estimate_tokens(original),
+        compacted_tokens=estimate_tokens(compacted),
+    )
@@ -1,16 +1,15 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
-from typing import Iterable, List, Optional
-
-try:
-    from openai import OpenAI  # type: ignore
-except ImportError:  # pragma: no cover - handled via runtime check
-    OpenAI = None
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from ..config import OpenAIConfig
+from ..timing import timed
 
+# Receives ("summary", {...}) and ("section", {...}) events while a plan streams in.
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
 
 SYSTEM_PROMPT = """
 You are an elite software architect and product lead.
@@ -29,6 +28,23 @@ Return a JSON object with:
 Focus on relevance. Include only sections that serve the work described in the brief.
 """.strip()
 
+AMEND_SYSTEM_PROMPT = """
+You are an elite software architect and product lead maintaining an existing plan.
+You receive the current plan as JSON ("current_plan") and a short follow-up note
+("follow_up"). Do NOT regenerate the plan. Return only the changes as a JSON object:
+- summary: replacement summary, or null to keep the current one
+- work_type: replacement work type, or null to keep the current one
+- add_objectives / remove_objectives: arrays of strings
+- add_risks / remove_risks: arrays of strings
+- add_milestones / remove_milestones: arrays of strings
+- add_acceptance_criteria / remove_acceptance_criteria: arrays of strings
+- upsert_sections: array of { "title": str, "content": str } replacing sections with the
+  same title or appending new ones
+- remove_sections: array of section titles to drop
+
+Omit keys that do not change. Removals must quote existing entries verbatim.
+""".strip()
+
 
 @dataclass
 class PromptSection:
@@ -47,6 +63,28 @@ class EnhancedPrompt:
     acceptance_criteria: List[str]
     suggested_story_id: Optional[str]
     original_brief: str
+    amendments: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EnhancedPrompt":
+        return cls(
+            work_type=data.get("work_type") or "FEATURE",
+            summary=data.get("summary") or "",
+            objectives=_string_list(data.get("objectives")),
+            risks=_string_list(data.get("risks")),
+            milestones=_string_list(data.get("milestones")),
+            sections=[
+                PromptSection(title=item.get("title", "Details"), content=item.get("content", ""))
+                for item in data.get("sections") or []
+            ],
+            acceptance_criteria=_string_list(data.get("acceptance_criteria")),
+            suggested_story_id=data.get("suggested_story_id"),
+            original_brief=data.get("original_brief") or "",
+            amendments=_string_list(data.get("amendments")),
+        )
 
     def to_markdown(self) -> str:
         lines: List[str] = [
@@ -79,6 +117,11 @@ class EnhancedPrompt:
         lines.append("## Original Brief")
         lines.append(f"> {self.original_brief}")
         lines.append("")
+        if self.amendments:
+            lines.append("## Amendments")
+            for index, note in enumerate(self.amendments, start=1):
+                lines.append(f"{index}. {note}")
+            lines.append("")
         if self.suggested_story_id:
             lines.append(f"_Suggested Story ID_: {self.suggested_story_id}")
             lines.append("")
@@ -99,36 +142,108 @@ class EnhancedPrompt:
 
 
 class PromptEnhancer:
-    """Wrapper responsible for calling OpenAI and shaping the result."""
+    """Wrapper responsible for calling OpenAI and shaping the result.
+
+    At most `config.max_concurrency` requests are in flight per enhancer;
+    further callers wait for a slot before their request is sent. Without an
+    injected `client`, the OpenAI SDK (about a second of imports) is loaded
+    when the first request is made.
+    """
 
     def __init__(self, config: OpenAIConfig, client: Optional[object] = None) -> None:
         self.config = config
-        if client is not None:
-            self.client = client
-        else:
-            if OpenAI is None:
-                raise RuntimeError(
-                    "openai package not installed. Install it with `pip install openai` "
-                    "or inject a compatible client instance."
-                )
-            self.client = OpenAI(api_key=config.api_key, base_url=config.base_url)
-
-    def enhance(self, brief: str) -> EnhancedPrompt:
+        self._slots = threading.BoundedSemaphore(max(1, config.max_concurrency))
+        self._client = client
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    try:
+                        from openai import OpenAI  # type: ignore
+                    except ImportError as exc:
+                        raise RuntimeError(
+                            "openai package not installed. Install it with `pip install openai` "
+                            "or inject a compatible client instance."
+                        ) from exc
+                    self._client = OpenAI(
+                        api_key=self.config.api_key, base_url=self.config.base_url
+                    )
+        return self._client
+
+    def with_config(self, config: OpenAIConfig) -> "PromptEnhancer":
+        """Enhancer for changed settings, reusing the client unless credentials changed."""
+
+        same_endpoint = (config.api_key, config.base_url) == (
+            self.config.api_key,
+            self.config.base_url,
+        )
+        return PromptEnhancer(config, client=self._client if same_endpoint else None)
+
+    def _request_json(self, system_prompt: str, user_content: str) -> Dict[str, Any]:
+        with self._slots, timed("enhance_request"):
+            response = self.client.responses.create(
+                model=self.config.model,
+                temperature=self.config.temperature,
+                max_output_tokens=self.config.max_output_tokens,
+                response_format={"type": "json_object"},
+                input=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content},
+                ],
+            )
+        with timed("json_parse"):
+            payload = _extract_text(response)
+            return json.loads(payload)
+
+    def _stream_json(
+        self, system_prompt: str, user_content: str, on_progress: ProgressCallback
+    ) -> Dict[str, Any]:
+        """Like `_request_json`, but reports the summary and each section as they arrive."""
+
+        scanner = _JsonMemberScanner(item_keys=("sections",))
+        chunks: List[str] = []
+        sections = 0
+        with self._slots, timed("enhance_request"):
+            stream = self.client.responses.create(
+                model=self.config.model,
+                temperature=self.config.temperature,
+                max_output_tokens=self.config.max_output_tokens,
+                response_format={"type": "json_object"},
+                input=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content},
+                ],
+                stream=True,
+            )
+            for delta in _iter_text_deltas(stream):
+                chunks.append(delta)
+                for kind, key, value in scanner.feed(delta):
+                    if kind == "member" and key == "summary":
+                        on_progress("summary", {"summary": str(value or "").strip()})
+                    elif kind == "item" and key == "sections" and isinstance(value, dict):
+                        on_progress(
+                            "section",
+                            {
+                                "index": sections,
+                                "title": value.get("title", "Details"),
+                                "content": str(value.get("content", "")).strip(),
+                            },
+                        )
+                        sections += 1
+        with timed("json_parse"):
+            return json.loads("".join(chunks))
+
+    def enhance(self, brief: str, on_progress: Optional[ProgressCallback] = None) -> EnhancedPrompt:
         if not brief or not brief.strip():
             raise ValueError("Brief must be non-empty")
 
-        response = self.client.responses.create(
-            model=self.config.model,
-            temperature=self.config.temperature,
-            max_output_tokens=self.config.max_output_tokens,
-            response_format={"type": "json_object"},
-            input=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": brief.strip()},
-            ],
-        )
-        payload = _extract_text(response)
-        data = json.loads(payload)
+        if on_progress is None:
+            data = self._request_json(SYSTEM_PROMPT, brief.strip())
+        else:
+            data = self._stream_json(SYSTEM_PROMPT, brief.strip(), on_progress)
         sections = [
             PromptSection(
                 title=item.get("title", "Details"),
@@ -149,6 +264,143 @@ class PromptEnhancer:
             original_brief=brief.strip(),
         )
 
+    def amend(self, prior: EnhancedPrompt, follow_up: str) -> EnhancedPrompt:
+        """Ask the model for a delta against `prior` and merge it in.
+
+        Only the structured plan and the follow-up note are sent, and the model
+        answers with the changed fields, which keeps both input and output small.
+        """
+
+        if not follow_up or not follow_up.strip():
+            raise ValueError("Follow-up note must be non-empty")
+
+        current_plan = prior.to_dict()
+        current_plan.pop("amendments", None)
+        user_content = json.dumps(
+            {"current_plan": current_plan, "follow_up": follow_up.strip()},
+            ensure_ascii=False,
+        )
+        delta = self._request_json(AMEND_SYSTEM_PROMPT, user_content)
+        return apply_amendment(prior, delta, follow_up.strip())
+
+
+DRAFT_WORK_TYPE = "DRAFT"
+
+
+def draft_prompt(brief: str) -> EnhancedPrompt:
+    """Placeholder prompt stored while enhancement is still pending."""
+
+    brief = brief.strip()
+    summary = brief if len(brief) <= 120 else brief[:117].rstrip() + "..."
+    return EnhancedPrompt(
+        work_type=DRAFT_WORK_TYPE,
+        summary=summary,
+        objectives=[],
+        risks=[],
+        milestones=[],
+        sections=[
+            PromptSection(
+                title="Status",
+                content="Enhancement pending; this draft is rewritten once it completes.",
+            )
+        ],
+        acceptance_criteria=[],
+        suggested_story_id=None,
+        original_brief=brief,
+    )
+
+
+# Headings `to_markdown` writes for list fields; every other `##` block is a section.
+_LIST_HEADINGS = {
+    "Objectives",
+    "Risks & Unknowns",
+    "Recommended Milestones",
+    "Acceptance Criteria",
+    "Amendments",
+}
+_SUGGESTED_ID_PREFIX = "_Suggested Story ID_:"
+
+
+def markdown_fields(markdown: str) -> Dict[str, Any]:
+    """Recover `sections` and `original_brief` from a prompt rendered by `to_markdown`.
+
+    Metadata written by early releases lacks both fields; without them an
+    amendment would rewrite the prompt with no plan body and no brief.
+    """
+
+    blocks: List[Tuple[str, List[str]]] = []
+    for line in markdown.splitlines():
+        if line.strip() == "---":
+            break  # branding footer
+        if line.startswith("## "):
+            blocks.append((line[3:].strip(), []))
+        elif blocks:
+            blocks[-1][1].append(line)
+    sections: List[Dict[str, str]] = []
+    brief = ""
+    for title, lines in blocks:
+        if title == "Original Brief":
+            kept = [line for line in lines if not line.startswith(_SUGGESTED_ID_PREFIX)]
+            text = "\n".join(kept).strip()
+            brief = text[1:].lstrip() if text.startswith(">") else text
+        elif title not in _LIST_HEADINGS:
+            sections.append({"title": title, "content": "\n".join(lines).strip()})
+    return {"sections": sections, "original_brief": brief}
+
+
+def _merge_list(
+    existing: List[str], add: Optional[Iterable[str]], remove: Optional[Iterable[str]]
+) -> List[str]:
+    removed = {item.casefold() for item in _string_list(remove)}
+    merged = [item for item in existing if item.casefold() not in removed]
+    seen = {item.casefold() for item in merged}
+    for item in _string_list(add):
+        if item.casefold() not in seen:
+            merged.append(item)
+            seen.add(item.casefold())
+    return merged
+
+
+def apply_amendment(prior: EnhancedPrompt, delta: Dict[str, Any], note: str) -> EnhancedPrompt:
+    """Merge a model-produced delta into `prior`, returning a new prompt."""
+
+    removed_titles = {title.casefold() for title in _string_list(delta.get("remove_sections"))}
+    sections = [
+        PromptSection(title=section.title, content=section.content)
+        for section in prior.sections
+        if section.title.casefold() not in removed_titles
+    ]
+    for item in delta.get("upsert_sections") or []:
+        title = str(item.get("title", "Details")).strip() or "Details"
+        content = str(item.get("content", "")).strip()
+        for section in sections:
+            if section.title.casefold() == title.casefold():
+                section.content = content
+                break
+        else:
+            sections.append(PromptSection(title=title, content=content))
+
+    return EnhancedPrompt(
+        work_type=(delta.get("work_type") or prior.work_type).strip(),
+        summary=(delta.get("summary") or prior.summary).strip(),
+        objectives=_merge_list(
+            prior.objectives, delta.get("add_objectives"), delta.get("remove_objectives")
+        ),
+        risks=_merge_list(prior.risks, delta.get("add_risks"), delta.get("remove_risks")),
+        milestones=_merge_list(
+            prior.milestones, delta.get("add_milestones"), delta.get("remove_milestones")
+        ),
+        sections=sections,
+        acceptance_criteria=_merge_list(
+            prior.acceptance_criteria,
+            delta.get("add_acceptance_criteria"),
+            delta.get("remove_acceptance_criteria"),
+        ),
+        suggested_story_id=prior.suggested_story_id,
+        original_brief=prior.original_brief,
+        amendments=[*prior.amendments, note],
+    )
+
 
 def _string_list(value: Optional[Iterable[str]]) -> List[str]:
     if not value:
@@ -156,6 +408,133 @@ def _string_list(value: Optional[Iterable[str]]) -> List[str]:
     return [str(item).strip() for item in value if str(item).strip()]
 
 
+class _JsonMemberScanner:
+    """Incrementally scans a streamed JSON object for completed members.
+
+    `feed` returns `("member", key, value)` once a top-level member's value is
+    complete and `("item", key, value)` for each finished element of the
+    arrays named in `item_keys`, long before the closing brace arrives.
+    """
+
+    def __init__(self, item_keys: Iterable[str] = ()) -> None:
+        self.item_keys = set(item_keys)
+        self._text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._items = False
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, str, Any]]:
+        start = len(self._text)
+        self._text += chunk
+        events: List[Tuple[str, str, Any]] = []
+        for index in range(start, len(self._text)):
+            char = self._text[index]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._end_string(index + 1, events)
+                continue
+            if char.isspace() or char == ":" or (self._depth == 0 and char != "{"):
+                continue
+            if char in "{[":
+                self._begin(index)
+                self._depth += 1
+                if char == "[" and self._depth == 2 and self._key in self.item_keys:
+                    self._items = True
+            elif char in "}]":
+                self._end_scalar(index, events)
+                self._depth -= 1
+                self._end_container(index + 1, events)
+            elif char == ",":
+                self._end_scalar(index, events)
+            else:
+                if char == '"':
+                    self._in_string = True
+                self._begin(index)
+        return events
+
+    def _begin(self, index: int) -> None:
+        if self._depth == 1:
+            if self._key is None:
+                if self._key_start is None:
+                    self._key_start = index
+            elif self._value_start is None:
+                self._value_start = index
+        elif self._depth == 2 and self._items and self._item_start is None:
+            self._item_start = index
+
+    def _member(self, end: int, events: List[Tuple[str, str, Any]]) -> None:
+        assert self._key is not None and self._value_start is not None
+        events.append(("member", self._key, self._decode(self._value_start, end)))
+        self._key = None
+        self._value_start = None
+
+    def _item(self, end: int, events: List[Tuple[str, str, Any]]) -> None:
+        assert self._key is not None and self._item_start is not None
+        events.append(("item", self._key, self._decode(self._item_start, end)))
+        self._item_start = None
+
+    def _decode(self, start: int, end: int) -> Any:
+        try:
+            return json.loads(self._text[start:end])
+        except ValueError:
+            return None
+
+    def _end_string(self, end: int, events: List[Tuple[str, str, Any]]) -> None:
+        if self._depth == 1 and self._key_start is not None:
+            self._key = self._decode(self._key_start, end)
+            self._key_start = None
+        elif (
+            self._depth == 1
+            and self._value_start is not None
+            and self._text[self._value_start] == '"'
+        ):
+            self._member(end, events)
+        elif (
+            self._depth == 2
+            and self._item_start is not None
+            and self._text[self._item_start] == '"'
+        ):
+            self._item(end, events)
+
+    def _end_scalar(self, end: int, events: List[Tuple[str, str, Any]]) -> None:
+        """Numbers and literals only end at the next delimiter."""
+
+        if self._depth == 1 and self._value_start is not None:
+            if self._text[self._value_start] not in '"{[':
+                self._member(end, events)
+        elif self._depth == 2 and self._item_start is not None:
+            if self._text[self._item_start] not in '"{[':
+                self._item(end, events)
+
+    def _end_container(self, end: int, events: List[Tuple[str, str, Any]]) -> None:
+        if self._depth == 1 and self._value_start is not None:
+            self._items = False
+            self._member(end, events)
+        elif self._depth == 2 and self._item_start is not None:
+            self._item(end, events)
+
+
+def _iter_text_deltas(stream: Any) -> Iterator[str]:
+    """Text chunks of a streamed response; whole text for clients that ignore `stream`."""
+
+    if hasattr(stream, "output") or hasattr(stream, "choices") or isinstance(stream, str):
+        yield _extract_text(stream)
+        return
+    for event in stream:
+        if getattr(event, "type", "") == "response.output_text.delta":
+            yield event.delta
+
+
 def _extract_text(response: object) -> str:
     """
     Extract text payload from OpenAI responses.create output.
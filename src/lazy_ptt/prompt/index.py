@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import sqlite3
+
+LOGGER = logging.getLogger(__name__)
+
+INDEX_FILENAME = "prompt-index.sqlite3"
+STAGING = "staging"
+PROJECT_MANAGEMENT = "project-management"
+# Directory under `project_management_root` that relocated prompts are copied to.
+PM_PROMPTS_DIRNAME = "user-story-prompts"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prompts (
+    id INTEGER PRIMARY KEY,
+    prompt_path TEXT NOT NULL UNIQUE,
+    metadata_path TEXT NOT NULL,
+    story_id TEXT NOT NULL,
+    location TEXT NOT NULL,
+    work_type TEXT,
+    summary TEXT,
+    revision INTEGER NOT NULL DEFAULT 1,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS prompts_updated ON prompts(updated_at DESC);
+CREATE INDEX IF NOT EXISTS prompts_story ON prompts(story_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS prompts_fts USING fts5(
+    story_id, summary, objectives, sections, original_brief,
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+_COLUMNS = (
+    "prompt_path, metadata_path, story_id, location, work_type, summary, revision, updated_at"
+)
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class IndexedPrompt:
+    """One saved prompt as listed by the index."""
+
+    story_id: str
+    prompt_path: str
+    metadata_path: str
+    location: str
+    work_type: Optional[str]
+    summary: Optional[str]
+    revision: int
+    updated_at: Optional[str]
+    snippet: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class PromptPage:
+    """A page of `list`/`search` results plus the total number of matches."""
+
+    total: int
+    limit: int
+    offset: int
+    items: List[IndexedPrompt] = field(default_factory=list)
+
+    @property
+    def next_offset(self) -> Optional[int]:
+        following = self.offset + len(self.items)
+        return following if following < self.total else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "limit": self.limit,
+            "offset": self.offset,
+            "next_offset": self.next_offset,
+            "items": [item.to_dict() for item in self.items],
+        }
+
+
+def match_expression(query: str) -> Optional[str]:
+    """FTS5 query for free text: every word must match, the last one as a prefix.
+
+    Words are quoted so user input can never be parsed as FTS syntax.
+    """
+
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _fts_fields(metadata: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    sections = metadata.get("sections") or []
+    return (
+        str(metadata.get("summary") or ""),
+        "\n".join(str(item) for item in metadata.get("objectives") or []),
+        "\n".join(
+            f"{item.get('title', '')}\n{item.get('content', '')}"
+            for item in sections
+            if isinstance(item, dict)
+        ),
+        str(metadata.get("original_brief") or ""),
+    )
+
+
+class PromptIndex:
+    """SQLite catalogue of saved prompts with full-text search.
+
+    `PromptStorage` records every save, revision and relocation here, so
+    listing and searching never walk the prompt tree or parse metadata files.
+    The full-text table covers the summary, objectives, sections and original
+    brief. `rebuild` re-creates the catalogue from an existing tree in one
+    transaction. Index writes are best effort: a failure is logged and never
+    fails the save that triggered it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        import sqlite3  # on first use: keeps it out of create-feature when unindexed
+
+        self._error = sqlite3.Error
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -- writing -------------------------------------------------------------
+
+    def _upsert(
+        self,
+        conn: sqlite3.Connection,
+        prompt_path: Path,
+        metadata_path: Path,
+        location: str,
+        metadata: Dict[str, Any],
+    ) -> None:
+        story_id = str(metadata.get("story_id") or prompt_path.parent.name)
+        conn.execute(
+            "INSERT INTO prompts (" + _COLUMNS + ") VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(prompt_path) DO UPDATE SET metadata_path=excluded.metadata_path, "
+            "story_id=excluded.story_id, location=excluded.location, "
+            "work_type=excluded.work_type, summary=excluded.summary, "
+            "revision=excluded.revision, updated_at=excluded.updated_at",
+            (
+                str(prompt_path),
+                str(metadata_path),
+                story_id,
+                location,
+                metadata.get("work_type"),
+                metadata.get("summary"),
+                int(metadata.get("revision") or 1),
+                metadata.get("updated_at"),
+            ),
+        )
+        row = conn.execute(
+            "SELECT id FROM prompts WHERE prompt_path = ?", (str(prompt_path),)
+        ).fetchone()
+        conn.execute("DELETE FROM prompts_fts WHERE rowid = ?", (row[0],))
+        conn.execute(
+            "INSERT INTO prompts_fts (rowid, story_id, summary, objectives, sections, "
+            "original_brief) VALUES (?, ?, ?, ?, ?, ?)",
+            (row[0], story_id, *_fts_fields(metadata)),
+        )
+
+    def record(
+        self,
+        prompt_path: Path,
+        metadata_path: Path,
+        metadata: Dict[str, Any],
+        location: str = STAGING,
+    ) -> None:
+        """Add or refresh one prompt; `metadata` is the content of its metadata file."""
+
+        try:
+            with self._lock, self._conn:
+                self._upsert(self._conn, prompt_path, metadata_path, location, metadata)
+        except self._error as exc:
+            LOGGER.warning("Could not index %s: %s", prompt_path, exc)
+
+    def remove(self, prompt_path: Path) -> None:
+        try:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "SELECT id FROM prompts WHERE prompt_path = ?", (str(prompt_path),)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute("DELETE FROM prompts WHERE id = ?", (row[0],))
+                    self._conn.execute("DELETE FROM prompts_fts WHERE rowid = ?", (row[0],))
+        except self._error as exc:
+            LOGGER.warning("Could not drop %s from the prompt index: %s", prompt_path, exc)
+
+    def rebuild(self, roots: Iterable[Tuple[str, Path]], metadata_filename: str) -> int:
+        """Replace the catalogue with the prompts found under `(location, root)` pairs."""
+
+        entries = list(_scan(roots, metadata_filename))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM prompts")
+            self._conn.execute("DELETE FROM prompts_fts")
+            for location, prompt_path, metadata_path, metadata in entries:
+                self._upsert(self._conn, prompt_path, metadata_path, location, metadata)
+        LOGGER.debug("Indexed %d prompt(s) into %s", len(entries), self.path)
+        return len(entries)
+
+    # -- reading -------------------------------------------------------------
+
+    def list(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        work_type: Optional[str] = None,
+        location: Optional[str] = None,
+    ) -> PromptPage:
+        """Prompts by most recent update first."""
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        if work_type:
+            clauses.append("work_type = ? COLLATE NOCASE")
+            params.append(work_type)
+        if location:
+            clauses.append("location = ?")
+            params.append(location)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM prompts{where}", params).fetchone()
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS}, NULL FROM prompts{where} "
+                "ORDER BY updated_at DESC, id DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return PromptPage(total[0], limit, offset, [_indexed(row) for row in rows])
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> PromptPage:
+        """Best full-text matches first, each with a highlighted snippet."""
+
+        expression = match_expression(query)
+        if expression is None:
+            return PromptPage(0, limit, offset)
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COUNT(*) FROM prompts_fts WHERE prompts_fts MATCH ?", (expression,)
+            ).fetchone()
+            rows = self._conn.execute(
+                "SELECT p.prompt_path, p.metadata_path, p.story_id, p.location, p.work_type, "
+                "p.summary, p.revision, p.updated_at, "
+                "snippet(prompts_fts, -1, '[', ']', '…', 12) "
+                "FROM prompts_fts JOIN prompts p ON p.id = prompts_fts.rowid "
+                "WHERE prompts_fts MATCH ? ORDER BY bm25(prompts_fts) LIMIT ? OFFSET ?",
+                (expression, limit, offset),
+            ).fetchall()
+        return PromptPage(total[0], limit, offset, [_indexed(row) for row in rows])
+
+
+def _indexed(row: Tuple[Any, ...]) -> IndexedPrompt:
+    prompt_path, metadata_path, story_id, location, work_type, summary, revision = row[:7]
+    return IndexedPrompt(
+        story_id=story_id,
+        prompt_path=prompt_path,
+        metadata_path=metadata_path,
+        location=location,
+        work_type=work_type,
+        summary=summary,
+        revision=revision,
+        updated_at=row[7],
+        snippet=row[8],
+    )
+
+
+def _scan(
+    roots: Iterable[Tuple[str, Path]], metadata_filename: str
+) -> Iterator[Tuple[str, Path, Path, Dict[str, Any]]]:
+    for location, root in roots:
+        # One story per directory; archived revisions live deeper and are skipped.
+        for metadata_path in sorted(Path(root).glob(f"*/{metadata_filename}")):
+            try:
+                metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                LOGGER.warning("Skipping unreadable %s: %s", metadata_path, exc)
+                continue
+            for prompt_path in sorted(metadata_path.parent.glob("*.md")):
+                yield location, prompt_path, metadata_path, metadata
+
+
+def index_roots(config: Any) -> List[Tuple[str, Path]]:
+    """Where `config`'s prompts live: staging, then the project-management copies."""
+
+    return [
+        (STAGING, config.paths.prompt_output_root),
+        (PROJECT_MANAGEMENT, config.paths.project_management_root / PM_PROMPTS_DIRNAME),
+    ]
+
+
+def open_prompt_index(config: Any) -> Optional[PromptIndex]:
+    """The prompt index under `config`'s state directory, or None when disabled."""
+
+    if not config.prompt.index:
+        return None
+    import sqlite3
+
+    try:
+        return PromptIndex(config.paths.state_dir / INDEX_FILENAME)
+    except sqlite3.Error as exc:  # e.g. an SQLite build without FTS5
+        LOGGER.warning("Prompt index unavailable: %s", exc)
+        return None
@@ -2,16 +2,19 @@ from __future__ import annotations
 
 import json
 import re
-import shutil
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 
-from .enhancer import EnhancedPrompt
+from ..timing import timed
+from .enhancer import EnhancedPrompt, markdown_fields
+from .index import PM_PROMPTS_DIRNAME, PROJECT_MANAGEMENT, STAGING, PromptIndex, open_prompt_index
+from .writer import PromptWriter, StagedFiles, copy_atomic, write_atomic
 
 
 SAFE_STORY_PATTERN = re.compile(r"[^a-zA-Z0-9_.-]+")
+REVISIONS_DIRNAME = "revisions"
 
 
 def _slugify(value: str) -> str:
@@ -24,18 +27,76 @@ class SavedPrompt:
     story_id: str
     prompt_path: Path
     metadata_path: Path
+    revision: int = 1
 
 
 class PromptStorage:
-    """Persists enhanced prompt artifacts and manages relocation to project-management."""
+    """Persists enhanced prompt artifacts and manages relocation to project-management.
 
-    def __init__(self, output_root: Path, filename_pattern: str, metadata_filename: str) -> None:
+    With an `index`, every save, revision and relocation is also recorded in
+    the `PromptIndex` behind `lazy-ptt list` and `lazy-ptt search`.
+
+    Files are replaced atomically (temporary file plus rename), so a crash
+    never leaves a half-written prompt. With a `writer`, `save` and
+    `relocate_to_project_management` return their paths immediately and the
+    rendering, writing and indexing happen on the writer's thread; methods
+    that read saved files call `flush` first. Call `close` before exiting.
+    `save` takes an `on_written` callback for callers that must know when
+    the prompt is really on disk; it never runs if the write fails.
+    """
+
+    def __init__(
+        self,
+        output_root: Path,
+        filename_pattern: str,
+        metadata_filename: str,
+        index: Optional[PromptIndex] = None,
+        writer: Optional[PromptWriter] = None,
+    ) -> None:
         self.output_root = output_root
         self.filename_pattern = filename_pattern
         self.metadata_filename = metadata_filename
+        self.index = index
+        self.writer = writer
         self.output_root.mkdir(parents=True, exist_ok=True)
 
-    def save(self, prompt: EnhancedPrompt, story_id: Optional[str] = None) -> SavedPrompt:
+    @classmethod
+    def from_config(cls, config: Any) -> "PromptStorage":
+        return cls(
+            output_root=config.paths.prompt_output_root,
+            filename_pattern=config.prompt.filename_pattern,
+            metadata_filename=config.prompt.metadata_filename,
+            index=open_prompt_index(config),
+            writer=PromptWriter() if config.prompt.write_behind else None,
+        )
+
+    def flush(self) -> None:
+        """Block until every write-behind save and relocation is on disk."""
+
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer; later saves write synchronously."""
+
+        if self.writer is not None:
+            self.writer.close()
+
+    def _index(self, index: PromptIndex, saved: SavedPrompt, metadata: Dict[str, Any]) -> None:
+        inside = saved.prompt_path.is_relative_to(self.output_root)
+        index.record(
+            saved.prompt_path,
+            saved.metadata_path,
+            metadata,
+            location=STAGING if inside else PROJECT_MANAGEMENT,
+        )
+
+    def save(
+        self,
+        prompt: EnhancedPrompt,
+        story_id: Optional[str] = None,
+        on_written: Optional[Callable[[SavedPrompt], None]] = None,
+    ) -> SavedPrompt:
         story_id = (
             story_id
             or prompt.suggested_story_id
@@ -46,33 +107,82 @@ class PromptStorage:
             raise ValueError("Story ID resolved to an empty string")
 
         story_dir = self.output_root / safe_story_id
-        story_dir.mkdir(parents=True, exist_ok=True)
+        return self._write(story_dir, safe_story_id, prompt, revision=1, on_written=on_written)
+
+    def save_revision(self, saved_prompt: SavedPrompt, prompt: EnhancedPrompt) -> SavedPrompt:
+        """Archive the current prompt artifacts and write `prompt` as the next revision."""
+
+        story_dir = saved_prompt.prompt_path.parent
+        revision = self.read_metadata(saved_prompt).get("revision", saved_prompt.revision)
+        archive_dir = story_dir / REVISIONS_DIRNAME / f"rev-{int(revision):03d}"
+        copy_atomic(saved_prompt.prompt_path, archive_dir / saved_prompt.prompt_path.name)
+        copy_atomic(saved_prompt.metadata_path, archive_dir / saved_prompt.metadata_path.name)
 
+        updated = self._write(story_dir, saved_prompt.story_id, prompt, revision=int(revision) + 1)
+        if updated.prompt_path != saved_prompt.prompt_path:
+            # Work type changed and with it the filename; drop the stale copy.
+            saved_prompt.prompt_path.unlink(missing_ok=True)
+            if self.index is not None:
+                self.index.remove(saved_prompt.prompt_path)
+        return updated
+
+    def _write(
+        self,
+        story_dir: Path,
+        story_id: str,
+        prompt: EnhancedPrompt,
+        revision: int,
+        on_written: Optional[Callable[[SavedPrompt], None]] = None,
+    ) -> SavedPrompt:
         filename = self.filename_pattern.format(
-            story_id=safe_story_id,
+            story_id=story_id,
             work_type=_slugify(prompt.work_type),
         )
-        prompt_path = story_dir / filename
-        prompt_path.write_text(prompt.to_markdown(), encoding="utf-8")
-
-        metadata = {
-            "story_id": safe_story_id,
-            "work_type": prompt.work_type,
-            "summary": prompt.summary,
-            "objectives": prompt.objectives,
-            "risks": prompt.risks,
-            "milestones": prompt.milestones,
-            "acceptance_criteria": prompt.acceptance_criteria,
-            "suggested_story_id": prompt.suggested_story_id,
+        saved = SavedPrompt(
+            story_id=story_id,
+            prompt_path=story_dir / filename,
+            metadata_path=story_dir / self.metadata_filename,
+            revision=revision,
+        )
+        header = {
+            "story_id": story_id,
+            "revision": revision,
+            "updated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
         }
-        metadata_path = story_dir / self.metadata_filename
-        metadata_path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+        if self.writer is not None and self.writer.submit(
+            lambda files: self._stage_save(files, saved, prompt, header, on_written)
+        ):
+            return saved
 
-        return SavedPrompt(
-            story_id=safe_story_id,
-            prompt_path=prompt_path,
-            metadata_path=metadata_path,
-        )
+        with timed("render"):
+            markdown, metadata, metadata_json = _render(prompt, header)
+        with timed("storage_write"):
+            story_dir.mkdir(parents=True, exist_ok=True)
+            write_atomic(saved.prompt_path, markdown)
+            write_atomic(saved.metadata_path, metadata_json)
+        if self.index is not None:
+            with timed("index"):
+                self._index(self.index, saved, metadata)
+        if on_written is not None:
+            on_written(saved)
+        return saved
+
+    def _stage_save(
+        self,
+        files: StagedFiles,
+        saved: SavedPrompt,
+        prompt: EnhancedPrompt,
+        header: Dict[str, Any],
+        on_written: Optional[Callable[[SavedPrompt], None]] = None,
+    ) -> None:
+        markdown, metadata, metadata_json = _render(prompt, header)
+        files.write(saved.prompt_path, markdown)
+        files.write(saved.metadata_path, metadata_json)
+        index = self.index
+        if index is not None:
+            files.after_commit(lambda: self._index(index, saved, metadata))
+        if on_written is not None:
+            files.after_commit(lambda: on_written(saved))
 
     def relocate_to_project_management(
         self,
@@ -80,17 +190,63 @@ class PromptStorage:
         project_management_root: Path,
         story_title: Optional[str] = None,
     ) -> Path:
-        dest_dir = project_management_root / "user-story-prompts" / saved_prompt.story_id
-        dest_dir.mkdir(parents=True, exist_ok=True)
-        if story_title:
-            (dest_dir / "README.txt").write_text(story_title.strip() + "\n", encoding="utf-8")
+        dest_dir = project_management_root / PM_PROMPTS_DIRNAME / saved_prompt.story_id
         dest_prompt = dest_dir / saved_prompt.prompt_path.name
         dest_metadata = dest_dir / saved_prompt.metadata_path.name
-        shutil.copy2(saved_prompt.prompt_path, dest_prompt)
-        shutil.copy2(saved_prompt.metadata_path, dest_metadata)
+        readme = (story_title.strip() + "\n").encode("utf-8") if story_title else None
+        self._drop_stale_copies(dest_dir, keep=dest_prompt.name)
+        if self.writer is not None and self.writer.submit(
+            lambda files: self._stage_relocation(files, saved_prompt, dest_prompt, readme)
+        ):
+            return dest_prompt
+
+        with timed("relocate"):
+            dest_dir.mkdir(parents=True, exist_ok=True)
+            if readme is not None:
+                write_atomic(dest_dir / "README.txt", readme)
+            copy_atomic(saved_prompt.prompt_path, dest_prompt)
+            copy_atomic(saved_prompt.metadata_path, dest_metadata)
+        if self.index is not None:
+            self.index.record(
+                dest_prompt,
+                dest_metadata,
+                self.read_metadata(saved_prompt),
+                location=PROJECT_MANAGEMENT,
+            )
         return dest_prompt
 
+    def _drop_stale_copies(self, dest_dir: Path, keep: str) -> None:
+        # A revision that changed the work type (e.g. an enhanced draft) also
+        # changed the filename; the copy under the old name is out of date.
+        for stale in dest_dir.glob("*.md"):
+            if stale.name != keep:
+                stale.unlink(missing_ok=True)
+                if self.index is not None:
+                    self.index.remove(stale)
+
+    def _stage_relocation(
+        self,
+        files: StagedFiles,
+        saved_prompt: SavedPrompt,
+        dest_prompt: Path,
+        readme: Optional[bytes],
+    ) -> None:
+        # Reads see a save still staged in the same batch.
+        dest_metadata = dest_prompt.parent / saved_prompt.metadata_path.name
+        metadata_json = files.read(saved_prompt.metadata_path)
+        if readme is not None:
+            files.write(dest_prompt.parent / "README.txt", readme)
+        files.write(dest_prompt, files.read(saved_prompt.prompt_path))
+        files.write(dest_metadata, metadata_json)
+        index = self.index
+        if index is not None:
+            metadata = json.loads(metadata_json)
+            files.after_commit(
+                lambda: index.record(dest_prompt, dest_metadata, metadata, PROJECT_MANAGEMENT)
+            )
+
     def load_saved_prompt(self, prompt_path: Path) -> SavedPrompt:
+        self.flush()
         prompt_path = prompt_path.resolve()
         metadata_path = prompt_path.parent / self.metadata_filename
         if not metadata_path.exists():
@@ -98,9 +254,54 @@ class PromptStorage:
                 f"Metadata file not found alongside prompt: {metadata_path}"
             )
         story_id = prompt_path.parent.name
-        return SavedPrompt(story_id=story_id, prompt_path=prompt_path, metadata_path=metadata_path)
+        saved = SavedPrompt(story_id=story_id, prompt_path=prompt_path, metadata_path=metadata_path)
+        saved.revision = int(self.read_metadata(saved).get("revision", 1))
+        return saved
+
+    def read_metadata(self, saved_prompt: SavedPrompt) -> dict:
+        self.flush()
+        return json.loads(saved_prompt.metadata_path.read_text(encoding="utf-8"))
+
+    def load_prompt(self, saved_prompt: SavedPrompt) -> EnhancedPrompt:
+        """Rebuild the structured prompt from its metadata file.
+
+        Metadata from before sections and the brief were stored is completed
+        from the prompt's markdown, so a revision never drops them.
+        """
+
+        metadata = self.read_metadata(saved_prompt)
+        if "sections" not in metadata or "original_brief" not in metadata:
+            markdown = saved_prompt.prompt_path.read_text(encoding="utf-8")
+            metadata = {**markdown_fields(markdown), **metadata}
+        return EnhancedPrompt.from_dict(metadata)
+
+    def find_saved_prompt(
+        self, story_id: str, extra_roots: Iterable[Path] = ()
+    ) -> SavedPrompt:
+        """Locate a story by ID in staging first, then in any `extra_roots`."""
+
+        self.flush()
+        safe_story_id = SAFE_STORY_PATTERN.sub("-", story_id.upper()).strip("-")
+        for root in (self.output_root, *extra_roots):
+            story_dir = root / safe_story_id
+            if not (story_dir / self.metadata_filename).exists():
+                continue
+            for candidate in sorted(story_dir.glob("*.md")):
+                return self.load_saved_prompt(candidate)
+        raise FileNotFoundError(f"No saved prompt found for story {safe_story_id}")
 
     def _generate_story_id(self, work_type: str) -> str:
         timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
         base = _slugify(work_type or "FEATURE").upper()
         return f"US-{base}-{timestamp}"
+
+
+def _render(prompt: EnhancedPrompt, header: Dict[str, Any]) -> Tuple[bytes, Dict[str, Any], bytes]:
+    """Markdown bytes, the metadata dict and its JSON bytes for one saved prompt."""
+
+    metadata = {**header, **prompt.to_dict()}
+    return (
+        prompt.to_markdown().encode("utf-8"),
+        metadata,
+        json.dumps(metadata, indent=2).encode("utf-8"),
+    )
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _temp_path(path: Path) -> Path:
+    # Same directory as the target so the final `os.replace` is a rename.
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def _write_temp(path: Path, data: bytes, fsync: bool) -> Path:
+    tmp = _temp_path(path)
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            if fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return tmp
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # e.g. Windows cannot open directories
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path: Path, data: bytes, fsync: bool = False) -> None:
+    """Replace `path` with `data` so readers see the old or the new file, never a mix."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _write_temp(path, data, fsync)
+    os.replace(tmp, path)
+    if fsync:
+        _fsync_dir(path.parent)
+
+
+def copy_atomic(source: Path, destination: Path) -> None:
+    """`shutil.copy2` that never leaves a partially copied `destination` behind."""
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    tmp = _temp_path(destination)
+    try:
+        shutil.copy2(source, tmp)
+        os.replace(tmp, destination)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+class StagedFiles:
+    """File contents staged by the operations of one writer batch.
+
+    `read` sees files staged earlier in the batch before falling back to the
+    disk, so an operation can copy a file whose write is still pending.
+    """
+
+    def __init__(self, batch: Optional["StagedFiles"] = None) -> None:
+        self.files: Dict[Path, bytes] = {}
+        self.callbacks: List[Callable[[], None]] = []
+        self._batch = batch
+
+    def write(self, path: Path, data: bytes) -> None:
+        self.files.pop(path, None)  # keep the order of the latest write
+        self.files[path] = data
+
+    def read(self, path: Path) -> bytes:
+        data = self.files.get(path)
+        if data is not None:
+            return data
+        return self._batch.read(path) if self._batch is not None else path.read_bytes()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self.callbacks.append(callback)
+
+    def merge(self, other: "StagedFiles") -> None:
+        for path, data in other.files.items():
+            self.write(path, data)
+        self.callbacks.extend(other.callbacks)
+
+
+WriteOperation = Callable[[StagedFiles], None]
+
+
+class PromptWriter:
+    """Background thread that renders and commits prompt files in batches.
+
+    `submit` only enqueues an operation. The writer collects operations for
+    up to `flush_interval` seconds (or `batch_size` of them), runs them in
+    order to stage file contents, then commits the batch: every file is
+    written to a temporary sibling and fsynced, all are renamed into place,
+    and each touched directory is fsynced once. Callbacks registered with
+    `StagedFiles.after_commit` run once the files are in place.
+
+    `flush` blocks until everything submitted so far is committed; `close`
+    flushes and stops the thread, and also runs at interpreter exit.
+    """
+
+    def __init__(
+        self, flush_interval: float = 0.05, batch_size: int = 32, fsync: bool = True
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self.fsync = fsync
+        self.failures = 0
+        self._ops: "queue.Queue[Optional[Tuple[Any, ...]]]" = queue.Queue()
+        self._closed = False
+        self._submit_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._loop, name="lazy-ptt-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, operation: WriteOperation) -> bool:
+        """Queue `operation`; False once closed, so the caller writes synchronously."""
+
+        with self._submit_lock:
+            if self._closed:
+                return False
+            self._ops.put(("op", operation))
+            return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._ops.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._ops.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    @property
+    def pending(self) -> int:
+        return self._ops.qsize()
+
+    def _loop(self) -> None:
+        running = True
+        while running:
+            operations: List[WriteOperation] = []
+            waiters: List[threading.Event] = []
+            entry = self._ops.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if entry is None:
+                    running = False
+                    break
+                kind, value = entry
+                if kind == "flush":
+                    waiters.append(value)
+                    break  # commit now rather than waiting out the interval
+                operations.append(value)
+                if len(operations) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = self._ops.get(timeout=max(remaining, 0.0))
+                except queue.Empty:
+                    break
+            if operations:
+                self._commit(operations)
+            for waiter in waiters:
+                waiter.set()
+
+    def _commit(self, operations: List[WriteOperation]) -> None:
+        batch = StagedFiles()
+        for operation in operations:
+            staged = StagedFiles(batch)  # merged only if the operation succeeds
+            try:
+                operation(staged)
+            except Exception as exc:
+                self.failures += 1
+                LOGGER.error("Dropping a prompt write that failed to render: %s", exc)
+                continue
+            batch.merge(staged)
+        temps: List[Tuple[Path, Path]] = []
+        try:
+            for path, data in batch.files.items():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temps.append((_write_temp(path, data, self.fsync), path))
+            for tmp, path in temps:
+                os.replace(tmp, path)
+        except OSError as exc:
+            self.failures += 1
+            LOGGER.error("Failed to write %d prompt file(s): %s", len(batch.files), exc)
+            for tmp, _ in temps:
+                tmp.unlink(missing_ok=True)
+            return
+        if self.fsync:
+            directories: Set[Path] = {path.parent for path in batch.files}
+            for directory in directories:
+                _fsync_dir(directory)
+        for callback in batch.callbacks:
+            try:
+                callback()
+            except Exception as exc:
+                LOGGER.warning("Prompt write callback failed: %s", exc)
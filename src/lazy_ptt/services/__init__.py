@@ -1,4 +1,24 @@
-from .daemon import PTTDaemon
-from .ptt_service import PTTService, PTTOutcome
+from __future__ import annotations
+
+from typing import Any
 
 __all__ = ['PTTDaemon', 'PTTService', 'PTTOutcome']
+
+# Resolved on first access (PEP 562) so importing a light submodule such as
+# `services.control` does not drag in numpy, the OpenAI SDK and the audio stack.
+_EXPORTS = {
+    'PTTDaemon': '.daemon',
+    'PTTService': '.ptt_service',
+    'PTTOutcome': '.ptt_service',
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from ..config import ConfigError
+from ..stt.remote import bind_unix_server, recv_frame, send_frame
+from .workspaces import ServiceRef
+
+LOGGER = logging.getLogger(__name__)
+
+CONTROL_SOCKET_FILENAME = "daemon.sock"
+# A daemon that does not answer a ping this fast is treated as absent.
+CONNECT_TIMEOUT_SECONDS = 2.0
+
+
+class DaemonError(RuntimeError):
+    """Raised when the daemon fails a forwarded command or drops the connection."""
+
+
+def outcome_payload(outcome: Any) -> Dict[str, Any]:
+    """The parts of a `PTTOutcome` the CLI reports, as JSON-safe values."""
+
+    saved = outcome.saved_prompt
+    compaction = getattr(outcome, "compaction", None)
+    return {
+        "prompt_path": str(saved.prompt_path),
+        "story_id": saved.story_id,
+        "revision": getattr(saved, "revision", 1),
+        "work_type": outcome.enhanced.work_type,
+        "summary": outcome.enhanced.summary,
+        "compaction": compaction.describe() if compaction is not None else None,
+        "deferred": bool(getattr(outcome, "deferred", False)),
+        "timings": dict(getattr(outcome, "timings", {})),
+    }
+
+
+class _Described:
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def describe(self) -> str:
+        return self.text
+
+
+@dataclass
+class RemoteOutcome:
+    """Client-side view of an outcome produced by the daemon.
+
+    Mirrors the attributes of `PTTOutcome` that the CLI prints, so command
+    handlers work unchanged whether they ran in-process or in the daemon.
+    """
+
+    saved_prompt: SimpleNamespace
+    enhanced: SimpleNamespace
+    compaction: Optional[_Described] = None
+    deferred: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "RemoteOutcome":
+        return cls(
+            saved_prompt=SimpleNamespace(
+                prompt_path=Path(payload["prompt_path"]),
+                story_id=payload["story_id"],
+                revision=payload.get("revision", 1),
+            ),
+            enhanced=SimpleNamespace(
+                work_type=payload["work_type"], summary=payload.get("summary", "")
+            ),
+            compaction=_Described(payload["compaction"]) if payload.get("compaction") else None,
+            deferred=bool(payload.get("deferred")),
+            timings=dict(payload.get("timings") or {}),
+        )
+
+
+class ControlServer:
+    """Unix socket through which CLI invocations run commands in the daemon.
+
+    The daemon already holds a loaded Whisper model and a warm OpenAI client,
+    so a forwarded `process-audio` costs only transcription and enhancement.
+    Requests are served on background threads next to the hotkey loop and
+    call the same `PTTService` methods the CLI would call in-process.
+
+    `service` is the daemon's `ServiceRef` (a bare service is wrapped in
+    one), so a request always runs on the service the last config change
+    swapped in. With `workspaces`, commands run in the active workspace, and
+    the `workspaces`/`activate` operations list and switch workspaces.
+    """
+
+    def __init__(self, service: Any, socket_path: Path, workspaces: Any = None) -> None:
+        self.services = service if isinstance(service, ServiceRef) else ServiceRef(service)
+        self.socket_path = socket_path
+        self.workspaces = workspaces
+        self._server = bind_unix_server(socket_path, self._dispatch, "lazy-ptt daemon")
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="lazy-ptt-control", daemon=True
+        )
+        self._thread.start()
+        LOGGER.info("Daemon control socket listening on %s", self.socket_path)
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+    def _service(self, active: bool = True) -> Any:
+        if self.workspaces is None:
+            return self.services.get()
+        workspace = self.workspaces.active if active else self.workspaces.primary
+        return workspace.service
+
+    def _dispatch(self, header: Dict[str, Any], _payload: bytes) -> Dict[str, Any]:
+        op = header.get("op")
+        if op == "ping":
+            transcriber = getattr(self._service(active=False), "transcriber", None)
+            loaded = bool(getattr(transcriber, "is_loaded", False))
+            return {"ok": True, "pid": os.getpid(), "loaded": loaded}
+        if op in ("workspaces", "activate"):
+            if self.workspaces is None:
+                raise ConfigError("The daemon serves a single project (no workspaces configured)")
+            if op == "activate":
+                self.workspaces.activate(header["name"])
+            return {"ok": True, "workspaces": self.workspaces.describe()}
+        service = self._service()
+        options = {
+            "story_id": header.get("story_id"),
+            "story_title": header.get("story_title"),
+            "auto_move": bool(header.get("auto_move", False)),
+        }
+        if op == "enhance_text":
+            outcome = service.enhance_text(header["text"], **options)
+        elif op == "process_audio":
+            outcome = service.process_audio_file(Path(header["path"]), **options)
+        elif op == "amend":
+            prompt_path = header.get("prompt_path")
+            outcome = service.amend_text(
+                header["text"],
+                prompt_path=Path(prompt_path) if prompt_path else None,
+                story_id=options["story_id"],
+                story_title=options["story_title"],
+                auto_move=options["auto_move"],
+            )
+        elif op == "transcribe":
+            result = service.transcribe_file(Path(header["path"]))
+            return {"ok": True, "text": result.text, "language": result.language}
+        else:
+            raise ValueError(f"Unknown operation {op!r}")
+        return {"ok": True, "outcome": outcome_payload(outcome)}
+
+
+class DaemonClient:
+    """Stands in for `PTTService` in the CLI by forwarding to a running daemon.
+
+    Only the calls the forwarded commands make are provided. Use `connect`,
+    which returns None when no daemon answers so callers can fall back to an
+    in-process service.
+    """
+
+    def __init__(self, sock: socket.socket, socket_path: Path, config: Any = None) -> None:
+        self._sock = sock
+        self.socket_path = socket_path
+        self.config = config
+        self.transcriber = self  # `cmd_amend` transcribes via `service.transcriber`
+
+    @classmethod
+    def connect(cls, socket_path: Path, config: Any = None) -> Optional["DaemonClient"]:
+        if not hasattr(socket, "AF_UNIX") or not socket_path.exists():
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(CONNECT_TIMEOUT_SECONDS)
+        try:
+            sock.connect(str(socket_path))
+            send_frame(sock, {"op": "ping"})
+            reply, _ = recv_frame(sock)
+        except (OSError, EOFError, ValueError) as exc:
+            LOGGER.debug("No daemon on %s (%s); running in-process", socket_path, exc)
+            sock.close()
+            return None
+        if not reply.get("ok"):
+            sock.close()
+            return None
+        sock.settimeout(None)  # transcription plus enhancement can take a while
+        LOGGER.info("Forwarding to the daemon (pid %s) on %s", reply.get("pid"), socket_path)
+        return cls(sock, socket_path, config)
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def call(self, op: str, **params: Any) -> Dict[str, Any]:
+        try:
+            send_frame(self._sock, {"op": op, **params})
+            reply, _ = recv_frame(self._sock)
+        except (OSError, EOFError, ValueError) as exc:
+            raise DaemonError(f"Lost the daemon on {self.socket_path}: {exc}") from exc
+        if not reply.get("ok"):
+            if reply.get("type") == "ConfigError":
+                raise ConfigError(reply.get("detail") or reply.get("error", ""))
+            raise DaemonError(reply.get("error") or "Daemon error")
+        return reply
+
+    def _outcome(self, op: str, **params: Any) -> RemoteOutcome:
+        return RemoteOutcome.from_payload(self.call(op, **params)["outcome"])
+
+    def enhance_text(
+        self,
+        text: str,
+        story_id: Optional[str] = None,
+        story_title: Optional[str] = None,
+        auto_move: bool = False,
+    ) -> RemoteOutcome:
+        return self._outcome(
+            "enhance_text",
+            text=text,
+            story_id=story_id,
+            story_title=story_title,
+            auto_move=auto_move,
+        )
+
+    def process_audio_file(
+        self,
+        file_path: Path,
+        story_id: Optional[str] = None,
+        story_title: Optional[str] = None,
+        auto_move: bool = False,
+    ) -> RemoteOutcome:
+        # The daemon may run in another directory; send what this shell meant.
+        return self._outcome(
+            "process_audio",
+            path=str(Path(file_path).resolve()),
+            story_id=story_id,
+            story_title=story_title,
+            auto_move=auto_move,
+        )
+
+    def amend_text(
+        self,
+        text: str,
+        prompt_path: Optional[Path] = None,
+        story_id: Optional[str] = None,
+        story_title: Optional[str] = None,
+        auto_move: bool = False,
+    ) -> RemoteOutcome:
+        return self._outcome(
+            "amend",
+            text=text,
+            prompt_path=str(Path(prompt_path).resolve()) if prompt_path else None,
+            story_id=story_id,
+            story_title=story_title,
+            auto_move=auto_move,
+        )
+
+    def workspaces(self) -> List[Dict[str, Any]]:
+        return self.call("workspaces")["workspaces"]
+
+    def activate_workspace(self, name: str) -> List[Dict[str, Any]]:
+        return self.call("activate", name=name)["workspaces"]
+
+    def transcribe_file(self, file_path: Path, language: Optional[str] = None) -> SimpleNamespace:
+        reply = self.call("transcribe", path=str(Path(file_path).resolve()))
+        return SimpleNamespace(text=reply["text"], language=reply.get("language"))
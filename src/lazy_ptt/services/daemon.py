@@ -1,14 +1,73 @@
 from __future__ import annotations
 
 import logging
+import queue
+import signal
 import threading
 import time
-from typing import Callable, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from ..config import ConfigError
+from ..input.hotkey import PersistentHotkeyListener
+from ..timing import StageTimer, collect_timings, log_timings
+from .deferred import DeferredEnhancementWorker
+from .journal import JobJournal
 from .ptt_service import PTTOutcome, PTTService
+from .workspaces import ServiceRef, WorkspaceRegistry
 
 LOGGER = logging.getLogger(__name__)
 
+_SENTINEL = object()
+# (journal job id, per-cycle timer, workspace service, stage payload)
+_PipelineItem = Tuple[Optional[str], StageTimer, Any, Any]
+
+
+@dataclass
+class StageStats:
+    """Completed item count and busy time for one pipeline stage."""
+
+    completed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+
+    def record(self, seconds: float, ok: bool = True) -> None:
+        self.busy_seconds += seconds
+        if ok:
+            self.completed += 1
+        else:
+            self.failed += 1
+
+    @property
+    def mean_seconds(self) -> float:
+        total = self.completed + self.failed
+        return self.busy_seconds / total if total else 0.0
+
+
+@dataclass
+class PipelineStats:
+    """Thread-safe counters describing the pipelined daemon."""
+
+    started_at: float = field(default_factory=time.monotonic)
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, stage: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            self.stages.setdefault(stage, StageStats()).record(seconds, ok)
+
+    def summary(self, depths: Dict[str, int]) -> str:
+        elapsed_minutes = max(time.monotonic() - self.started_at, 1e-9) / 60.0
+        with self._lock:
+            parts = [
+                f"{name}: {stats.completed} ok/{stats.failed} failed, "
+                f"avg {stats.mean_seconds:.2f}s, {stats.completed / elapsed_minutes:.2f}/min"
+                for name, stats in self.stages.items()
+            ]
+        queues = ", ".join(f"{name}={depth}" for name, depth in depths.items())
+        return f"queues [{queues}] | " + " | ".join(parts)
+
 
 class PTTDaemon:
     """
@@ -17,6 +76,35 @@ class PTTDaemon:
     Each time the configured hotkey is pressed/released, a full capture → STT →
     enhancement → storage cycle executes. The daemon can run indefinitely or until
     `request_stop` is invoked (e.g., from a signal handler or test hook).
+
+    With `pipelined=True` the capture loop only records audio and hands it to a
+    bounded queue; STT and enhancement run in their own worker threads so the
+    hotkey is available again as soon as the key is released.
+
+    When `hotkey_events` is given, captures are driven by that long-lived
+    listener instead of building a new keyboard hook for every cycle.
+
+    `processor` takes over the STT/enhancement half of the cycle (for example an
+    `InferenceWorkerProcess`); capture always stays on `service`.
+
+    With a `journal`, every cycle's stage and payload are recorded, and cycles
+    left unfinished by a crash or kill are resumed when `run` starts.
+
+    Each cycle carries one `StageTimer` from capture to storage, so the outcome's
+    `timings` cover the whole cycle even when stages run on different threads or
+    in the inference worker process.
+
+    With a `config_watcher` (see `ConfigWatcher`), edited settings are applied
+    between cycles through `PTTService.apply_config` on a copy of the service,
+    which `services` (or the `WorkspaceRegistry`) then swaps in; a new hotkey
+    is rebound on the long-lived listener. An inference worker process keeps
+    the settings it was started with.
+
+    With `workspaces` (a `WorkspaceRegistry` whose primary is `service`), one
+    daemon serves several project roots. The default hotkey records into the
+    active workspace; a workspace's own hotkey makes it active and records
+    into it. Each capture remembers its workspace through the pipeline and
+    the journal, so switching mid-cycle never misfiles a prompt.
     """
 
     def __init__(
@@ -26,18 +114,147 @@ class PTTDaemon:
         auto_move: bool = True,
         idle_sleep_seconds: float = 0.1,
         on_cycle: Optional[Callable[[PTTOutcome], None]] = None,
+        pipelined: bool = False,
+        queue_size: int = 4,
+        log_pipeline_stats: bool = False,
+        hotkey_events: Optional[PersistentHotkeyListener] = None,
+        processor: Optional[Any] = None,
+        journal: Optional[JobJournal] = None,
+        config_watcher: Optional[Any] = None,
+        workspaces: Optional[WorkspaceRegistry] = None,
     ) -> None:
-        self.service = service
+        self.services = ServiceRef(service)
         self.auto_move = auto_move
         self.idle_sleep_seconds = idle_sleep_seconds
         self.on_cycle = on_cycle
+        self.pipelined = pipelined
+        self.queue_size = max(1, queue_size)
+        self.log_pipeline_stats = log_pipeline_stats
+        self.hotkey_events = hotkey_events
+        self._processor = processor
+        self.journal = journal
+        self.config_watcher = config_watcher
+        self.workspaces = workspaces
+        self.stats = PipelineStats()
         self._stop_event = threading.Event()
+        self._deferred_workers: List[DeferredEnhancementWorker] = []
+        self._queues: Dict[str, "queue.Queue[Any]"] = {}
+
+    @property
+    def service(self) -> Any:
+        """The current service of the daemon's own project."""
+
+        if self.workspaces is not None:
+            return self.workspaces.primary.service
+        return self.services.get()
+
+    @property
+    def processor(self) -> Any:
+        return self.service if self._processor is None else self._processor
+
+    @property
+    def _in_process(self) -> bool:
+        return self._processor is None
+
+    def _services(self) -> List[Any]:
+        if self.workspaces is None:
+            return [self.service]
+        return [workspace.service for workspace in self.workspaces]
+
+    def _start_deferred_workers(self) -> None:
+        for service in self._services():
+            queue_ = getattr(service, "enhancement_queue", None)
+            if queue_ is None:
+                continue
+            worker = DeferredEnhancementWorker(
+                service,
+                queue_,
+                poll_seconds=service.config.deferred.poll_seconds,
+            )
+            worker.start()
+            self._deferred_workers.append(worker)
+            LOGGER.info("Deferred enhancement worker started (%d queued).", len(queue_))
+
+    def _stop_deferred_workers(self) -> None:
+        for worker in self._deferred_workers:
+            worker.stop()
+        self._deferred_workers = []
+
+    def _flush_storage(self) -> None:
+        # Write-behind prompt files must be on disk before the daemon reports
+        # shutdown; the journal is flushed after so it never runs ahead of them.
+        for service in self._services():
+            flush = getattr(getattr(service, "storage", None), "flush", None)
+            if callable(flush):
+                try:
+                    flush()
+                except Exception as exc:
+                    LOGGER.error("Could not flush saved prompts: %s", exc)
 
     def request_stop(self) -> None:
         """Signal the daemon loop to exit after the current iteration."""
 
         self._stop_event.set()
 
+    @contextmanager
+    def stop_on_sigterm(self) -> Iterator[None]:
+        """Treat SIGTERM like Ctrl+C while the block runs.
+
+        `systemctl stop` sends SIGTERM, whose default action ends the process
+        without the flushes in `run`; this turns it into `request_stop`.
+        """
+
+        def handle(signum: int, _frame: Any) -> None:
+            LOGGER.info("Received signal %d; stopping after the current cycle.", signum)
+            self.request_stop()
+
+        try:
+            previous = signal.signal(signal.SIGTERM, handle)
+        except ValueError:  # not the main thread; the caller owns signal handling
+            previous = None
+        try:
+            yield
+        finally:
+            if previous is not None:
+                signal.signal(signal.SIGTERM, previous)
+
+    def _maybe_reload(self) -> None:
+        if self.config_watcher is None:
+            return
+        config = self.config_watcher.poll()
+        if config is None:
+            return
+        try:
+            if self.workspaces is not None:
+                update = self.workspaces.apply_config(config)
+            else:
+                update = self.services.apply_config(config)
+        except Exception as exc:
+            LOGGER.exception("Could not apply the changed configuration: %s", exc)
+            return
+        for worker in self._deferred_workers:
+            for service in self._services():
+                if getattr(service, "enhancement_queue", None) is worker.queue:
+                    worker.service = service
+        if "ptt.hotkey" in update.applied and self.hotkey_events is not None:
+            self.hotkey_events.bind(self.hotkey_events.DEFAULT_BINDING, config.ptt.hotkey)
+            LOGGER.info("Hotkey changed to %s", config.ptt.hotkey)
+
+    def queue_depths(self) -> Dict[str, int]:
+        return {name: q.qsize() for name, q in self._queues.items()}
+
+    def _handle_outcome(self, outcome: PTTOutcome) -> None:
+        LOGGER.info(
+            "Prompt stored at %s (work type: %s)",
+            outcome.saved_prompt.prompt_path,
+            outcome.enhanced.work_type,
+        )
+        if getattr(outcome, "deferred", False):
+            for worker in self._deferred_workers:
+                worker.wake()
+        if self.on_cycle:
+            self.on_cycle(outcome)
+
     def run(self) -> None:
         """Run the daemon loop until `request_stop` is called or Ctrl+C is received."""
 
@@ -49,24 +266,313 @@ class PTTDaemon:
             "PTT daemon active: press %s to capture briefs. Press Ctrl+C to exit.",
             hotkey,
         )
+        self._start_deferred_workers()
+        if self.hotkey_events is not None:
+            self._bind_workspace_hotkeys()
+            self.hotkey_events.start()
+        try:
+            self._resume_unfinished()
+            if self.pipelined:
+                self._run_pipelined()
+            else:
+                self._run_sequential()
+        except KeyboardInterrupt:
+            LOGGER.info("PTT daemon interrupted by user.")
+        finally:
+            if self.hotkey_events is not None:
+                self.hotkey_events.stop()
+            self._stop_deferred_workers()
+            self._flush_storage()
+            if self.journal is not None:
+                self.journal.flush()
+            self._stop_event.clear()
+            LOGGER.info("PTT daemon shutting down.")
+
+    def _bind_workspace_hotkeys(self) -> None:
+        assert self.hotkey_events is not None
+        for workspace in self.workspaces or ():
+            if workspace.hotkey:
+                self.hotkey_events.bind(workspace.binding, workspace.hotkey)
+                LOGGER.info("Press %s to record into %s", workspace.hotkey, workspace.name)
+
+    def _wait_for_event(self, kind: str, binding: Optional[str] = None) -> Optional[Any]:
+        assert self.hotkey_events is not None
+        while not self._stop_event.is_set():
+            if kind == "press":
+                self._maybe_reload()  # idle between cycles
+            event = self.hotkey_events.get(timeout=self.idle_sleep_seconds)
+            if event is None or event.kind != kind:
+                continue
+            if binding is None or getattr(event, "binding", binding) == binding:
+                return event
+        return None
+
+    def _target(self, binding: Optional[str] = None) -> Any:
+        """Service of the workspace a capture records into."""
+
+        if self.workspaces is None:
+            return self.service
+        return self.workspaces.for_binding(binding).service
+
+    def _processor_for(self, service: Any) -> Any:
+        # An inference worker process serves the daemon's own project only.
+        return service if self._in_process else self.processor
+
+    def _workspace_name(self, service: Any) -> Optional[str]:
+        for workspace in self.workspaces or ():
+            if workspace.service is service:
+                return workspace.name
+        return None
+
+    def _service_named(self, name: Optional[str]) -> Any:
+        if self.workspaces is None or name is None:
+            return self.service
+        try:
+            return self.workspaces.get(name).service
+        except ConfigError:
+            primary = self.workspaces.primary.name
+            LOGGER.warning("Workspace %s is gone; resuming its capture in %s", name, primary)
+            return self.service
+
+    def _capture(self) -> Optional[Tuple[Any, Any]]:
+        """Record one brief as (workspace service, audio); None if the daemon is stopping."""
+
+        if self.hotkey_events is None:
+            service = self._target()
+            return service, service.capture_once()
+        pressed = self._wait_for_event("press")
+        if pressed is None:
+            return None
+        binding = getattr(pressed, "binding", None)
+        service = self._target(binding)
+        service.begin_capture()
+        released = self._wait_for_event("release", binding)
+        buffer = service.end_capture()
+        return (service, buffer) if released is not None else None
+
+    # -- stages -----------------------------------------------------------
+
+    def _journal_captured(self, buffer: Any, service: Any = None) -> Optional[str]:
+        if self.journal is None:
+            return None
+        return self.journal.record_captured(buffer, workspace=self._workspace_name(service))
+
+    def _transcribe(
+        self, job_id: Optional[str], buffer: Any, timer: Optional[StageTimer] = None
+    ) -> Any:
+        try:
+            with collect_timings(timer):
+                transcription = self.processor.transcribe_buffer(buffer)
+        except Exception as exc:
+            self._journal_failure(job_id, exc)
+            raise
+        if self.journal is not None and job_id is not None:
+            self.journal.record_transcribed(job_id, transcription)
+        return transcription
+
+    def _complete(
+        self,
+        job_id: Optional[str],
+        transcription: Any,
+        timer: Optional[StageTimer] = None,
+        service: Any = None,
+    ) -> PTTOutcome:
+        options: Dict[str, Any] = {"auto_move": self.auto_move}
+        journal = self.journal
+        in_process = self._in_process
+        if journal is not None and job_id is not None and in_process:
+            options["on_enhanced"] = lambda enhanced: journal.record_enhanced(job_id, enhanced)
+            # Write-behind storage commits after the call returns; a prompt
+            # whose write fails must stay unfinished so it is replayed.
+            options["on_stored"] = lambda saved: journal.record_stored(job_id, saved.prompt_path)
+        processor = self._processor_for(service or self.service)
+        try:
+            with collect_timings(timer):
+                outcome = processor.complete_transcription(transcription, **options)
+        except Exception as exc:
+            self._journal_failure(job_id, exc)
+            raise
+        if journal is not None and job_id is not None and not in_process:
+            # The worker process replies only once the prompt is on disk.
+            journal.record_stored(job_id, outcome.saved_prompt.prompt_path)
+        if timer is not None:
+            self._log_cycle_timings(outcome, timer)
+        self._handle_outcome(outcome)
+        return outcome
+
+    def _log_cycle_timings(self, outcome: PTTOutcome, timer: StageTimer) -> None:
+        # Stages timed in the worker process come back on the outcome only.
+        outcome.timings = {**timer.as_dict(), **getattr(outcome, "timings", {})}
+        log_timings(
+            "daemon_cycle",
+            outcome.timings,
+            story_id=getattr(outcome.saved_prompt, "story_id", None),
+            audio_seconds=getattr(getattr(outcome, "transcription", None), "duration", None),
+            pipelined=self.pipelined,
+        )
+
+    def _journal_failure(self, job_id: Optional[str], exc: BaseException) -> None:
+        if self.journal is not None and job_id is not None:
+            self.journal.record_attempt(job_id, exc)
+
+    def _resume_unfinished(self) -> None:
+        if self.journal is None:
+            return
+        jobs = self.journal.unfinished()
+        if jobs:
+            LOGGER.info("Resuming %d unfinished capture(s) from the journal", len(jobs))
+        journal = self.journal
+        for job in jobs:
+            service = self._service_named(getattr(job, "workspace", None))
+            try:
+                if job.stage == "enhanced" and job.enhanced and job.transcription:
+                    outcome = service.store_enhanced(
+                        job.enhanced,
+                        job.transcription,
+                        auto_move=self.auto_move,
+                        on_stored=lambda saved, job_id=job.job_id: journal.record_stored(
+                            job_id, saved.prompt_path
+                        ),
+                    )
+                    self._handle_outcome(outcome)
+                elif job.transcription is not None:
+                    self._complete(job.job_id, job.transcription, service=service)
+                elif job.audio is not None:
+                    transcription = self._transcribe(job.job_id, job.audio)
+                    self._complete(job.job_id, transcription, service=service)
+            except Exception as exc:
+                LOGGER.exception("Could not resume journaled capture %s: %s", job.job_id, exc)
+
+    def _run_sequential(self) -> None:
+        while not self._stop_event.is_set():
+            self._maybe_reload()
+            try:
+                if (
+                    self.hotkey_events is None
+                    and self._in_process
+                    and self.journal is None
+                ):
+                    service = self._target()
+                    self._handle_outcome(service.listen_once(auto_move=self.auto_move))
+                    continue
+                timer = StageTimer()
+                with collect_timings(timer):
+                    captured = self._capture()
+                if captured is None:
+                    continue
+                service, buffer = captured
+                if self.journal is None:
+                    with collect_timings(timer):
+                        outcome = self._processor_for(service).process_audio_buffer(
+                            buffer, auto_move=self.auto_move
+                        )
+                    self._log_cycle_timings(outcome, timer)
+                    self._handle_outcome(outcome)
+                else:
+                    job_id = self._journal_captured(buffer, service)
+                    transcription = self._transcribe(job_id, buffer, timer)
+                    self._complete(job_id, transcription, timer, service)
+            except KeyboardInterrupt:
+                raise
+            except Exception as exc:
+                LOGGER.exception("PTT cycle failed: %s", exc)
+                time.sleep(self.idle_sleep_seconds)
+
+    # -- pipelined mode -------------------------------------------------
+
+    def _run_pipelined(self) -> None:
+        self.stats = PipelineStats()
+        stt_queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+        enhance_queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+        self._queues = {"stt": stt_queue, "enhance": enhance_queue}
+        workers: List[threading.Thread] = [
+            threading.Thread(
+                target=self._stage_worker,
+                args=("stt", stt_queue, enhance_queue, self._stt_stage),
+                name="lazy-ptt-stt",
+                daemon=True,
+            ),
+            threading.Thread(
+                target=self._stage_worker,
+                args=("enhance", enhance_queue, None, self._enhance_stage),
+                name="lazy-ptt-enhance",
+                daemon=True,
+            ),
+        ]
+        for worker in workers:
+            worker.start()
         try:
             while not self._stop_event.is_set():
+                self._maybe_reload()
+                started = time.monotonic()
+                timer = StageTimer()
                 try:
-                    outcome = self.service.listen_once(auto_move=self.auto_move)
-                    LOGGER.info(
-                        "Prompt stored at %s (work type: %s)",
-                        outcome.saved_prompt.prompt_path,
-                        outcome.enhanced.work_type,
-                    )
-                    if self.on_cycle:
-                        self.on_cycle(outcome)
+                    with collect_timings(timer):
+                        captured = self._capture()
+                    if captured is None:
+                        continue
                 except KeyboardInterrupt:
                     raise
                 except Exception as exc:
-                    LOGGER.exception("PTT cycle failed: %s", exc)
+                    self.stats.record("capture", time.monotonic() - started, ok=False)
+                    LOGGER.exception("PTT capture failed: %s", exc)
                     time.sleep(self.idle_sleep_seconds)
-        except KeyboardInterrupt:
-            LOGGER.info("PTT daemon interrupted by user.")
+                    continue
+                self.stats.record("capture", time.monotonic() - started)
+                service, buffer = captured
+                job_id = self._journal_captured(buffer, service)
+                self._put(stt_queue, (job_id, timer, service, buffer))
         finally:
-            self._stop_event.clear()
-            LOGGER.info("PTT daemon shutting down.")
+            # Drain what was already captured before returning.
+            self._put(stt_queue, _SENTINEL, force=True)
+            for worker in workers:
+                worker.join()
+            self._queues = {}
+
+    def _put(self, target: "queue.Queue[Any]", item: Any, force: bool = False) -> None:
+        warned = False
+        while True:
+            try:
+                target.put(item, timeout=self.idle_sleep_seconds)
+                return
+            except queue.Full:
+                if not warned:
+                    LOGGER.warning("Pipeline backlog full (%d queued); waiting", target.qsize())
+                    warned = True
+                if self._stop_event.is_set() and not force:
+                    LOGGER.error("Dropping capture: daemon stopping with a full backlog")
+                    return
+
+    def _stt_stage(self, item: _PipelineItem) -> _PipelineItem:
+        job_id, timer, service, buffer = item
+        return job_id, timer, service, self._transcribe(job_id, buffer, timer)
+
+    def _enhance_stage(self, item: _PipelineItem) -> PTTOutcome:
+        job_id, timer, service, transcription = item
+        return self._complete(job_id, transcription, timer, service)
+
+    def _stage_worker(
+        self,
+        name: str,
+        source: "queue.Queue[Any]",
+        sink: Optional["queue.Queue[Any]"],
+        handler: Callable[[Any], Any],
+    ) -> None:
+        while True:
+            item = source.get()
+            if item is _SENTINEL:
+                if sink is not None:
+                    self._put(sink, _SENTINEL, force=True)
+                return
+            started = time.monotonic()
+            try:
+                result = handler(item)
+            except Exception as exc:
+                self.stats.record(name, time.monotonic() - started, ok=False)
+                LOGGER.exception("PTT %s stage failed: %s", name, exc)
+                continue
+            self.stats.record(name, time.monotonic() - started)
+            if sink is not None:
+                self._put(sink, result, force=True)
+            if self.log_pipeline_stats:
+                LOGGER.info("Pipeline %s", self.stats.summary(self.queue_depths()))
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .ptt_service import PTTService
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class DeferredJob:
+    """A transcript whose enhancement has not completed yet."""
+
+    job_id: str
+    story_id: str
+    prompt_path: str
+    brief: str
+    story_title: Optional[str]
+    auto_move: bool
+    created_at: float
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    last_error: Optional[str] = None
+
+
+class EnhancementQueue:
+    """Durable on-disk queue: one JSON file per pending enhancement.
+
+    Several processes may drain the same queue (the daemon's worker and
+    `lazy-ptt drain-queue`), so a job is `claim`ed before it runs by renaming
+    `<id>.json` to `<id>.claimed`; only one rename can succeed. A claim left
+    behind by a crashed process is released after `claim_timeout_seconds`.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        retry_base_seconds: float = 15.0,
+        retry_max_seconds: float = 900.0,
+        claim_timeout_seconds: float = 3600.0,
+    ) -> None:
+        self.root = root
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, job_id: str) -> Path:
+        return self.root / f"{job_id}.json"
+
+    def _claimed_path(self, job_id: str) -> Path:
+        return self.root / f"{job_id}.claimed"
+
+    def _write(self, job: DeferredJob) -> None:
+        target = self._path(job.job_id)
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(json.dumps(asdict(job), indent=2), encoding="utf-8")
+        os.replace(tmp, target)
+
+    def enqueue(
+        self,
+        story_id: str,
+        prompt_path: Path,
+        brief: str,
+        story_title: Optional[str] = None,
+        auto_move: bool = False,
+    ) -> DeferredJob:
+        job = DeferredJob(
+            job_id=f"{time.time_ns()}-{uuid.uuid4().hex[:8]}",
+            story_id=story_id,
+            prompt_path=str(prompt_path),
+            brief=brief,
+            story_title=story_title,
+            auto_move=auto_move,
+            created_at=time.time(),
+        )
+        with self._lock:
+            self._write(job)
+        return job
+
+    def pending(self) -> List[DeferredJob]:
+        jobs: List[DeferredJob] = []
+        with self._lock:
+            for path in sorted(self.root.glob("*.json")):
+                try:
+                    jobs.append(DeferredJob(**json.loads(path.read_text(encoding="utf-8"))))
+                except (OSError, ValueError, TypeError) as exc:
+                    LOGGER.warning("Skipping unreadable queue entry %s: %s", path, exc)
+        return jobs
+
+    def due(self, now: Optional[float] = None) -> List[DeferredJob]:
+        now = time.time() if now is None else now
+        self._release_stale_claims(now)
+        return [job for job in self.pending() if job.next_attempt_at <= now]
+
+    def claim(self, job: DeferredJob) -> bool:
+        """Take `job` for this caller; False if another worker or process has it."""
+
+        claimed = self._claimed_path(job.job_id)
+        try:
+            os.rename(self._path(job.job_id), claimed)
+        except FileNotFoundError:
+            return False
+        os.utime(claimed)  # the rename keeps the enqueue time; claims age from now
+        return True
+
+    def _release_stale_claims(self, now: float) -> None:
+        for claimed in self.root.glob("*.claimed"):
+            try:
+                if now - claimed.stat().st_mtime < self.claim_timeout_seconds:
+                    continue
+                os.rename(claimed, claimed.with_suffix(".json"))
+            except FileNotFoundError:
+                continue  # completed or released meanwhile
+            LOGGER.warning("Released abandoned claim on %s", claimed.stem)
+
+    def complete(self, job: DeferredJob) -> None:
+        with self._lock:
+            self._path(job.job_id).unlink(missing_ok=True)
+            self._claimed_path(job.job_id).unlink(missing_ok=True)
+
+    def retry_later(self, job: DeferredJob, error: BaseException) -> DeferredJob:
+        job.attempts += 1
+        delay = min(self.retry_base_seconds * (2 ** (job.attempts - 1)), self.retry_max_seconds)
+        job.next_attempt_at = time.time() + delay
+        job.last_error = f"{type(error).__name__}: {error}"
+        with self._lock:
+            self._write(job)
+            self._claimed_path(job.job_id).unlink(missing_ok=True)
+        return job
+
+    def __len__(self) -> int:
+        return len(list(self.root.glob("*.json"))) + len(list(self.root.glob("*.claimed")))
+
+
+class DeferredEnhancementWorker:
+    """Background thread draining an `EnhancementQueue` through a `PTTService`."""
+
+    def __init__(
+        self,
+        service: "PTTService",
+        queue: EnhancementQueue,
+        poll_seconds: float = 5.0,
+    ) -> None:
+        self.service = service
+        self.queue = queue
+        self.poll_seconds = poll_seconds
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_pending(self) -> int:
+        """Process every due job once; returns how many completed."""
+
+        completed = 0
+        for job in self.queue.due():
+            if self._stop_event.is_set():
+                break
+            if not self.queue.claim(job):
+                continue  # another worker or `drain-queue` process is running it
+            try:
+                outcome = self.service.complete_deferred(job)
+            except Exception as exc:  # retried later; offline is the common case
+                job = self.queue.retry_later(job, exc)
+                LOGGER.warning(
+                    "Deferred enhancement for %s failed (attempt %d): %s",
+                    job.story_id,
+                    job.attempts,
+                    exc,
+                )
+                continue
+            self.queue.complete(job)
+            completed += 1
+            LOGGER.info(
+                "Deferred enhancement stored at %s (work type: %s)",
+                outcome.saved_prompt.prompt_path,
+                outcome.enhanced.work_type,
+            )
+        return completed
+
+    def _loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.run_pending()
+            except Exception as exc:  # pragma: no cover - keep the worker alive
+                LOGGER.exception("Deferred enhancement worker error: %s", exc)
+            self._wake_event.wait(self.poll_seconds)
+            self._wake_event.clear()
+
+    def wake(self) -> None:
+        """Trigger an immediate queue scan (used after a new job is enqueued)."""
+
+        self._wake_event.set()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="lazy-ptt-deferred", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
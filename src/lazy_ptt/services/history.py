@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from ..config import AppConfig, ConfigError
+from ..timing import STAGE_ORDER, add_timing_sink
+
+LOGGER = logging.getLogger(__name__)
+
+HISTORY_FILENAME = "timings.jsonl"
+# Derived columns computed from each record on top of the raw stages.
+TOTAL_COLUMN = "total"
+RELEASE_TO_PROMPT_COLUMN = "release_to_prompt"
+PERCENTILES = (50.0, 90.0, 99.0)
+
+_WINDOW_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*$", re.IGNORECASE)
+_WINDOW_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+_INSTALLED: Dict[Path, "TimingHistory"] = {}
+_INSTALL_LOCK = threading.Lock()
+
+
+class TimingHistory:
+    """Size-rotated JSON-lines log of per-cycle timing records.
+
+    `timings.jsonl` is the live file; when it grows past `max_bytes` it is
+    renamed to `timings.jsonl.1` (older files shift up) and at most `backups`
+    rotated files are kept.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 5_000_000, backups: int = 5) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = max(0, backups)
+        self._lock = threading.Lock()
+
+    def append(self, record: Mapping[str, Any]) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(line) > self.max_bytes:
+                self._rotate()
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line)
+
+    __call__ = append  # usable directly as a timing sink
+
+    def _rotate(self) -> None:
+        if self.backups == 0:
+            self.path.unlink(missing_ok=True)
+            return
+        self._backup(self.backups).unlink(missing_ok=True)
+        for index in range(self.backups - 1, 0, -1):
+            source = self._backup(index)
+            if source.exists():
+                source.replace(self._backup(index + 1))
+        self.path.replace(self._backup(1))
+
+    def _backup(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{index}")
+
+    def files(self) -> List[Path]:
+        """History files, oldest first."""
+
+        rotated = [self._backup(i) for i in range(self.backups, 0, -1)]
+        return [path for path in [*rotated, self.path] if path.exists()]
+
+    def load(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        for path in self.files():
+            with path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line after a crash
+                    if since is None or record.get("ts", 0.0) >= since:
+                        records.append(record)
+        return records
+
+
+def history_for_config(config: AppConfig) -> Optional[TimingHistory]:
+    settings = config.timing_history
+    if not settings.enabled:
+        return None
+    return TimingHistory(
+        config.paths.state_dir / HISTORY_FILENAME,
+        max_bytes=settings.max_bytes,
+        backups=settings.backups,
+    )
+
+
+def install_timing_history(config: AppConfig) -> Optional[TimingHistory]:
+    """Persist every timing record of this process to the configured history."""
+
+    history = history_for_config(config)
+    if history is None:
+        return None
+    with _INSTALL_LOCK:
+        existing = _INSTALLED.get(history.path)
+        if existing is not None:
+            return existing
+        _INSTALLED[history.path] = history
+    add_timing_sink(history)
+    return history
+
+
+def parse_window(value: str) -> float:
+    """Parse `30m`, `24h`, `7d` or `2w` into seconds."""
+
+    match = _WINDOW_PATTERN.match(value)
+    if not match:
+        raise ConfigError(f"Invalid window {value!r}; use e.g. 30m, 24h, 7d")
+    return float(match.group(1)) * _WINDOW_UNITS[match.group(2).lower()]
+
+
+@dataclass
+class StageSummary:
+    stage: str
+    count: int
+    p50: float
+    p90: float
+    p99: float
+    mean: float
+
+
+@dataclass
+class WindowSummary:
+    """Aggregated timing statistics for one time window."""
+
+    label: str
+    cycles: int
+    stages: List[StageSummary] = field(default_factory=list)
+    real_time_factor: Optional[Dict[str, float]] = None
+    cache_hit_rates: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "window": self.label,
+            "cycles": self.cycles,
+            "stages": [stage.__dict__ for stage in self.stages],
+            "real_time_factor": self.real_time_factor,
+            "cache_hit_rates": self.cache_hit_rates,
+        }
+
+
+class _Columns:
+    """Records flattened into NumPy columns (NaN where a stage is absent)."""
+
+    def __init__(self, records: Sequence[Mapping[str, Any]]) -> None:
+        names: Dict[str, None] = {}
+        for record in records:
+            names.update(dict.fromkeys(record.get("stages_ms", {})))
+        ordered = [name for name in STAGE_ORDER if name in names]
+        ordered += [name for name in names if name not in STAGE_ORDER]
+        self.stage_names = ordered
+        index = {name: i for i, name in enumerate(ordered)}
+
+        count = len(records)
+        self.ts = np.zeros(count)
+        self.total = np.full(count, np.nan)
+        self.audio_seconds = np.full(count, np.nan)
+        self.stages = np.full((count, len(ordered)), np.nan)
+        cache_names: Dict[str, None] = {}
+        for record in records:
+            cache_names.update(dict.fromkeys(record.get("cache", {})))
+        self.cache_names = list(cache_names)
+        self.cache = np.full((count, len(self.cache_names)), np.nan)
+        cache_index = {name: i for i, name in enumerate(self.cache_names)}
+
+        for row, record in enumerate(records):
+            self.ts[row] = record.get("ts", 0.0)
+            self.total[row] = record.get("total_ms", np.nan)
+            audio = record.get("audio_seconds")
+            if audio:
+                self.audio_seconds[row] = audio
+            for name, ms in record.get("stages_ms", {}).items():
+                self.stages[row, index[name]] = ms
+            for name, hit in record.get("cache", {}).items():
+                self.cache[row, cache_index[name]] = 1.0 if hit else 0.0
+
+    def column(self, name: str) -> np.ndarray:
+        return self.stages[:, self.stage_names.index(name)]
+
+
+def _percentile_rows(matrix: np.ndarray) -> np.ndarray:
+    """Percentiles per column ignoring NaN; columns without data yield NaN."""
+
+    result = np.full((len(PERCENTILES), matrix.shape[1]), np.nan)
+    present = ~np.isnan(matrix).all(axis=0)
+    if present.any():
+        result[:, present] = np.nanpercentile(matrix[:, present], PERCENTILES, axis=0)
+    return result
+
+
+def summarize(
+    records: Sequence[Mapping[str, Any]],
+    windows: Iterable[str],
+    now: Optional[float] = None,
+) -> List[WindowSummary]:
+    """Per-stage p50/p90/p99, real-time factor and cache hit rates per window."""
+
+    now = time.time() if now is None else now
+    columns = _Columns(records)
+    record_ms = (
+        columns.column("record")
+        if "record" in columns.stage_names
+        else np.full(len(records), np.nan)
+    )
+    # Release-to-prompt latency: everything after the key came up.
+    derived = np.column_stack([columns.total, columns.total - record_ms])
+    matrix = np.hstack([columns.stages, derived])
+    names = [*columns.stage_names, TOTAL_COLUMN, RELEASE_TO_PROMPT_COLUMN]
+
+    # Whisper model reuse is implied by a transcription without a model load.
+    cache = columns.cache
+    cache_names = list(columns.cache_names)
+    if "transcribe" in columns.stage_names and "whisper_model" not in cache_names:
+        transcribed = ~np.isnan(columns.column("transcribe"))
+        loaded = (
+            ~np.isnan(columns.column("model_load"))
+            if "model_load" in columns.stage_names
+            else np.zeros(len(records), dtype=bool)
+        )
+        warm = np.where(transcribed, (~loaded).astype(float), np.nan)
+        cache = np.column_stack([cache, warm])
+        cache_names.append("whisper_model")
+
+    summaries: List[WindowSummary] = []
+    for label in windows:
+        mask = columns.ts >= now - parse_window(label)
+        window = matrix[mask]
+        summary = WindowSummary(label=label, cycles=int(mask.sum()))
+        if summary.cycles:
+            counts = (~np.isnan(window)).sum(axis=0)
+            percentiles = _percentile_rows(window)
+            means = np.divide(
+                np.nansum(window, axis=0),
+                counts,
+                out=np.full(len(names), np.nan),
+                where=counts > 0,
+            )
+            for i, name in enumerate(names):
+                if counts[i]:
+                    summary.stages.append(
+                        StageSummary(
+                            stage=name,
+                            count=int(counts[i]),
+                            p50=round(float(percentiles[0, i]), 1),
+                            p90=round(float(percentiles[1, i]), 1),
+                            p99=round(float(percentiles[2, i]), 1),
+                            mean=round(float(means[i]), 1),
+                        )
+                    )
+            if "transcribe" in columns.stage_names:
+                rtf = columns.column("transcribe")[mask] / 1000.0 / columns.audio_seconds[mask]
+                rtf = rtf[~np.isnan(rtf)]
+                if rtf.size:
+                    p50, p90 = np.percentile(rtf, [50.0, 90.0])
+                    summary.real_time_factor = {
+                        "p50": round(float(p50), 3),
+                        "p90": round(float(p90), 3),
+                    }
+            hits = cache[mask]
+            for i, name in enumerate(cache_names):
+                observed = hits[:, i][~np.isnan(hits[:, i])]
+                if observed.size:
+                    summary.cache_hit_rates[name] = round(float(observed.mean()), 3)
+        summaries.append(summary)
+    return summaries
+
+
+def format_summaries(summaries: Sequence[WindowSummary]) -> str:
+    lines: List[str] = []
+    for summary in summaries:
+        lines.append(f"Window {summary.label}: {summary.cycles} cycle(s)")
+        if not summary.cycles:
+            lines.append("")
+            continue
+        width = max(len(stage.stage) for stage in summary.stages)
+        lines.append(
+            f"  {'stage':<{width}}  {'n':>6}  {'p50 ms':>10}  {'p90 ms':>10}  {'p99 ms':>10}"
+        )
+        for stage in summary.stages:
+            lines.append(
+                f"  {stage.stage:<{width}}  {stage.count:>6}  {stage.p50:>10.1f}  "
+                f"{stage.p90:>10.1f}  {stage.p99:>10.1f}"
+            )
+        if summary.real_time_factor:
+            rtf = summary.real_time_factor
+            lines.append(f"  real-time factor: p50 {rtf['p50']:.3f}, p90 {rtf['p90']:.3f}")
+        for name, rate in summary.cache_hit_rates.items():
+            lines.append(f"  cache hit rate ({name}): {rate:.0%}")
+        lines.append("")
+    return "\n".join(lines).rstrip() + "\n"
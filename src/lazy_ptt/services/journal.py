@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from ..audio.recorder import AudioBuffer
+from ..config import ConfigError
+from ..prompt.enhancer import EnhancedPrompt
+from ..stt.whisper import TranscriptionResult
+
+LOGGER = logging.getLogger(__name__)
+
+STAGES = ("captured", "transcribed", "enhanced", "stored", "failed")
+UNFINISHED_STAGES = ("captured", "transcribed", "enhanced")
+
+
+def is_retryable(error: Optional[BaseException]) -> bool:
+    """Whether replaying a cycle that raised `error` could succeed.
+
+    `ConfigError` and `ValueError` reject the capture itself (an empty
+    transcription from an accidental tap, an empty brief); a malformed model
+    response is the exception, since the next request may well parse.
+    """
+
+    if isinstance(error, json.JSONDecodeError):
+        return True
+    return not isinstance(error, (ConfigError, ValueError))
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    audio BLOB,
+    sample_rate INTEGER,
+    channels INTEGER,
+    duration_seconds REAL,
+    transcript TEXT,
+    language TEXT,
+    enhanced_json TEXT,
+    prompt_path TEXT,
+    error TEXT,
+    workspace TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_stage ON jobs(stage);
+"""
+
+
+@dataclass
+class JournalJob:
+    """A daemon cycle as last recorded in the journal."""
+
+    job_id: str
+    stage: str
+    attempts: int
+    audio: Optional[AudioBuffer]
+    transcription: Optional[TranscriptionResult]
+    enhanced: Optional[EnhancedPrompt]
+    workspace: Optional[str] = None
+
+
+class JobJournal:
+    """SQLite-backed record of each daemon cycle's progress.
+
+    `record_*` calls only enqueue a write; a background thread commits queued
+    writes in batches (every `flush_interval` seconds or `batch_size` writes),
+    so journaling adds no disk latency to the capture cycle.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = 0.2,
+        batch_size: int = 64,
+        max_attempts: int = 3,
+        retain_seconds: float = 7 * 24 * 3600,
+    ) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retain_seconds = retain_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "workspace" not in columns:  # journals written before workspaces existed
+                conn.execute("ALTER TABLE jobs ADD COLUMN workspace TEXT")
+        self._ops: "queue.Queue[Optional[Tuple[Any, ...]]]" = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="lazy-ptt-journal", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # -- writer ------------------------------------------------------------
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        last_prune = 0.0
+        try:
+            running = True
+            while running:
+                batch: List[Tuple[Any, ...]] = []
+                waiters: List[threading.Event] = []
+                try:
+                    op = self._ops.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    op = ()
+                deadline = time.monotonic() + self.flush_interval
+                while op is not None:
+                    if op and op[0] == "flush":
+                        waiters.append(op[1])
+                    elif op:
+                        batch.append(op)
+                    if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                        break
+                    try:
+                        op = self._ops.get_nowait()
+                    except queue.Empty:
+                        break
+                if op is None:
+                    running = False
+                if batch:
+                    self._apply(conn, batch)
+                if time.monotonic() - last_prune > 3600:
+                    self._prune(conn)
+                    last_prune = time.monotonic()
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            conn.close()
+
+    def _apply(self, conn: sqlite3.Connection, batch: List[Tuple[Any, ...]]) -> None:
+        try:
+            with conn:
+                for sql, params in batch:
+                    conn.execute(sql, params)
+        except sqlite3.Error as exc:  # journaling must never break a capture cycle
+            LOGGER.error("Failed to write %d journal entries: %s", len(batch), exc)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        cutoff = time.time() - self.retain_seconds
+        with conn:
+            conn.execute(
+                "DELETE FROM jobs WHERE stage IN ('stored', 'failed') AND updated_at < ?",
+                (cutoff,),
+            )
+
+    def _enqueue(self, sql: str, params: Tuple[Any, ...]) -> None:
+        self._ops.put((sql, params))
+
+    # -- recording -----------------------------------------------------------
+
+    def record_captured(self, buffer: AudioBuffer, workspace: Optional[str] = None) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._enqueue(
+            "INSERT INTO jobs (job_id, stage, created_at, updated_at, audio, sample_rate, "
+            "channels, duration_seconds, workspace) VALUES (?, 'captured', ?, ?, ?, ?, ?, ?, ?)",
+            (
+                job_id,
+                now,
+                now,
+                sqlite3.Binary(buffer.wav_bytes),
+                buffer.sample_rate,
+                buffer.channels,
+                buffer.duration_seconds,
+                workspace,
+            ),
+        )
+        return job_id
+
+    def record_transcribed(self, job_id: str, transcription: TranscriptionResult) -> None:
+        # The transcript supersedes the audio; drop the blob to keep the journal small.
+        self._enqueue(
+            "UPDATE jobs SET stage='transcribed', updated_at=?, transcript=?, language=?, "
+            "duration_seconds=COALESCE(duration_seconds, ?), audio=NULL WHERE job_id=?",
+            (
+                time.time(),
+                transcription.text,
+                transcription.language,
+                transcription.duration,
+                job_id,
+            ),
+        )
+
+    def record_enhanced(self, job_id: str, enhanced: EnhancedPrompt) -> None:
+        self._enqueue(
+            "UPDATE jobs SET stage='enhanced', updated_at=?, enhanced_json=? WHERE job_id=?",
+            (time.time(), json.dumps(enhanced.to_dict()), job_id),
+        )
+
+    def record_stored(self, job_id: str, prompt_path: Path) -> None:
+        self._enqueue(
+            "UPDATE jobs SET stage='stored', updated_at=?, prompt_path=?, audio=NULL, "
+            "enhanced_json=NULL WHERE job_id=?",
+            (time.time(), str(prompt_path), job_id),
+        )
+
+    def record_attempt(self, job_id: str, error: Optional[BaseException] = None) -> None:
+        """Count a resume attempt; jobs past `max_attempts` are marked failed.
+
+        So is a job whose `error` retrying cannot fix (see `is_retryable`).
+        """
+
+        max_attempts = self.max_attempts if is_retryable(error) else 0
+        self._enqueue(
+            "UPDATE jobs SET attempts=attempts+1, updated_at=?, error=COALESCE(?, error), "
+            "stage=CASE WHEN attempts+1 >= ? THEN 'failed' ELSE stage END WHERE job_id=?",
+            (
+                time.time(),
+                f"{type(error).__name__}: {error}" if error else None,
+                max_attempts,
+                job_id,
+            ),
+        )
+
+    # -- recovery ------------------------------------------------------------
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every write queued so far is committed."""
+
+        if not self._writer.is_alive():
+            return False
+        done = threading.Event()
+        self._ops.put(("flush", done))
+        return done.wait(timeout)
+
+    def unfinished(self) -> List[JournalJob]:
+        self.flush()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id, stage, attempts, audio, sample_rate, channels, duration_seconds, "
+                "transcript, language, enhanced_json, workspace FROM jobs "
+                f"WHERE stage IN ({','.join('?' * len(UNFINISHED_STAGES))}) ORDER BY created_at",
+                UNFINISHED_STAGES,
+            ).fetchall()
+        jobs: List[JournalJob] = []
+        for row in rows:
+            (
+                job_id, stage, attempts, audio, rate, channels, duration,
+                text, language, enhanced, workspace,
+            ) = row
+            jobs.append(
+                JournalJob(
+                    job_id=job_id,
+                    stage=stage,
+                    attempts=attempts,
+                    audio=(
+                        AudioBuffer(bytes(audio), rate, channels, duration)
+                        if audio is not None
+                        else None
+                    ),
+                    transcription=(
+                        TranscriptionResult(text, language, duration or 0.0, 0.0)
+                        if text is not None
+                        else None
+                    ),
+                    enhanced=(
+                        EnhancedPrompt.from_dict(json.loads(enhanced)) if enhanced else None
+                    ),
+                    workspace=workspace,
+                )
+            )
+        return jobs
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._ops.put(None)
+            self._writer.join()
@@ -1,25 +1,99 @@
 from __future__ import annotations
 
+import dataclasses
+import functools
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 from ..audio.recorder import AudioBuffer, AudioRecorder
-from ..config import AppConfig, ConfigError
+from ..config import AppConfig, ConfigError, diff_config
 from ..input.hotkey import HotkeyCallbacks, HotkeyListener
-from ..prompt.enhancer import EnhancedPrompt, PromptEnhancer
+from ..prompt.compaction import CompactionResult, compact_transcript
+from ..prompt.enhancer import EnhancedPrompt, ProgressCallback, PromptEnhancer, draft_prompt
 from ..prompt.manager import PromptStorage, SavedPrompt
+from ..stt.batching import BatchingTranscriber
 from ..stt.whisper import TranscriptionResult, WhisperTranscriber
+from ..timing import collect_timings, current_timer, log_timings, record_stage, timed
+from .deferred import DeferredJob, EnhancementQueue
 
 LOGGER = logging.getLogger(__name__)
 
+# Settings fixed for the life of a process (file locations, worker pools,
+# process topology); changing them needs a restart.
+RESTART_SETTINGS = (
+    "paths.",
+    "deferred.",
+    "api.",
+    "timing_history.",
+    "whisper.server_socket",
+    "whisper.batching",
+    "whisper.batch_max_size",
+    "whisper.batch_max_wait_ms",
+    "workspaces",
+)
+# Settings that need a new model instance; the decode profile does not.
+_MODEL_SETTINGS = ("model_size", "device", "compute_type", "download_root")
+_RECORDER_SETTINGS = (
+    "sample_rate",
+    "chunk_duration_ms",
+    "input_device_index",
+    "silence_threshold",
+    "max_record_seconds",
+)
+
 
 @dataclass
 class PTTOutcome:
     saved_prompt: SavedPrompt
     transcription: TranscriptionResult
     enhanced: EnhancedPrompt
+    compaction: Optional[CompactionResult] = None
+    deferred: bool = False
+    timings: Dict[str, float] = field(default_factory=dict)  # stage -> milliseconds
+
+
+@dataclass
+class ConfigUpdate:
+    """Outcome of `PTTService.apply_config`: dotted setting names by fate."""
+
+    applied: List[str] = field(default_factory=list)
+    restart_required: List[str] = field(default_factory=list)
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _instrumented(event: str) -> Callable[[_F], _F]:
+    """Collect per-stage timings for a service entry point.
+
+    Nested entry points share the caller's timer, so the outermost call's
+    outcome carries every stage and is the only one that logs a timing record.
+    """
+
+    def decorator(func: _F) -> _F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            outermost = current_timer() is None
+            with collect_timings() as timer:
+                outcome = func(*args, **kwargs)
+            if isinstance(outcome, PTTOutcome):
+                outcome.timings = timer.as_dict()
+                if outermost:
+                    log_timings(
+                        event,
+                        outcome.timings,
+                        story_id=outcome.saved_prompt.story_id,
+                        audio_seconds=outcome.transcription.duration,
+                        deferred=outcome.deferred,
+                    )
+            return outcome
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
 
 
 class PTTService:
@@ -33,6 +107,7 @@ class PTTService:
         enhancer: PromptEnhancer,
         storage: PromptStorage,
         hotkey_listener: HotkeyListener,
+        enhancement_queue: Optional[EnhancementQueue] = None,
     ) -> None:
         self.config = config
         self.recorder = recorder
@@ -40,10 +115,12 @@ class PTTService:
         self.enhancer = enhancer
         self.storage = storage
         self.hotkey_listener = hotkey_listener
+        self.enhancement_queue = enhancement_queue
+        self._capture_started: Optional[float] = None
 
-    @classmethod
-    def from_config(cls, config: AppConfig) -> "PTTService":
-        recorder = AudioRecorder(
+    @staticmethod
+    def _build_recorder(config: AppConfig) -> AudioRecorder:
+        return AudioRecorder(
             sample_rate=config.ptt.sample_rate,
             chunk_duration_ms=config.ptt.chunk_duration_ms,
             channels=1,
@@ -51,46 +128,163 @@ class PTTService:
             silence_threshold=config.ptt.silence_threshold,
             max_record_seconds=config.ptt.max_record_seconds,
         )
-        transcriber = WhisperTranscriber(config.whisper)
-        enhancer = PromptEnhancer(config.openai)
-        storage = PromptStorage(
-            output_root=config.paths.prompt_output_root,
-            filename_pattern=config.prompt.filename_pattern,
-            metadata_filename=config.prompt.metadata_filename,
+
+    @staticmethod
+    def _build_transcriber(config: AppConfig) -> Any:
+        transcriber: Any = WhisperTranscriber(config.whisper)
+        if config.whisper.batching and config.whisper.server_socket is None:
+            transcriber = BatchingTranscriber(
+                transcriber,
+                max_batch_size=config.whisper.batch_max_size,
+                max_wait_seconds=config.whisper.batch_max_wait_ms / 1000.0,
+            )
+        return transcriber
+
+    @staticmethod
+    def _build_storage(config: AppConfig) -> PromptStorage:
+        return PromptStorage.from_config(config)
+
+    @staticmethod
+    def _build_enhancement_queue(config: AppConfig) -> Optional[EnhancementQueue]:
+        if not config.deferred.enabled:
+            return None
+        return EnhancementQueue(
+            config.paths.state_dir / "enhancement-queue",
+            retry_base_seconds=config.deferred.retry_base_seconds,
+            retry_max_seconds=config.deferred.retry_max_seconds,
         )
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "PTTService":
+        recorder = cls._build_recorder(config)
+        transcriber = cls._build_transcriber(config)
+        enhancer = PromptEnhancer(config.openai)
+        storage = cls._build_storage(config)
         hotkey_listener = HotkeyListener(config.ptt.hotkey)
-        return cls(config, recorder, transcriber, enhancer, storage, hotkey_listener)
+        enhancement_queue = cls._build_enhancement_queue(config)
+        return cls(
+            config,
+            recorder,
+            transcriber,
+            enhancer,
+            storage,
+            hotkey_listener,
+            enhancement_queue=enhancement_queue,
+        )
+
+    def for_workspace(self, config: AppConfig) -> "PTTService":
+        """A service for another project root that shares this one's components.
+
+        Only `paths` and `prompt` are taken from `config`. The recorder,
+        Whisper model, OpenAI client and hotkey listener are this service's,
+        so each extra workspace costs a `PromptStorage`, not another model.
+        """
+
+        merged = dataclasses.replace(self.config, paths=config.paths, prompt=config.prompt)
+        return PTTService(
+            merged,
+            self.recorder,
+            self.transcriber,
+            self.enhancer,
+            self._build_storage(merged),
+            self.hotkey_listener,
+            enhancement_queue=self._build_enhancement_queue(merged),
+        )
+
+    def apply_config(self, config: AppConfig) -> ConfigUpdate:
+        """Adopt changed settings in place, rebuilding only the affected components.
+
+        Call between cycles: requests already running keep the components they
+        started with, but attributes are replaced one at a time, so a request
+        starting concurrently can see a half-applied config. Callers serving
+        concurrent requests apply to a `copy.copy` of the service and swap it
+        in (see `ServiceHolder` and `ServiceRef`). A replaced transcriber is closed only after
+        its in-flight calls drain. Settings in `RESTART_SETTINGS` keep their running values
+        and are reported in `restart_required`. A new model is created only
+        when the model itself changed; decode-profile, OpenAI model and
+        temperature changes reuse the loaded model and HTTP client.
+        """
+
+        update = ConfigUpdate()
+        for name in diff_config(self.config, config):
+            if name.startswith(RESTART_SETTINGS):
+                update.restart_required.append(name)
+            else:
+                update.applied.append(name)
+        if update.restart_required:
+            LOGGER.warning("Restart to apply: %s", ", ".join(update.restart_required))
+        if not update.applied:
+            return update
+
+        running = self.config
+        whisper = dataclasses.replace(
+            config.whisper,
+            server_socket=running.whisper.server_socket,
+            batching=running.whisper.batching,
+            batch_max_size=running.whisper.batch_max_size,
+            batch_max_wait_ms=running.whisper.batch_max_wait_ms,
+        )
+        config = dataclasses.replace(
+            config,
+            paths=running.paths,
+            deferred=running.deferred,
+            api=running.api,
+            timing_history=running.timing_history,
+            whisper=whisper,
+        )
+        changed = set(update.applied)
+        if any(f"whisper.{name}" in changed for name in _MODEL_SETTINGS):
+            previous = self.transcriber
+            self.transcriber = self._build_transcriber(config)
+            close = getattr(previous, "close", None)
+            if callable(close):
+                close()
+        elif any(name.startswith("whisper.") for name in changed):
+            self.transcriber.config = config.whisper
+        if any(f"ptt.{name}" in changed for name in _RECORDER_SETTINGS):
+            self.recorder = self._build_recorder(config)
+        if "ptt.hotkey" in changed:
+            self.hotkey_listener = HotkeyListener(config.ptt.hotkey)
+        if any(name.startswith("openai.") for name in changed):
+            self.enhancer = self.enhancer.with_config(config.openai)
+        if any(name.startswith("prompt.") for name in changed):
+            previous_storage, self.storage = self.storage, self._build_storage(config)
+            close = getattr(previous_storage, "close", None)
+            if callable(close):
+                close()  # commits its pending writes; stragglers fall back to sync writes
+        self.config = config
+        LOGGER.info("Applied configuration changes: %s", ", ".join(update.applied))
+        return update
 
+    @_instrumented("enhance_text")
     def enhance_text(
         self,
         text: str,
         story_id: Optional[str] = None,
         story_title: Optional[str] = None,
         auto_move: bool = False,
+        on_progress: Optional[ProgressCallback] = None,
     ) -> PTTOutcome:
+        """Enhance a typed brief; `on_progress` receives events as the plan streams in."""
+
         if not text.strip():
             raise ConfigError("Cannot enhance empty text")
         LOGGER.debug("Enhancing text brief")
-        enhanced = self.enhancer.enhance(text.strip())
-        saved = self.storage.save(enhanced, story_id=story_id)
-        if auto_move:
-            dest = self.storage.relocate_to_project_management(
-                saved,
-                self.config.paths.project_management_root,
-                story_title=story_title or enhanced.summary,
-            )
-            LOGGER.info("Prompt moved to %s", dest)
-        return PTTOutcome(
-            saved_prompt=saved,
-            transcription=TranscriptionResult(
-                text=text.strip(),
-                language=self.config.ptt.language,
-                duration=0.0,
-                temperature=0.0,
-            ),
-            enhanced=enhanced,
+        transcription = TranscriptionResult(
+            text=text.strip(),
+            language=self.config.ptt.language,
+            duration=0.0,
+            temperature=0.0,
+        )
+        return self._enhance_and_store(
+            transcription,
+            story_id=story_id,
+            story_title=story_title,
+            auto_move=auto_move,
+            on_progress=on_progress,
         )
 
+    @_instrumented("process_audio_buffer")
     def process_audio_buffer(
         self,
         buffer: AudioBuffer,
@@ -98,37 +292,224 @@ class PTTService:
         story_title: Optional[str] = None,
         auto_move: bool = False,
     ) -> PTTOutcome:
+        transcription = self.transcribe_buffer(buffer)
+        return self.complete_transcription(
+            transcription, story_id=story_id, story_title=story_title, auto_move=auto_move
+        )
+
+    def transcribe_buffer(self, buffer: AudioBuffer) -> TranscriptionResult:
+        """STT stage on its own, so pipelined callers can run it in a separate worker."""
+
         LOGGER.debug("Transcribing captured audio")
         transcription = self.transcriber.transcribe(buffer, language=self.config.ptt.language)
         if not transcription.text:
             raise ConfigError("Transcription returned empty text")
-        LOGGER.debug("Enhancing transcribed text: %s", transcription.text)
-        enhanced = self.enhancer.enhance(transcription.text)
-        saved = self.storage.save(enhanced, story_id=story_id)
-        if auto_move:
-            dest = self.storage.relocate_to_project_management(
-                saved,
-                self.config.paths.project_management_root,
-                story_title=story_title or enhanced.summary,
-            )
-            LOGGER.info("Prompt moved to %s", dest)
-        return PTTOutcome(saved_prompt=saved, transcription=transcription, enhanced=enhanced)
+        return transcription
 
-    def process_audio_file(
+    def transcribe_samples(self, samples: Any) -> TranscriptionResult:
+        """STT stage for 16 kHz mono float32 samples (e.g. a streamed PCM upload)."""
+
+        transcription = self.transcriber.transcribe_samples(
+            samples, language=self.config.ptt.language
+        )
+        if not transcription.text:
+            raise ConfigError("Transcription returned empty text")
+        return transcription
+
+    def preview_samples(self, samples: Any) -> str:
+        """Fast, greedy transcript of audio captured so far (may be empty)."""
+
+        return self.transcriber.transcribe_samples(
+            samples, language=self.config.ptt.language, beam_size=1
+        ).text
+
+    @_instrumented("process_audio_samples")
+    def process_audio_samples(
         self,
-        file_path: Path,
+        samples: Any,
         story_id: Optional[str] = None,
         story_title: Optional[str] = None,
         auto_move: bool = False,
     ) -> PTTOutcome:
+        transcription = self.transcribe_samples(samples)
+        return self._enhance_and_store(
+            transcription,
+            story_id=story_id,
+            story_title=story_title,
+            auto_move=auto_move,
+            defer=self.enhancement_queue is not None,
+        )
+
+    def transcribe_file(self, file_path: Path) -> TranscriptionResult:
+        """STT stage for an audio file (any format faster-whisper can decode)."""
+
         LOGGER.debug("Transcribing audio file: %s", file_path)
         transcription = self.transcriber.transcribe_file(
             file_path, language=self.config.ptt.language
         )
         if not transcription.text:
             raise ConfigError(f"No transcription produced for {file_path}")
-        enhanced = self.enhancer.enhance(transcription.text)
-        saved = self.storage.save(enhanced, story_id=story_id)
+        return transcription
+
+    @_instrumented("complete_transcription")
+    def complete_transcription(
+        self,
+        transcription: TranscriptionResult,
+        story_id: Optional[str] = None,
+        story_title: Optional[str] = None,
+        auto_move: bool = False,
+        on_enhanced: Optional[Callable[[EnhancedPrompt], None]] = None,
+        on_stored: Optional[Callable[[SavedPrompt], None]] = None,
+    ) -> PTTOutcome:
+        """Enhancement + storage stage for an already transcribed capture.
+
+        `on_enhanced` is called between the model response and the disk write,
+        which lets callers checkpoint the enhanced prompt. `on_stored` is
+        called once the prompt is on disk, which with write-behind storage is
+        after this method returns (and never, if the write fails).
+        """
+
+        LOGGER.debug("Enhancing transcribed text: %s", transcription.text)
+        return self._enhance_and_store(
+            transcription,
+            story_id=story_id,
+            story_title=story_title,
+            auto_move=auto_move,
+            defer=self.enhancement_queue is not None,
+            on_enhanced=on_enhanced,
+            on_stored=on_stored,
+        )
+
+    @_instrumented("process_audio_file")
+    def process_audio_file(
+        self,
+        file_path: Path,
+        story_id: Optional[str] = None,
+        story_title: Optional[str] = None,
+        auto_move: bool = False,
+    ) -> PTTOutcome:
+        transcription = self.transcribe_file(file_path)
+        return self._enhance_and_store(
+            transcription,
+            story_id=story_id,
+            story_title=story_title,
+            auto_move=auto_move,
+            defer=self.enhancement_queue is not None,
+        )
+
+    @_instrumented("amend_text")
+    def amend_text(
+        self,
+        text: str,
+        prompt_path: Optional[Path] = None,
+        story_id: Optional[str] = None,
+        story_title: Optional[str] = None,
+        auto_move: bool = False,
+    ) -> PTTOutcome:
+        """Apply a follow-up note to an existing prompt instead of regenerating it."""
+
+        if not text.strip():
+            raise ConfigError("Cannot amend with empty text")
+        saved = self._locate_saved_prompt(prompt_path, story_id)
+        prior = self.storage.load_prompt(saved)
+        note, compaction = self.compact(text.strip())
+        LOGGER.debug("Amending %s (revision %s)", saved.story_id, saved.revision)
+        amended = self.enhancer.amend(prior, note)
+        amended.amendments[-1] = text.strip()
+        updated = self.storage.save_revision(saved, amended)
+        pm_root = self.config.paths.project_management_root
+        if auto_move and not updated.prompt_path.resolve().is_relative_to(pm_root.resolve()):
+            dest = self.storage.relocate_to_project_management(
+                updated, pm_root, story_title=story_title
+            )
+            LOGGER.info("Prompt moved to %s", dest)
+        return PTTOutcome(
+            saved_prompt=updated,
+            transcription=TranscriptionResult(
+                text=text.strip(),
+                language=self.config.ptt.language,
+                duration=0.0,
+                temperature=0.0,
+            ),
+            enhanced=amended,
+            compaction=compaction,
+        )
+
+    def _locate_saved_prompt(
+        self, prompt_path: Optional[Path], story_id: Optional[str]
+    ) -> SavedPrompt:
+        try:
+            if prompt_path is not None:
+                return self.storage.load_saved_prompt(prompt_path)
+            if story_id:
+                return self.storage.find_saved_prompt(
+                    story_id,
+                    extra_roots=[self.config.paths.project_management_root / "user-story-prompts"],
+                )
+        except FileNotFoundError as exc:
+            raise ConfigError(str(exc)) from exc
+        raise ConfigError("Provide a prompt path or story ID to amend")
+
+    def compact(self, text: str) -> Tuple[str, Optional[CompactionResult]]:
+        """Apply the optional transcript compaction stage."""
+
+        settings = self.config.compaction
+        if not settings.enabled:
+            return text, None
+        with timed("compact"):
+            result = compact_transcript(text, max_ngram=settings.max_repeat_ngram)
+        LOGGER.info("Transcript compacted: %s", result.describe())
+        return result.text, result
+
+    def _enhance_and_store(
+        self,
+        transcription: TranscriptionResult,
+        story_id: Optional[str],
+        story_title: Optional[str],
+        auto_move: bool,
+        defer: bool = False,
+        on_enhanced: Optional[Callable[[EnhancedPrompt], None]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        on_stored: Optional[Callable[[SavedPrompt], None]] = None,
+    ) -> PTTOutcome:
+        if defer and self.enhancement_queue is not None:
+            return self._store_draft(transcription, story_id, story_title, auto_move, on_stored)
+        brief, compaction = self.compact(transcription.text)
+        if on_progress is None:
+            enhanced = self.enhancer.enhance(brief)
+        else:
+            on_progress("transcription", {"text": transcription.text, "brief": brief})
+            enhanced = self.enhancer.enhance(brief, on_progress=on_progress)
+        # The stored prompt always quotes what was actually said.
+        enhanced.original_brief = transcription.text
+        if on_enhanced is not None:
+            on_enhanced(enhanced)
+        outcome = self.store_enhanced(
+            enhanced,
+            transcription,
+            story_id=story_id,
+            story_title=story_title,
+            auto_move=auto_move,
+            on_stored=on_stored,
+        )
+        outcome.compaction = compaction
+        return outcome
+
+    def store_enhanced(
+        self,
+        enhanced: EnhancedPrompt,
+        transcription: TranscriptionResult,
+        story_id: Optional[str] = None,
+        story_title: Optional[str] = None,
+        auto_move: bool = False,
+        on_stored: Optional[Callable[[SavedPrompt], None]] = None,
+    ) -> PTTOutcome:
+        """Storage stage: write the prompt and optionally relocate it.
+
+        `on_stored` runs once the prompt is on disk (see `PromptStorage.save`).
+        """
+
+        saved = self.storage.save(enhanced, story_id=story_id, on_written=on_stored)
         if auto_move:
             dest = self.storage.relocate_to_project_management(
                 saved,
@@ -138,32 +519,116 @@ class PTTService:
             LOGGER.info("Prompt moved to %s", dest)
         return PTTOutcome(saved_prompt=saved, transcription=transcription, enhanced=enhanced)
 
-    def listen_once(
+    def _store_draft(
         self,
-        story_id: Optional[str] = None,
-        story_title: Optional[str] = None,
-        auto_move: bool = False,
+        transcription: TranscriptionResult,
+        story_id: Optional[str],
+        story_title: Optional[str],
+        auto_move: bool,
+        on_stored: Optional[Callable[[SavedPrompt], None]] = None,
     ) -> PTTOutcome:
-        """Engage PTT workflow for a single press/release cycle."""
+        """Persist the raw transcript now and queue its enhancement."""
+
+        assert self.enhancement_queue is not None
+        draft = draft_prompt(transcription.text)
+        saved = self.storage.save(draft, story_id=story_id, on_written=on_stored)
+        if auto_move:
+            self.storage.relocate_to_project_management(
+                saved,
+                self.config.paths.project_management_root,
+                story_title=story_title or draft.summary,
+            )
+        job = self.enhancement_queue.enqueue(
+            story_id=saved.story_id,
+            prompt_path=saved.prompt_path,
+            brief=transcription.text,
+            story_title=story_title,
+            auto_move=auto_move,
+        )
+        LOGGER.info("Draft saved to %s; enhancement queued (%s)", saved.prompt_path, job.job_id)
+        return PTTOutcome(
+            saved_prompt=saved, transcription=transcription, enhanced=draft, deferred=True
+        )
 
-        result: dict[str, PTTOutcome] = {}
+    @_instrumented("complete_deferred")
+    def complete_deferred(self, job: DeferredJob) -> PTTOutcome:
+        """Enhance a queued draft and rewrite its prompt in place."""
+
+        brief, compaction = self.compact(job.brief)
+        enhanced = self.enhancer.enhance(brief)
+        enhanced.original_brief = job.brief
+        try:
+            draft = self.storage.load_saved_prompt(Path(job.prompt_path))
+        except FileNotFoundError:
+            saved = self.storage.save(enhanced, story_id=job.story_id)
+        else:
+            saved = self.storage.save_revision(draft, enhanced)
+        if job.auto_move:
+            dest = self.storage.relocate_to_project_management(
+                saved,
+                self.config.paths.project_management_root,
+                story_title=job.story_title or enhanced.summary,
+            )
+            LOGGER.info("Prompt moved to %s", dest)
+        return PTTOutcome(
+            saved_prompt=saved,
+            transcription=TranscriptionResult(
+                text=job.brief,
+                language=self.config.ptt.language,
+                duration=0.0,
+                temperature=0.0,
+            ),
+            enhanced=enhanced,
+            compaction=compaction,
+        )
+
+    def begin_capture(self) -> None:
+        LOGGER.info("Recording started")
+        self.recorder.start()
+        self._capture_started = time.perf_counter()
+
+    def end_capture(self) -> AudioBuffer:
+        LOGGER.info("Recording stopped; processing audio")
+        if self._capture_started is not None:
+            record_stage("record", time.perf_counter() - self._capture_started)
+            self._capture_started = None
+        return self.recorder.stop()
+
+    def capture_once(self) -> AudioBuffer:
+        """Record a single press/release cycle and return the captured audio."""
+
+        result: dict[str, AudioBuffer] = {}
+        # pynput runs the callbacks on its own thread; carry the caller's timer there.
+        timer = current_timer()
 
         def on_press() -> None:
-            LOGGER.info("Recording started")
-            self.recorder.start()
+            self.begin_capture()
 
         def on_release() -> None:
-            LOGGER.info("Recording stopped; processing audio")
-            buffer = self.recorder.stop()
-            outcome = self.process_audio_buffer(
-                buffer, story_id=story_id, story_title=story_title, auto_move=auto_move
-            )
-            result["outcome"] = outcome
+            if timer is None:
+                result["buffer"] = self.end_capture()
+                return
+            with collect_timings(timer):
+                result["buffer"] = self.end_capture()
 
         callbacks = HotkeyCallbacks(on_press=on_press, on_release=on_release)
         self.hotkey_listener.start(callbacks)
         self.hotkey_listener.join()
 
-        if "outcome" not in result:
+        if "buffer" not in result:
             raise ConfigError("PTT session ended without capturing audio")
-        return result["outcome"]
+        return result["buffer"]
+
+    @_instrumented("listen_once")
+    def listen_once(
+        self,
+        story_id: Optional[str] = None,
+        story_title: Optional[str] = None,
+        auto_move: bool = False,
+    ) -> PTTOutcome:
+        """Engage PTT workflow for a single press/release cycle."""
+
+        buffer = self.capture_once()
+        return self.process_audio_buffer(
+            buffer, story_id=story_id, story_title=story_title, auto_move=auto_move
+        )
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, Optional
+
+from ..audio.recorder import AudioBuffer
+from ..config import AppConfig
+from ..stt.whisper import TranscriptionResult
+from .ptt_service import PTTOutcome, PTTService
+
+LOGGER = logging.getLogger(__name__)
+
+ServiceFactory = Callable[[AppConfig], PTTService]
+
+
+class InferenceWorkerError(RuntimeError):
+    """Raised when the inference worker fails or exits while handling a job."""
+
+
+def _read_shared_audio(message: Dict[str, Any]) -> AudioBuffer:
+    block = shared_memory.SharedMemory(name=message["shm"])
+    try:
+        wav_bytes = bytes(block.buf[: message["size"]])
+    finally:
+        block.close()
+    return AudioBuffer(
+        wav_bytes=wav_bytes,
+        sample_rate=message["sample_rate"],
+        channels=message["channels"],
+        duration_seconds=message["duration_seconds"],
+    )
+
+
+def _handle(service: PTTService, message: Dict[str, Any]) -> Any:
+    op = message["op"]
+    if op == "ping":
+        return "pong"
+    if op == "transcribe":
+        return service.transcribe_buffer(_read_shared_audio(message))
+    if op == "process":
+        return service.process_audio_buffer(_read_shared_audio(message), **message["options"])
+    if op == "complete":
+        return _complete_on_disk(service, message)
+    raise InferenceWorkerError(f"Unknown worker operation: {op}")
+
+
+def _complete_on_disk(service: PTTService, message: Dict[str, Any]) -> Any:
+    # The capture process journals the job as stored once this replies, so a
+    # write-behind prompt has to be on disk first.
+    written = threading.Event()
+    outcome = service.complete_transcription(
+        message["transcription"], on_stored=lambda _saved: written.set(), **message["options"]
+    )
+    service.storage.flush()
+    if not written.is_set():
+        raise OSError(f"Could not write {outcome.saved_prompt.prompt_path}")
+    return outcome
+
+
+def _worker_main(
+    config: AppConfig, conn: Connection, factory: ServiceFactory, threads: int
+) -> None:
+    """Entry point of the inference process: owns the Whisper model and enhancer."""
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the capture process handles Ctrl+C
+    service = factory(config)
+    send_lock = threading.Lock()
+
+    def run(message: Dict[str, Any]) -> None:
+        try:
+            reply = {"id": message["id"], "ok": True, "result": _handle(service, message)}
+        except Exception as exc:
+            reply = {"id": message["id"], "ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        with send_lock:
+            conn.send(reply)
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="lazy-ptt-worker") as pool:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+            if message is None:
+                break
+            pool.submit(run, message)
+
+
+class InferenceWorkerProcess:
+    """Runs STT/enhancement in a child process; audio travels via shared memory.
+
+    Only a small control message (shared-memory block name, size and format) is
+    pickled per job. The child can crash or be restarted without affecting the
+    capture/hotkey process; jobs in flight at that moment fail with
+    `InferenceWorkerError`.
+
+    The object mirrors the processing half of `PTTService`
+    (`transcribe_buffer`, `complete_transcription`, `process_audio_buffer`) so
+    `PTTDaemon` can use it as a drop-in processor.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        service_factory: ServiceFactory = PTTService.from_config,
+        threads: int = 2,
+        start_method: str = "spawn",
+    ) -> None:
+        self.config = config
+        self.service_factory = service_factory
+        self.threads = threads
+        self._context = multiprocessing.get_context(start_method)
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._conn: Optional[Connection] = None
+        self._reader: Optional[threading.Thread] = None
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._broken = False
+        self.restarts = 0
+
+    # -- lifecycle -------------------------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            if self.is_alive():
+                return
+            if self._conn is not None:
+                self._conn.close()
+            parent_conn, child_conn = self._context.Pipe()
+            process = self._context.Process(
+                target=_worker_main,
+                args=(self.config, child_conn, self.service_factory, self.threads),
+                name="lazy-ptt-inference",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._process = process
+            self._conn = parent_conn
+            self._broken = False
+            self._reader = threading.Thread(
+                target=self._read_replies,
+                args=(parent_conn,),
+                name="lazy-ptt-worker-reader",
+                daemon=True,
+            )
+            self._reader.start()
+            LOGGER.info("Inference worker started (pid %s)", process.pid)
+
+    def is_alive(self) -> bool:
+        return self._process is not None and not self._broken and self._process.is_alive()
+
+    def restart(self) -> None:
+        """Replace the worker process; the capture side keeps running."""
+
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            process, conn = self._process, self._conn
+            self._process, self._conn = None, None
+        if conn is not None:
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+        if process is not None:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(timeout)
+        if conn is not None:
+            conn.close()
+        self._fail_pending("Inference worker stopped")
+
+    # -- transport -------------------------------------------------------
+
+    def _read_replies(self, conn: Connection) -> None:
+        while True:
+            try:
+                reply = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                future = self._pending.pop(reply["id"], None)
+            if future is None:
+                continue
+            if reply["ok"]:
+                future.set_result(reply["result"])
+            else:
+                future.set_exception(InferenceWorkerError(reply["error"]))
+        with self._lock:
+            current = self._conn is conn
+            if current:
+                self._broken = True
+        if current:  # a replaced worker's reader must not fail the new worker's jobs
+            self._fail_pending("Inference worker exited unexpectedly")
+
+    def _fail_pending(self, reason: str) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(InferenceWorkerError(reason))
+
+    def _call(self, message: Dict[str, Any], buffer: Optional[AudioBuffer] = None) -> Any:
+        if not self.is_alive():
+            if self._process is not None:
+                LOGGER.warning("Inference worker is not running; restarting it")
+                self.restarts += 1
+            self.start()
+        block: Optional[shared_memory.SharedMemory] = None
+        if buffer is not None:
+            size = len(buffer.wav_bytes)
+            block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            block.buf[:size] = buffer.wav_bytes
+            message.update(
+                shm=block.name,
+                size=size,
+                sample_rate=buffer.sample_rate,
+                channels=buffer.channels,
+                duration_seconds=buffer.duration_seconds,
+            )
+        future: Future = Future()
+        with self._lock:
+            message["id"] = next(self._ids)
+            self._pending[message["id"]] = future
+            conn = self._conn
+        try:
+            assert conn is not None
+            conn.send(message)
+            return future.result()
+        except (OSError, ValueError) as exc:
+            raise InferenceWorkerError(f"Could not reach inference worker: {exc}") from exc
+        finally:
+            with self._lock:
+                self._pending.pop(message["id"], None)
+            if block is not None:
+                block.close()
+                block.unlink()
+
+    # -- PTTService-compatible processing API ----------------------------
+
+    def transcribe_buffer(self, buffer: AudioBuffer) -> TranscriptionResult:
+        return self._call({"op": "transcribe"}, buffer)
+
+    def complete_transcription(
+        self, transcription: TranscriptionResult, **options: Any
+    ) -> PTTOutcome:
+        return self._call({"op": "complete", "transcription": transcription, "options": options})
+
+    def process_audio_buffer(self, buffer: AudioBuffer, **options: Any) -> PTTOutcome:
+        return self._call({"op": "process", "options": options}, buffer)
+
+    def ping(self) -> bool:
+        return self._call({"op": "ping"}) == "pong"
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import copy
+import dataclasses
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from ..config import AppConfig, ConfigError, WorkspaceConfig, load_config
+
+LOGGER = logging.getLogger(__name__)
+
+# Hotkey bindings of workspaces are named `workspace:<name>`.
+BINDING_PREFIX = "workspace:"
+
+
+class ServiceRef:
+    """The daemon's current service; config changes swap in an updated copy.
+
+    `PTTService.apply_config` replaces attributes one at a time, so it runs on
+    a `copy.copy` that replaces the held service only once complete. Control
+    socket requests resolve the service through `get` and always see one
+    whole config; requests already running keep the instance they started on.
+    """
+
+    def __init__(self, service: Any) -> None:
+        self._service = service
+
+    def get(self) -> Any:
+        return self._service
+
+    def apply_config(self, config: AppConfig) -> Any:
+        updated = copy.copy(self._service)
+        update = updated.apply_config(config)
+        self._service = updated
+        return update
+
+
+@dataclass
+class Workspace:
+    """A project root served by the daemon, with the service storing into it."""
+
+    name: str
+    service: Any
+    hotkey: Optional[str] = None
+
+    @property
+    def binding(self) -> str:
+        return f"{BINDING_PREFIX}{self.name}"
+
+    @property
+    def root(self) -> Path:
+        return self.service.config.paths.repository_root
+
+
+class WorkspaceRegistry:
+    """Project roots served by one daemon, one of them active at a time.
+
+    The first workspace is the daemon's own service; the others are built
+    with `PTTService.for_workspace`, so they have their own paths, prompt
+    settings and storage but share its recorder, Whisper model and OpenAI
+    client. Captures and forwarded commands go to the active workspace.
+    """
+
+    def __init__(self, service: Any, name: Optional[str] = None) -> None:
+        primary = Workspace(name or service.config.paths.repository_root.name, service)
+        self._workspaces: Dict[str, Workspace] = {primary.name: primary}
+        self._primary = primary
+        self._active = primary
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls, service: Any, workspaces: Optional[Iterable[WorkspaceConfig]] = None
+    ) -> "WorkspaceRegistry":
+        registry = cls(service)
+        for workspace in service.config.workspaces if workspaces is None else workspaces:
+            if workspace.root == service.config.paths.repository_root:
+                registry.primary.hotkey = workspace.hotkey
+                continue
+            registry.add(workspace.name, load_config(base_dir=workspace.root), workspace.hotkey)
+        return registry
+
+    @property
+    def primary(self) -> Workspace:
+        return self._primary
+
+    @property
+    def active(self) -> Workspace:
+        with self._lock:
+            return self._active
+
+    def __iter__(self) -> Iterator[Workspace]:
+        with self._lock:
+            return iter(list(self._workspaces.values()))
+
+    def __len__(self) -> int:
+        return len(self._workspaces)
+
+    def add(self, name: str, config: AppConfig, hotkey: Optional[str] = None) -> Workspace:
+        with self._lock:
+            if name in self._workspaces:
+                raise ConfigError(f"Duplicate workspace name {name!r}")
+            workspace = Workspace(name, self._primary.service.for_workspace(config), hotkey)
+            self._workspaces[name] = workspace
+        LOGGER.info("Workspace %s: %s", name, workspace.root)
+        return workspace
+
+    def get(self, name: str) -> Workspace:
+        with self._lock:
+            workspace = self._workspaces.get(name)
+        if workspace is None:
+            known = ", ".join(self._workspaces)
+            raise ConfigError(f"Unknown workspace {name!r} (known: {known})")
+        return workspace
+
+    def activate(self, name: str) -> Workspace:
+        workspace = self.get(name)
+        with self._lock:
+            changed, self._active = self._active is not workspace, workspace
+        if changed:
+            LOGGER.info("Active workspace: %s (%s)", workspace.name, workspace.root)
+        return workspace
+
+    def for_binding(self, binding: Optional[str]) -> Workspace:
+        """The workspace a hotkey binding captures into, activating it if it is its own."""
+
+        if binding and binding.startswith(BINDING_PREFIX):
+            return self.activate(binding[len(BINDING_PREFIX):])
+        return self.active
+
+    def apply_config(self, config: AppConfig) -> Any:
+        """Apply a changed config to the primary service and re-share its components.
+
+        Like `ServiceRef`, every workspace gets an updated copy of its service,
+        and the copies are swapped in together once all of them are complete.
+        """
+
+        primary = copy.copy(self._primary.service)
+        update = primary.apply_config(config)
+        updated: Dict[str, Any] = {self._primary.name: primary}
+        for workspace in self:
+            if workspace is self._primary:
+                continue
+            service = copy.copy(workspace.service)
+            service.config = dataclasses.replace(
+                primary.config, paths=service.config.paths, prompt=service.config.prompt
+            )
+            service.recorder = primary.recorder
+            service.transcriber = primary.transcriber
+            service.enhancer = primary.enhancer
+            service.hotkey_listener = primary.hotkey_listener
+            updated[workspace.name] = service
+        with self._lock:
+            for workspace in self._workspaces.values():
+                workspace.service = updated.get(workspace.name, workspace.service)
+        return update
+
+    def describe(self) -> List[Dict[str, Any]]:
+        active = self.active
+        return [
+            {
+                "name": workspace.name,
+                "root": str(workspace.root),
+                "hotkey": workspace.hotkey,
+                "active": workspace is active,
+            }
+            for workspace in self
+        ]
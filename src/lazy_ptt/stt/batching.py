@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+from ..timing import record_stage, timed
+from .whisper import TranscriptionRequest, TranscriptionResult
+
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_STOP = object()
+
+
+class BatcherClosedError(RuntimeError):
+    """Raised by `MicroBatcher.submit` once the batcher has been closed."""
+
+
+# Recent queue waits kept for percentiles.
+WAIT_SAMPLES = 1024
+
+
+class BatchStats:
+    """Batch size distribution and queue wait of a `MicroBatcher`."""
+
+    def __init__(self) -> None:
+        self.sizes: "Counter[int]" = Counter()
+        self.waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self._lock = threading.Lock()
+
+    def record(self, size: int, waits: Sequence[float]) -> None:
+        with self._lock:
+            self.sizes[size] += 1
+            self.waits.extend(waits)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            sizes = dict(sorted(self.sizes.items()))
+            waits = np.array(self.waits, dtype=float)
+        batches = sum(sizes.values())
+        items = sum(size * count for size, count in sizes.items())
+        wait_ms: Dict[str, float] = {}
+        if waits.size:
+            p50, p90, p99 = np.percentile(waits * 1000.0, [50.0, 90.0, 99.0])
+            wait_ms = {
+                "p50": round(float(p50), 2),
+                "p90": round(float(p90), 2),
+                "p99": round(float(p99), 2),
+                "max": round(float(waits.max() * 1000.0), 2),
+            }
+        return {
+            "batches": batches,
+            "items": items,
+            "mean_batch_size": round(items / batches, 2) if batches else 0.0,
+            "batch_sizes": sizes,
+            "queue_wait_ms": wait_ms,
+        }
+
+
+class MicroBatcher(Generic[T, R]):
+    """Groups concurrently submitted items into small batches for one worker.
+
+    The worker blocks for a first item, then keeps collecting until
+    `max_batch_size` items are pending or `max_wait_seconds` have passed since
+    that first item arrived, and hands the batch to `run_batch`. `run_batch`
+    returns one result per item, in order; an exception instance in that list
+    fails only its own item, while raising fails the whole batch.
+
+    Each returned future carries `queue_wait`, `batch_size` and `run_seconds`
+    attributes once resolved, and `stats` aggregates them across batches.
+
+    `close` finishes every item submitted before it; `submit` raises
+    `BatcherClosedError` afterwards instead of returning a future that would
+    never resolve.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[T]], Sequence[Any]],
+        max_batch_size: int = 8,
+        max_wait_seconds: float = 0.01,
+        name: str = "lazy-ptt-batcher",
+    ) -> None:
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self.stats = BatchStats()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = False
+        self._submit_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: T) -> "Future[R]":
+        future: "Future[R]" = Future()
+        with self._submit_lock:  # every item lands ahead of the stop marker
+            if self._closed:
+                raise BatcherClosedError("Batcher is closed")
+            self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def close(self, timeout: float = 5.0) -> None:
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _collect(self, first: Tuple[T, "Future[R]", float]) -> Tuple[List[Any], bool]:
+        batch = [first]
+        deadline = first[2] + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    entry = self._queue.get(timeout=remaining)
+                else:
+                    entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch, stopping = self._collect(first)
+            self._execute(batch)
+            if stopping:
+                return
+
+    def _execute(self, batch: List[Tuple[T, "Future[R]", float]]) -> None:
+        started = time.perf_counter()
+        waits = [started - submitted for _, _, submitted in batch]
+        self.stats.record(len(batch), waits)
+        try:
+            results = list(self.run_batch([item for item, _, _ in batch]))
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch returned {len(results)} results for {len(batch)} items")
+        except Exception as exc:
+            LOGGER.warning("Batch of %d failed: %s", len(batch), exc)
+            results = [exc] * len(batch)
+        run_seconds = time.perf_counter() - started
+        for (_, future, _), wait, result in zip(batch, waits, results):
+            future.queue_wait = wait  # type: ignore[attr-defined]
+            future.batch_size = len(batch)  # type: ignore[attr-defined]
+            future.run_seconds = run_seconds  # type: ignore[attr-defined]
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def __enter__(self) -> "MicroBatcher[T, R]":
+        return self
+
+    def __exit__(self, *_exc: Optional[BaseException]) -> None:
+        self.close()
+
+
+class BatchingTranscriber:
+    """Drop-in front for `WhisperTranscriber` that batches concurrent requests.
+
+    Requests arriving within the wait window are decoded together through
+    `WhisperTranscriber.transcribe_batch`. Callers see their queue wait as
+    the `stt_queue` stage and the shared decode as `transcribe`.
+
+    `close` retires the transcriber: the batcher stops once the calls already
+    in flight (possibly still loading the model) have finished, and calls
+    made after that are decoded on their own thread.
+    """
+
+    def __init__(
+        self, transcriber: Any, max_batch_size: int = 8, max_wait_seconds: float = 0.01
+    ) -> None:
+        self.transcriber = transcriber
+        self.batcher: MicroBatcher[TranscriptionRequest, TranscriptionResult] = MicroBatcher(
+            transcriber.transcribe_batch,
+            max_batch_size,
+            max_wait_seconds,
+            name="lazy-ptt-stt-batcher",
+        )
+        self._active = 0
+        self._retired = False
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> Any:
+        return self.transcriber.config
+
+    @config.setter
+    def config(self, value: Any) -> None:
+        self.transcriber.config = value  # decode profile changes apply to the next batch
+
+    def load(self) -> None:
+        self.transcriber.load()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.transcriber.is_loaded
+
+    def stats(self) -> Dict[str, Any]:
+        return self.batcher.stats.snapshot()
+
+    def close(self) -> None:
+        with self._lock:
+            self._retired = True
+            idle = self._active == 0
+        if idle:
+            self.batcher.close()
+
+    def _submit(self, request: TranscriptionRequest) -> TranscriptionResult:
+        with self._lock:
+            retired = self._retired
+            if not retired:
+                self._active += 1
+        if retired:
+            # The caller picked this transcriber up just before it was replaced.
+            with timed("transcribe"):
+                (result,) = self.transcriber.transcribe_batch([request])
+            if isinstance(result, BaseException):
+                raise result
+            return result
+        try:
+            if not self.transcriber.is_loaded:
+                self.transcriber.load()  # on the caller's thread, so model_load is timed
+            future = self.batcher.submit(request)
+            try:
+                return future.result()
+            finally:
+                record_stage("stt_queue", getattr(future, "queue_wait", 0.0))
+                record_stage("transcribe", getattr(future, "run_seconds", 0.0))
+        finally:
+            with self._lock:
+                self._active -= 1
+                drained = self._retired and self._active == 0
+            if drained:
+                self.batcher.close()
+
+    def transcribe(self, buffer: Any, language: Optional[str] = None) -> TranscriptionResult:
+        # Whole-utterance buffers come from the local recorder; nothing to batch with.
+        return self.transcriber.transcribe(buffer, language=language)
+
+    def transcribe_samples(
+        self,
+        samples: np.ndarray,
+        language: Optional[str] = None,
+        beam_size: Optional[int] = None,
+    ) -> TranscriptionResult:
+        return self._submit(TranscriptionRequest(samples, language, beam_size))
+
+    def transcribe_file(
+        self, file_path: Path, language: Optional[str] = None
+    ) -> TranscriptionResult:
+        return self._submit(TranscriptionRequest(Path(file_path), language))
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import ConfigError
+
+# Frame: two big-endian u32 lengths, a JSON header, then a raw binary payload
+# (float32 samples or WAV bytes) so audio never goes through JSON.
+_FRAME = struct.Struct("!II")
+MAX_HEADER_BYTES = 1 << 20
+
+
+class RemoteModelError(RuntimeError):
+    """Raised when the model server is unreachable or reports a failure."""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks: List[bytes] = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            raise EOFError("Connection closed mid-frame")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_frame(sock: socket.socket, header: Dict[str, Any], payload: bytes = b"") -> None:
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    sock.sendall(_FRAME.pack(len(encoded), len(payload)) + encoded)
+    if payload:
+        sock.sendall(payload)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    """Read one frame; raises `EOFError` when the peer closed the connection."""
+
+    prefix = sock.recv(_FRAME.size)
+    if not prefix:
+        raise EOFError("Connection closed")
+    if len(prefix) < _FRAME.size:
+        prefix += _recv_exact(sock, _FRAME.size - len(prefix))
+    header_size, payload_size = _FRAME.unpack(prefix)
+    if header_size > MAX_HEADER_BYTES:
+        raise ValueError(f"Frame header of {header_size} bytes is too large")
+    header = json.loads(_recv_exact(sock, header_size).decode("utf-8"))
+    payload = _recv_exact(sock, payload_size) if payload_size else b""
+    return header, payload
+
+
+Dispatch = Callable[[Dict[str, Any], bytes], Dict[str, Any]]
+
+
+def serve_frames(sock: socket.socket, dispatch: Dispatch) -> None:
+    """Answer request frames on one connection until the peer hangs up.
+
+    Exceptions raised by `dispatch` become `{"ok": false, "error": ...}` replies
+    (with the exception class in `type` and its message in `detail`) so one
+    bad request never drops the connection.
+    """
+
+    while True:
+        try:
+            header, payload = recv_frame(sock)
+        except (EOFError, OSError):
+            return
+        except ValueError as exc:
+            send_frame(sock, {"ok": False, "error": f"Bad frame: {exc}"})
+            return
+        try:
+            reply = dispatch(header, payload)
+        except Exception as exc:
+            name = type(exc).__name__
+            reply = {"ok": False, "error": f"{name}: {exc}", "type": name, "detail": str(exc)}
+        try:
+            send_frame(sock, reply)
+        except OSError:
+            return
+
+
+def bind_unix_server(path: Path, dispatch: Dispatch, what: str) -> socketserver.BaseServer:
+    """Bind a threaded Unix socket server answering frames with `dispatch`.
+
+    A socket left behind by a crashed process is replaced; a live one raises
+    `ConfigError` instead of being stolen. `what` names the server in errors.
+    """
+
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        raise ConfigError(f"The {what} needs Unix domain socket support")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()  # stale socket left by a crashed server
+        else:
+            raise ConfigError(f"A {what} is already listening on {path}")
+        finally:
+            probe.close()
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self) -> None:
+            serve_frames(self.request, dispatch)
+
+    server = socketserver.ThreadingUnixStreamServer(str(path), Handler)
+    server.daemon_threads = True
+    os.chmod(path, 0o600)  # same-user clients only
+    return server
+
+
+class ModelClient:
+    """Thin client of `lazy-ptt model-server` over its Unix domain socket.
+
+    Connections are pooled and reused, so concurrent callers (e.g. API
+    request threads) each hold their own connection while the server batches
+    their requests onto the single model.
+    """
+
+    def __init__(self, socket_path: Path, timeout: Optional[float] = 300.0) -> None:
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._idle: List[socket.socket] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        if not hasattr(socket, "AF_UNIX"):
+            raise RemoteModelError("Unix domain sockets are not available on this platform")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.socket_path))
+        except OSError as exc:
+            sock.close()
+            raise RemoteModelError(
+                f"Model server not reachable at {self.socket_path}: {exc}"
+            ) from exc
+        return sock
+
+    def request(self, header: Dict[str, Any], payload: bytes = b"") -> Dict[str, Any]:
+        with self._lock:
+            sock = self._idle.pop() if self._idle else None
+        if sock is None:
+            sock = self._connect()
+        try:
+            send_frame(sock, header, payload)
+            reply, _ = recv_frame(sock)
+        except (OSError, EOFError, ValueError) as exc:
+            sock.close()
+            raise RemoteModelError(f"Model server request failed: {exc}") from exc
+        with self._lock:
+            self._idle.append(sock)
+        if not reply.get("ok"):
+            raise RemoteModelError(reply.get("error") or "Model server error")
+        return reply
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock in idle:
+            sock.close()
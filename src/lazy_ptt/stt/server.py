@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import logging
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .batching import MicroBatcher
+from .remote import bind_unix_server
+from .whisper import TranscriptionRequest, TranscriptionResult
+
+LOGGER = logging.getLogger(__name__)
+
+SOCKET_FILENAME = "whisper.sock"
+
+
+class ModelServer:
+    """Owns the one Whisper model and serves transcriptions over a Unix socket.
+
+    Every connection gets a handler thread; its requests are funnelled
+    through a `MicroBatcher`, which groups requests arriving within
+    `max_wait_seconds` and decodes them with `transcribe_batch`. Any number
+    of API workers (or CLI processes) can connect with `WhisperTranscriber`
+    in client mode while only this process holds the model in memory.
+    """
+
+    def __init__(
+        self,
+        transcriber: Any,
+        socket_path: Path,
+        max_batch_size: int = 8,
+        max_wait_seconds: float = 0.01,
+    ) -> None:
+        self.transcriber = transcriber
+        self.socket_path = socket_path
+        self._server = bind_unix_server(socket_path, self._dispatch, "model server")
+        self.batcher: MicroBatcher[TranscriptionRequest, TranscriptionResult] = MicroBatcher(
+            transcriber.transcribe_batch,
+            max_batch_size,
+            max_wait_seconds,
+            name="lazy-ptt-model-batcher",
+        )
+
+    def serve_forever(self) -> None:
+        LOGGER.info("Model server listening on %s", self.socket_path)
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop accepting connections; call from another thread than `serve_forever`."""
+
+        self._server.shutdown()
+
+    def close(self) -> None:
+        self._server.server_close()
+        self.batcher.close()
+        self.socket_path.unlink(missing_ok=True)
+
+    def _dispatch(self, header: dict, payload: bytes) -> dict:
+        op = header.get("op")
+        if op == "ping":
+            return {"ok": True, "loaded": bool(self.transcriber.is_loaded)}
+        if op == "load":
+            self.transcriber.load()
+            return {"ok": True, "loaded": True}
+        if op == "stats":
+            return {"ok": True, "stats": self.batcher.stats.snapshot()}
+        if op == "transcribe":
+            return self._transcribe(header, payload)
+        raise ValueError(f"Unknown operation {op!r}")
+
+    def _transcribe(self, header: dict, payload: bytes) -> dict:
+        kind = header.get("kind", "samples")
+        language = header.get("language")
+        spooled = None
+        if kind == "samples":
+            audio: Any = np.frombuffer(payload, dtype=np.float32)
+        elif kind == "path":
+            audio = Path(header["path"])
+        elif kind == "wav":
+            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+                tmp.write(payload)
+            audio = spooled = Path(tmp.name)
+        else:
+            raise ValueError(f"Unknown audio kind {kind!r}")
+        request = TranscriptionRequest(audio, language, header.get("beam_size"))
+        try:
+            result = self.batcher.submit(request).result()
+        finally:
+            if spooled is not None:
+                spooled.unlink(missing_ok=True)
+        return {"ok": True, "result": asdict(result)}
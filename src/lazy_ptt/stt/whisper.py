@@ -1,17 +1,37 @@
 from __future__ import annotations
 
+import logging
 import tempfile
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-try:
+import numpy as np
+
+if TYPE_CHECKING:
     from faster_whisper import WhisperModel  # type: ignore
-except ImportError:  # pragma: no cover - handled via runtime check
-    WhisperModel = None
 
 from ..audio.recorder import AudioBuffer
+from ..audio.wav import WHISPER_SAMPLE_RATE
 from ..config import WhisperConfig
+from ..timing import timed
+from .remote import ModelClient, RemoteModelError
+
+LOGGER = logging.getLogger(__name__)
+
+# One Whisper window; longer clips need the sequential long-form decoder.
+BATCH_CLIP_SECONDS = 30.0
+# faster-whisper's defaults, passed explicitly so batched decodes apply the
+# same acceptance rules: a window is re-decoded at the next temperature when
+# its text is too repetitive or too unlikely, and dropped as silence when
+# the model says no speech and the text is unlikely.
+TEMPERATURE_FALLBACK = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOG_PROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+# Whisper's `max_initial_timestamp` of 1 s in 20 ms timestamp steps.
+MAX_INITIAL_TIMESTAMP_INDEX = 50
 
 
 @dataclass
@@ -22,31 +42,84 @@ class TranscriptionResult:
     temperature: float
 
 
+@dataclass
+class TranscriptionRequest:
+    """One item of `WhisperTranscriber.transcribe_batch`: samples or a file path."""
+
+    audio: Union[np.ndarray, Path]
+    language: Optional[str] = None
+    beam_size: Optional[int] = None  # None: `WhisperConfig.beam_size`
+
+
 class WhisperTranscriber:
-    """GPU-accelerated Whisper transcription using faster-whisper."""
+    """GPU-accelerated Whisper transcription using faster-whisper.
+
+    Safe to share between threads: the model is loaded once, and decodes are
+    serialised because a single model instance is not reentrant. With
+    `config.server_socket` set the transcriber is a thin client of
+    `lazy-ptt model-server` and never loads a model itself.
+    """
 
     def __init__(self, config: WhisperConfig) -> None:
         self.config = config
         self._model: Optional[WhisperModel] = None
+        self._load_lock = threading.Lock()
+        self._decode_lock = threading.Lock()
+        self._remote = ModelClient(config.server_socket) if config.server_socket else None
+        self._batched_decode = True  # cleared if this faster-whisper lacks the internals
 
     def _ensure_model(self) -> WhisperModel:
-        if WhisperModel is None:
-            raise RuntimeError(
-                "faster-whisper is not installed. Install it with `pip install faster-whisper` "
-                "or disable speech-to-text features."
-            )
         if self._model is None:
-            self._model = WhisperModel(
-                self.config.model_size,
-                device=self.config.device,
-                compute_type=self.config.compute_type,
-                download_root=str(self.config.download_root),
-            )
+            # Imported here, not at module level: faster-whisper pulls in
+            # CTranslate2 and tokenizers, which most commands never need.
+            try:
+                from faster_whisper import WhisperModel  # type: ignore
+            except ImportError as exc:
+                raise RuntimeError(
+                    "faster-whisper is not installed. Install it with "
+                    "`pip install faster-whisper` or disable speech-to-text features."
+                ) from exc
+            with self._load_lock:
+                if self._model is None:
+                    with timed("model_load"):
+                        self._model = WhisperModel(
+                            self.config.model_size,
+                            device=self.config.device,
+                            compute_type=self.config.compute_type,
+                            download_root=str(self.config.download_root),
+                        )
         return self._model
 
+    def load(self) -> None:
+        """Load the model now instead of on the first transcription."""
+
+        if self._remote is not None:
+            self._remote.request({"op": "load"})
+            return
+        self._ensure_model()
+
+    @property
+    def is_loaded(self) -> bool:
+        if self._remote is not None:
+            try:
+                return bool(self._remote.request({"op": "ping"}).get("loaded"))
+            except RemoteModelError:
+                return False
+        return self._model is not None
+
+    def _transcribe_remote(self, header: dict, payload: bytes = b"") -> TranscriptionResult:
+        assert self._remote is not None
+        with timed("transcribe"):
+            reply = self._remote.request({"op": "transcribe", **header}, payload)
+        return TranscriptionResult(**reply["result"])
+
     def transcribe(
         self, buffer: AudioBuffer, language: Optional[str] = None
     ) -> TranscriptionResult:
+        if self._remote is not None:
+            return self._transcribe_remote(
+                {"kind": "wav", "language": language}, buffer.wav_bytes
+            )
         model = self._ensure_model()
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
             tmp.write(buffer.wav_bytes)
@@ -54,14 +127,15 @@ class WhisperTranscriber:
             tmp_path = Path(tmp.name)
 
         try:
-            segments, info = model.transcribe(
-                str(tmp_path),
-                language=language,
-                beam_size=5,
-                vad_filter=True,
-            )
-            text_parts = [segment.text.strip() for segment in segments if segment.text.strip()]
-            transcript = " ".join(text_parts).strip()
+            with self._decode_lock, timed("transcribe"):
+                segments, info = model.transcribe(
+                    str(tmp_path), **self._decode_options(language)
+                )
+                # Segments are generated lazily; decoding happens while iterating.
+                text_parts = [
+                    segment.text.strip() for segment in segments if segment.text.strip()
+                ]
+                transcript = " ".join(text_parts).strip()
         finally:
             tmp_path.unlink(missing_ok=True)
 
@@ -72,18 +146,47 @@ class WhisperTranscriber:
             temperature=getattr(info, "temperature", 0.0),
         )
 
+    def transcribe_samples(
+        self,
+        samples: np.ndarray,
+        language: Optional[str] = None,
+        beam_size: Optional[int] = None,
+    ) -> TranscriptionResult:
+        """Transcribe 16 kHz mono float32 samples without a temp file or decoder pass.
+
+        Live previews pass `beam_size=1` (greedy) to trade accuracy for speed.
+        """
+
+        if self._remote is not None:
+            return self._transcribe_remote(
+                {"kind": "samples", "language": language, "beam_size": beam_size},
+                np.asarray(samples, dtype=np.float32).tobytes(),
+            )
+        model = self._ensure_model()
+        with self._decode_lock, timed("transcribe"):
+            segments, info = model.transcribe(samples, **self._decode_options(language, beam_size))
+            text_parts = [segment.text.strip() for segment in segments if segment.text.strip()]
+            transcript = " ".join(text_parts).strip()
+        return TranscriptionResult(
+            text=transcript,
+            language=getattr(info, "language", language),
+            duration=getattr(info, "duration", len(samples) / WHISPER_SAMPLE_RATE),
+            temperature=getattr(info, "temperature", 0.0),
+        )
+
     def transcribe_file(
         self, file_path: Path, language: Optional[str] = None
     ) -> TranscriptionResult:
+        if self._remote is not None:
+            # Same host by construction, so the server can read the file directly.
+            return self._transcribe_remote(
+                {"kind": "path", "path": str(Path(file_path).resolve()), "language": language}
+            )
         model = self._ensure_model()
-        segments, info = model.transcribe(
-            str(file_path),
-            language=language,
-            beam_size=5,
-            vad_filter=True,
-        )
-        text_parts = [segment.text.strip() for segment in segments if segment.text.strip()]
-        transcript = " ".join(text_parts).strip()
+        with self._decode_lock, timed("transcribe"):
+            segments, info = model.transcribe(str(file_path), **self._decode_options(language))
+            text_parts = [segment.text.strip() for segment in segments if segment.text.strip()]
+            transcript = " ".join(text_parts).strip()
         duration = getattr(info, "duration", 0.0)
         return TranscriptionResult(
             text=transcript,
@@ -91,3 +194,180 @@ class WhisperTranscriber:
             duration=duration,
             temperature=getattr(info, "temperature", 0.0),
         )
+
+    def _decode_options(
+        self, language: Optional[str], beam_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Options of every per-request decode; `_generate_batch` applies the same."""
+
+        return {
+            "language": language,
+            "beam_size": beam_size or self.config.beam_size,
+            "vad_filter": self.config.vad_filter,
+            "temperature": TEMPERATURE_FALLBACK,
+            "compression_ratio_threshold": COMPRESSION_RATIO_THRESHOLD,
+            "log_prob_threshold": LOG_PROB_THRESHOLD,
+            "no_speech_threshold": NO_SPEECH_THRESHOLD,
+        }
+
+    def _transcribe_request(self, request: TranscriptionRequest) -> TranscriptionResult:
+        if isinstance(request.audio, Path):
+            return self.transcribe_file(request.audio, language=request.language)
+        return self.transcribe_samples(
+            request.audio,
+            language=request.language,
+            beam_size=request.beam_size or self.config.beam_size,
+        )
+
+    def transcribe_batch(self, requests: List[TranscriptionRequest]) -> List[Any]:
+        """Transcribe several requests, decoding short clips as one batch.
+
+        Clips of at most one Whisper window with a known language are encoded
+        and decoded together, grouped by language and beam size, with the
+        same VAD and acceptance rules as a single decode; a clip that would
+        need a higher temperature is decoded on its own. Everything else
+        (long or language-detecting clips, remote mode, a lone request) takes
+        the regular per-request path, and audio is decoded from disk once.
+        Returns one `TranscriptionResult` or exception per request, in order.
+        """
+
+        results: List[Any] = [None] * len(requests)
+        loaded: Dict[int, np.ndarray] = {}
+        groups: Dict[Tuple[str, int], List[int]] = {}
+        if self._remote is None and self._batched_decode and len(requests) > 1:
+            for index, request in enumerate(requests):
+                if not request.language or self._too_long(request.audio):
+                    continue
+                key = (request.language, request.beam_size or self.config.beam_size)
+                groups.setdefault(key, []).append(index)
+        for (language, beam_size), indexes in groups.items():
+            if len(indexes) < 2:
+                continue
+            clips: List[Tuple[int, np.ndarray]] = []
+            for index in indexes:
+                try:
+                    loaded[index] = self._load_samples(requests[index].audio)
+                except Exception as exc:
+                    results[index] = exc
+                    continue
+                if not self._too_long(loaded[index]):
+                    clips.append((index, loaded[index]))
+            if len(clips) < 2:
+                continue
+            try:
+                texts = self._generate_batch([samples for _, samples in clips], language, beam_size)
+            except (ImportError, AttributeError, TypeError) as exc:
+                LOGGER.warning("Batched decoding unsupported, decoding one by one: %s", exc)
+                self._batched_decode = False
+                break
+            except Exception as exc:
+                LOGGER.warning("Batch of %d clips failed, decoding one by one: %s", len(clips), exc)
+                continue
+            for (index, samples), text in zip(clips, texts):
+                if text is None:
+                    continue  # needs the temperature fallback of a single decode
+                results[index] = TranscriptionResult(
+                    text=text,
+                    language=language,
+                    duration=samples.size / WHISPER_SAMPLE_RATE,
+                    temperature=0.0,
+                )
+        for index, request in enumerate(requests):
+            if results[index] is not None:
+                continue
+            try:
+                if index in loaded:
+                    results[index] = self.transcribe_samples(
+                        loaded[index],
+                        language=request.language,
+                        beam_size=request.beam_size or self.config.beam_size,
+                    )
+                else:
+                    results[index] = self._transcribe_request(request)
+            except Exception as exc:
+                results[index] = exc
+        return results
+
+    @staticmethod
+    def _too_long(audio: Union[np.ndarray, Path]) -> bool:
+        # Paths are only measured once decoded.
+        if isinstance(audio, Path):
+            return False
+        return np.size(audio) > BATCH_CLIP_SECONDS * WHISPER_SAMPLE_RATE
+
+    def _load_samples(self, audio: Union[np.ndarray, Path]) -> np.ndarray:
+        if not isinstance(audio, Path):
+            return np.asarray(audio, dtype=np.float32)
+        try:
+            from faster_whisper import decode_audio  # type: ignore
+        except ImportError as exc:
+            raise RuntimeError("faster-whisper is not installed") from exc
+        return decode_audio(str(audio), sampling_rate=WHISPER_SAMPLE_RATE)
+
+    def _generate_batch(
+        self, clips: List[np.ndarray], language: str, beam_size: int
+    ) -> List[Optional[str]]:
+        """Encode and decode up-to-30 s clips in one CTranslate2 call.
+
+        Applies `_decode_options` by hand: the VAD filter trims each clip
+        first, and a clip whose temperature-0 result `model.transcribe` would
+        re-decode at a higher temperature comes back as None.
+        """
+
+        from faster_whisper.audio import pad_or_trim  # type: ignore
+        from faster_whisper.tokenizer import Tokenizer  # type: ignore
+        from faster_whisper.transcribe import (  # type: ignore
+            get_compression_ratio,
+            get_suppressed_tokens,
+        )
+
+        model = self._ensure_model()
+        if self.config.vad_filter:
+            clips = [_speech_only(clip) for clip in clips]
+        texts: List[Optional[str]] = ["" for _ in clips]  # no speech, as after `vad_filter`
+        speech = [index for index, clip in enumerate(clips) if clip.size]
+        if not speech:
+            return texts
+        features = np.stack([pad_or_trim(model.feature_extractor(clips[i])) for i in speech])
+        tokenizer = Tokenizer(
+            model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=language
+        )
+        prompt = model.get_prompt(tokenizer, [])
+        with self._decode_lock, timed("transcribe"):
+            encoder_output = model.encode(features)
+            outputs = model.model.generate(
+                encoder_output,
+                [prompt] * len(speech),
+                beam_size=beam_size,
+                max_length=model.max_length,
+                return_scores=True,
+                return_no_speech_prob=True,
+                suppress_blank=True,
+                suppress_tokens=get_suppressed_tokens(tokenizer, [-1]),
+                max_initial_timestamp_index=MAX_INITIAL_TIMESTAMP_INDEX,
+            )
+        for index, output in zip(speech, outputs):
+            tokens = output.sequences_ids[0]
+            text = tokenizer.decode(tokens).strip()  # drops timestamp tokens
+            avg_logprob = output.scores[0] * len(tokens) / (len(tokens) + 1)
+            if output.no_speech_prob > NO_SPEECH_THRESHOLD and avg_logprob < LOG_PROB_THRESHOLD:
+                continue  # silence: the single decode skips the window
+            if (
+                get_compression_ratio(text) > COMPRESSION_RATIO_THRESHOLD
+                or avg_logprob < LOG_PROB_THRESHOLD
+            ):
+                texts[index] = None
+            else:
+                texts[index] = text
+        return texts
+
+
+def _speech_only(samples: np.ndarray) -> np.ndarray:
+    """`samples` reduced to the speech `vad_filter` keeps (default VAD options)."""
+
+    from faster_whisper.vad import VadOptions, get_speech_timestamps  # type: ignore
+
+    chunks = get_speech_timestamps(samples, VadOptions())
+    if not chunks:
+        return samples[:0]
+    return np.concatenate([samples[chunk["start"]:chunk["end"]] for chunk in chunks])
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+
+# Structured (one JSON object per line) timing records go to their own logger
+# so they can be routed or silenced independently of the human-readable logs.
+TIMINGS_LOGGER = logging.getLogger("lazy_ptt.timings")
+LOGGER = logging.getLogger(__name__)
+
+TimingSink = Callable[[Dict[str, Any]], None]
+_SINKS: List[TimingSink] = []
+
+# Canonical display order; unknown stages are listed after these.
+STAGE_ORDER = (
+    "record",
+    "encode",
+    "model_load",
+    "stt_queue",
+    "transcribe",
+    "compact",
+    "enhance_request",
+    "json_parse",
+    "render",
+    "storage_write",
+    "index",
+    "relocate",
+)
+
+_CURRENT: ContextVar[Optional["StageTimer"]] = ContextVar("lazy_ptt_stage_timer", default=None)
+
+
+class StageTimer:
+    """Accumulates monotonic wall-clock time per named pipeline stage."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._stages[stage] = self._stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations in milliseconds, in pipeline order."""
+
+        with self._lock:
+            stages = dict(self._stages)
+        ordered = [name for name in STAGE_ORDER if name in stages]
+        ordered += [name for name in stages if name not in STAGE_ORDER]
+        return {name: round(stages[name] * 1000.0, 3) for name in ordered}
+
+
+def current_timer() -> Optional[StageTimer]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def collect_timings(timer: Optional[StageTimer] = None) -> Iterator[StageTimer]:
+    """Make a timer current for the enclosed block.
+
+    Without an explicit `timer`, an already active timer is reused so nested
+    service calls add to the same record; otherwise a fresh one is started.
+    """
+
+    active = _CURRENT.get()
+    if timer is None and active is not None:
+        yield active
+        return
+    timer = timer or StageTimer()
+    token = _CURRENT.set(timer)
+    try:
+        yield timer
+    finally:
+        _CURRENT.reset(token)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Time the enclosed block as `stage` on the current timer, if any."""
+
+    timer = _CURRENT.get()
+    if timer is None:
+        yield
+        return
+    with timer.stage(stage):
+        yield
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    timer = _CURRENT.get()
+    if timer is not None:
+        timer.add(stage, seconds)
+
+
+def add_timing_sink(sink: TimingSink) -> None:
+    """Also hand every timing record to `sink` (e.g. a persistent history)."""
+
+    if sink not in _SINKS:
+        _SINKS.append(sink)
+
+
+def remove_timing_sink(sink: TimingSink) -> None:
+    if sink in _SINKS:
+        _SINKS.remove(sink)
+
+
+def log_timings(event: str, timings: Mapping[str, float], **fields: Any) -> None:
+    """Emit one JSON line describing where a pipeline run spent its time."""
+
+    log_enabled = TIMINGS_LOGGER.isEnabledFor(logging.INFO)
+    if not log_enabled and not _SINKS:
+        return
+    record = {
+        "ts": round(time.time(), 3),
+        "event": event,
+        "total_ms": round(sum(timings.values()), 3),
+        "stages_ms": dict(timings),
+        **fields,
+    }
+    for sink in list(_SINKS):
+        try:
+            sink(record)
+        except Exception as exc:  # timing output must never fail a capture cycle
+            LOGGER.warning("Timing sink %r failed: %s", sink, exc)
+    if log_enabled:
+        TIMINGS_LOGGER.info(json.dumps(record, default=str))
+
+
+def format_timings(timings: Mapping[str, float]) -> str:
+    if not timings:
+        return "  (no timings recorded)"
+    width = max(len(name) for name in timings)
+    lines = [f"  {name:<{width}}  {ms:10.1f} ms" for name, ms in timings.items()]
+    lines.append(f"  {'total':<{width}}  {sum(timings.values()):10.1f} ms")
+    return "\n".join(lines)
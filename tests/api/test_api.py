@@ -1,11 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import io
+import json
+import struct
+import threading
+import time
+import tracemalloc
+import wave
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Optional
 
+import pytest
 from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
 
-from lazy_ptt.api.server import build_app
+from lazy_ptt.api.live import StablePrefix
+from lazy_ptt.api.server import ServiceHolder, build_app
+from lazy_ptt.api.uploads import UPLOAD_CHUNK_BYTES, UploadLimitMiddleware, receive_audio
+from lazy_ptt import timing
+from lazy_ptt.config import ApiConfig, ConfigError
 
 
 class _FakeSaved:
@@ -51,6 +66,16 @@ class _FakeService:
     ):
         return _FakeOutcome("from-audio")
 
+    def amend_text(
+        self,
+        text: str,
+        prompt_path: Optional[Path] = None,
+        story_id: Optional[str] = None,
+        story_title: Optional[str] = None,
+        auto_move: bool = False,
+    ):
+        return _FakeOutcome(text)
+
 
 def _fake_factory():
     return _FakeService()
@@ -79,3 +104,643 @@ def test_process_audio_endpoint(tmp_path):
     assert resp.status_code == 200
     body = resp.json()
     assert body["summary"].startswith("Summary")
+
+
+def test_amend_endpoint():
+    app = build_app(service_factory=_fake_factory)
+    client = TestClient(app)
+    resp = client.post("/amend", json={"story_id": "US-1", "text": "also add logout"})
+    assert resp.status_code == 200
+    assert resp.json()["transcription_text"] == "also add logout"
+
+
+def test_metrics_endpoint_counts_requests_and_timings():
+    app = build_app(service_factory=_fake_factory)
+    client = TestClient(app)
+    client.post("/enhance-text", json={"text": "hello world"})
+    app.state.metrics.observe_timings(
+        {"event": "enhance_text", "total_ms": 250.0, "stages_ms": {"model_load": 200.0}}
+    )
+
+    resp = client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert (
+        'lazy_ptt_http_requests_total{method="POST",route="/enhance-text",status="200"} 1'
+        in body
+    )
+    assert 'lazy_ptt_stage_duration_seconds_bucket{stage="model_load",le="0.25"} 1' in body
+    assert "lazy_ptt_model_loads_total 1" in body
+    assert "lazy_ptt_http_requests_in_flight 1" in body  # the /metrics request itself
+
+
+def test_ready_reflects_model_state():
+    class _Transcriber:
+        is_loaded = False
+
+    service = _FakeService()
+    service.transcriber = _Transcriber()
+    client = TestClient(build_app(service_factory=lambda: service))
+
+    assert client.get("/ready").status_code == 503
+    service.transcriber.is_loaded = True
+    resp = client.get("/ready")
+    assert resp.status_code == 200 and resp.json()["model_loaded"] is True
+
+
+def test_model_preload_counts_as_a_model_load():
+    class _Transcriber:
+        is_loaded = False
+
+        def load(self):
+            self.is_loaded = True
+
+    service = _FakeService()
+    service.transcriber = _Transcriber()
+    app = build_app(service_factory=lambda: service)
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 5.0
+        while "lazy_ptt_model_loads_total 1" not in client.get("/metrics").text:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert "lazy_ptt_model_loaded 1" in client.get("/metrics").text
+
+
+def test_job_status_reports_a_misconfigured_server_as_bad_request():
+    def factory():
+        raise ConfigError("OPENAI_API_KEY is not set")
+
+    client = TestClient(build_app(service_factory=factory))
+
+    resp = client.get("/jobs/missing")
+
+    assert resp.status_code == 400
+    assert "OPENAI_API_KEY" in resp.json()["detail"]
+
+
+def test_service_is_shared_and_reloadable():
+    built = []
+
+    def factory():
+        built.append(_FakeService())
+        return built[-1]
+
+    app = build_app(service_factory=factory)
+    with TestClient(app, client=("127.0.0.1", 50000)) as client:  # runs the lifespan hook
+        assert len(built) == 1
+        for _ in range(3):
+            assert client.post("/enhance-text", json={"text": "hi"}).status_code == 200
+        assert len(built) == 1
+
+        resp = client.post("/admin/reload")
+        assert resp.status_code == 200 and resp.json()["generation"] == 2
+        assert len(built) == 2
+        assert app.state.services.get() is built[-1]
+
+
+def test_admin_reload_is_local_only():
+    built = []
+
+    def factory():
+        built.append(_FakeService())
+        return built[-1]
+
+    app = build_app(service_factory=factory)
+    client = TestClient(app, client=("203.0.113.7", 50000))
+    current = app.state.services.get()
+
+    resp = client.post("/admin/reload")
+
+    assert resp.status_code == 403
+    assert app.state.services.get() is current and len(built) == 1
+
+
+class _ConfigurableService(_FakeService):
+    def __init__(self) -> None:
+        self.model = "small"
+
+    def apply_config(self, config):
+        self.model = config
+
+
+def test_config_changes_are_swapped_in_as_a_new_service():
+    edits = ["medium"]
+    watcher = SimpleNamespace(poll=lambda: edits.pop() if edits else None)
+    holder = ServiceHolder(_ConfigurableService, watcher)
+    first = holder._factory()
+    holder._service = first
+
+    current = holder.get()
+
+    assert current is not first and current.model == "medium"
+    assert first.model == "small"  # requests already running keep a consistent view
+    assert holder.get() is current
+
+
+def test_timing_sink_lives_with_the_app_lifespan():
+    app = build_app(service_factory=_FakeService)
+    sink = app.state.metrics.observe_timings
+    assert sink not in timing._SINKS
+    with TestClient(app):
+        assert sink in timing._SINKS
+    assert sink not in timing._SINKS
+
+
+class _JobService(_FakeService):
+    def __init__(self, config) -> None:
+        self.config = config
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def transcribe_file(self, path: Path):
+        self.started.set()
+        self.release.wait(5)
+        return _FakeTranscription(f"from-{path.suffix}")
+
+    def complete_transcription(self, transcription, **_options):
+        return _FakeOutcome(transcription.text)
+
+
+def test_jobs_run_async_and_long_poll():
+    service = _JobService(SimpleNamespace(api=ApiConfig()))
+    service.release.set()
+    client = TestClient(build_app(service_factory=lambda: service))
+
+    resp = client.post("/jobs", files={"audio": ("clip.wav", b"RIFF", "audio/wav")})
+    assert resp.status_code == 202
+    job_id = resp.json()["job_id"]
+    assert resp.headers["location"] == f"/jobs/{job_id}"
+
+    body = client.get(f"/jobs/{job_id}", params={"wait": 5}).json()
+    assert body["status"] == "succeeded"
+    assert body["result"]["transcription_text"] == "from-.wav"
+    assert client.get("/jobs/missing").status_code == 404
+
+
+def test_jobs_reject_with_retry_after_when_queue_full():
+    service = _JobService(SimpleNamespace(api=ApiConfig(max_queued_jobs=1, stt_workers=1)))
+    client = TestClient(build_app(service_factory=lambda: service))
+    upload = {"audio": ("clip.wav", b"RIFF", "audio/wav")}
+    try:
+        assert client.post("/jobs", files=upload).status_code == 202
+        assert service.started.wait(5)  # first job is now on the STT worker
+        assert client.post("/jobs", files=upload).status_code == 202  # fills the queue
+
+        resp = client.post("/jobs", files=upload)
+        assert resp.status_code == 429
+        assert int(resp.headers["retry-after"]) >= 1
+    finally:
+        service.release.set()
+
+
+class _UploadService(_FakeService):
+    def __init__(self, max_upload_bytes: int = 1 << 20) -> None:
+        self.config = SimpleNamespace(api=ApiConfig(max_upload_bytes=max_upload_bytes))
+        self.samples = None
+        self.files = []
+
+    def process_audio_samples(self, samples, **_options):
+        self.samples = samples
+        return _FakeOutcome("from-samples")
+
+    def process_audio_file(self, path: Path, **_options):
+        self.files.append((path.suffix, path.read_bytes()[:4]))
+        return _FakeOutcome("from-file")
+
+
+def _pcm_wav(rate: int, frames: int = 1600) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(rate)
+        handle.writeframes(b"\x00\x10" * frames)
+    return buffer.getvalue()
+
+
+def test_process_audio_streams_native_wav_as_samples():
+    service = _UploadService()
+    client = TestClient(build_app(service_factory=lambda: service))
+
+    resp = client.post(
+        "/process-audio", content=_pcm_wav(16000), headers={"Content-Type": "audio/wav"}
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["transcription_text"] == "from-samples"
+    assert service.samples.shape == (1600,) and not service.files
+
+
+def test_process_audio_spools_other_formats_and_enforces_limit():
+    service = _UploadService(max_upload_bytes=8 * 1024)
+    client = TestClient(build_app(service_factory=lambda: service))
+
+    resp = client.post(
+        "/process-audio", files={"audio": ("clip.wav", _pcm_wav(8000), "audio/wav")}
+    )
+    assert resp.json()["transcription_text"] == "from-file"
+    assert service.files == [(".wav", b"RIFF")]
+
+    too_big = _pcm_wav(16000, frames=16000)
+    assert client.post(
+        "/process-audio", files={"audio": ("big.wav", too_big, "audio/wav")}
+    ).status_code == 413
+    assert client.post(
+        "/process-audio", content=too_big, headers={"Content-Type": "audio/wav"}
+    ).status_code == 413
+
+
+def test_upload_limit_is_applied_before_the_body_is_parsed():
+    received = []
+
+    async def app(scope, receive, send):
+        while True:
+            message = await receive()
+            received.append(message)
+            if not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 400, "headers": []})
+        await send({"type": "http.response.body", "body": b"bad multipart"})
+
+    async def run(headers):
+        chunks = [
+            {"type": "http.request", "body": b"x" * 8, "more_body": index < 3}
+            for index in range(4)
+        ]
+        sent = []
+
+        async def receive():
+            return chunks.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "POST", "headers": headers}
+        await UploadLimitMiddleware(app, limit=lambda: 12)(scope, receive, send)
+        return sent
+
+    declared = asyncio.run(run([(b"content-length", b"32")]))
+    assert declared[0]["status"] == 413 and received == []
+
+    chunked = asyncio.run(run([]))
+    assert [message.get("status") for message in chunked] == [413, None]
+    assert b"12 byte limit" in chunked[1]["body"]
+    assert len(received) == 1  # the second chunk crossed the limit and was never delivered
+
+
+def test_lying_wav_header_does_not_allocate_the_claimed_size():
+    wav = bytearray(_pcm_wav(16000, frames=128))
+    struct.pack_into("<I", wav, 40, 0xFFFFFFF0)  # `data` chunk size
+
+    async def chunks():
+        yield bytes(wav)
+
+    received = asyncio.run(receive_audio(chunks(), max_bytes=1 << 20))
+    assert received.samples is not None and received.samples.size == 128
+
+
+@pytest.mark.parametrize("declared_size", [True, False])
+def test_decoded_upload_memory_is_bounded_by_the_upload_cap(declared_size):
+    cap = 16 << 20
+    wav = bytearray(_pcm_wav(16000, frames=(cap - 44) // 2))
+    if not declared_size:
+        struct.pack_into("<I", wav, 40, 0xFFFFFFFF)  # streamed WAV: size left unset
+    body = bytes(wav)
+
+    async def chunks():
+        for start in range(0, len(body), UPLOAD_CHUNK_BYTES):
+            yield body[start : start + UPLOAD_CHUNK_BYTES]
+
+    tracemalloc.start()
+    try:
+        received = asyncio.run(receive_audio(chunks(), max_bytes=cap))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert received.samples is not None and received.samples.size == (cap - 44) // 2
+    # float32 samples for the whole clip, plus a few chunk-sized buffers in flight.
+    assert peak <= 2 * cap + 8 * UPLOAD_CHUNK_BYTES
+
+
+class _LiveService(_FakeService):
+    def __init__(self) -> None:
+        self.config = SimpleNamespace(
+            api=ApiConfig(live_partial_seconds=0.05),
+            ptt=SimpleNamespace(max_record_seconds=10),
+        )
+        self.previews = 0
+        self.options = None
+
+    def preview_samples(self, samples):
+        self.previews += 1
+        return "hello world"[: 5 * self.previews + 1]
+
+    def transcribe_samples(self, samples):
+        return _FakeTranscription(f"{samples.size} samples")
+
+    def complete_transcription(self, transcription, **options):
+        self.options = options
+        return _FakeOutcome(transcription.text)
+
+
+def test_ws_listen_streams_partials_then_result():
+    service = _LiveService()
+    client = TestClient(build_app(service_factory=lambda: service))
+    frame = b"\x00\x10" * 1600  # 100 ms of 16 kHz PCM16
+
+    with client.websocket_connect("/ws/listen") as ws:
+        ws.send_json({"type": "start", "story_id": "US-7", "sample_rate": 16000})
+        for _ in range(3):
+            ws.send_bytes(frame)
+        ws.send_json({"type": "end"})
+        messages = []
+        while not messages or messages[-1]["type"] != "result":
+            messages.append(ws.receive_json())
+
+    partials = [m for m in messages if m["type"] == "partial"]
+    assert partials and set(partials[0]) == {"type", "stable", "unstable"}
+    assert messages[-1]["transcription_text"] == "4800 samples"
+    assert messages[-1]["story_id"] == "US-1"
+    assert service.options == {"story_id": "US-7"}
+
+
+def test_ws_listen_rejects_unsupported_sample_rate():
+    client = TestClient(build_app(service_factory=lambda: _LiveService()))
+
+    with client.websocket_connect("/ws/listen") as ws:
+        ws.send_json({"type": "start", "sample_rate": 44100})
+        assert ws.receive_json() == {
+            "type": "error",
+            "detail": "Only 16000 Hz PCM16 is supported",
+        }
+
+
+def test_ws_listen_rejects_invalid_start_options():
+    client = TestClient(build_app(service_factory=lambda: _LiveService()))
+    cases = [
+        ({"story": "US-7"}, "Unknown start option(s): story"),
+        ({"story_id": 7}, "story_id must be a non-empty string"),
+        ({"auto_move": "yes"}, "auto_move must be true or false"),
+        ({"sample_rate": True}, "Only 16000 Hz PCM16 is supported"),
+    ]
+
+    for options, detail in cases:
+        with client.websocket_connect("/ws/listen") as ws:
+            ws.send_json({"type": "start", **options})
+            assert ws.receive_json() == {"type": "error", "detail": detail}
+            with pytest.raises(WebSocketDisconnect) as closed:
+                ws.receive_json()
+        assert closed.value.code == 1003
+
+
+class _WindowedLiveService(_LiveService):
+    def __init__(self) -> None:
+        super().__init__()
+        self.preview_sizes = []
+
+    def preview_samples(self, samples):
+        self.preview_sizes.append(samples.size)
+        return f"w{len(self.preview_sizes)}"
+
+
+def test_live_partials_decode_a_bounded_window():
+    service = _WindowedLiveService()
+    service.config.api = ApiConfig(live_partial_seconds=0.05, live_window_seconds=0.25)
+    client = TestClient(build_app(service_factory=lambda: service))
+    frame = b"\x00\x10" * 1600  # 100 ms of 16 kHz PCM16
+
+    with client.websocket_connect("/ws/listen") as ws:
+        partials = []
+        for _ in range(12):
+            ws.send_bytes(frame)
+            partials.append(ws.receive_json())  # every preview text differs
+        ws.send_json({"type": "end"})
+        result = ws.receive_json()
+
+    assert len(service.preview_sizes) == 12
+    assert max(service.preview_sizes) <= 4000
+    # Text shown before the window moved on stays, now as stable words.
+    assert partials[2] == {"type": "partial", "stable": "w2", "unstable": "w3"}
+    assert partials[-1]["stable"].startswith("w2 ")
+    assert result["transcription_text"] == "19200 samples"
+
+
+class _OfflineLiveService(_LiveService):
+    def complete_transcription(self, transcription, **options):
+        raise ConnectionError("OpenAI unavailable")
+
+
+def test_ws_listen_reports_unexpected_failures():
+    client = TestClient(build_app(service_factory=_OfflineLiveService))
+
+    with client.websocket_connect("/ws/listen") as ws:
+        ws.send_json({"type": "start", "sample_rate": "fast"})
+        assert ws.receive_json()["detail"] == "Only 16000 Hz PCM16 is supported"
+
+    with client.websocket_connect("/ws/listen") as ws:
+        ws.send_bytes(b"\x00\x10" * 1600)
+        ws.send_json({"type": "end"})
+        message = ws.receive_json()
+        while message["type"] == "partial":
+            message = ws.receive_json()
+        assert message == {
+            "type": "error",
+            "detail": "OpenAI unavailable",
+            "error_type": "ConnectionError",
+        }
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 1011
+
+
+def test_stable_prefix_only_commits_agreed_words():
+    prefix = StablePrefix()
+    assert prefix.update("add a") == ("", "add a")
+    assert prefix.update("add an endpoint") == ("add", "an endpoint")
+    assert prefix.update("add an endpoint for") == ("add an endpoint", "for")
+    # A hypothesis that diverges inside the stable words keeps them and sends
+    # the tail from the point of divergence.
+    assert prefix.update("add a") == ("add an endpoint", "a")
+    assert prefix.update("add a") == ("add an endpoint", "a")
+
+
+def test_stable_prefix_seal_commits_the_shown_text():
+    prefix = StablePrefix()
+    prefix.update("fix the")
+    assert prefix.update("fix the login") == ("fix the", "login")
+    prefix.seal()
+    assert prefix.update("page") == ("fix the login", "page")
+    assert prefix.update("page redirect") == ("fix the login page", "redirect")
+
+
+class _StreamingService(_FakeService):
+    def enhance_text(self, text: str, on_progress=None, **_options):
+        on_progress("transcription", {"text": text, "brief": text})
+        on_progress("summary", {"summary": f"Summary for {text}"})
+        on_progress("section", {"index": 0, "title": "Plan", "content": "Do it."})
+        return _FakeOutcome(text)
+
+
+def test_enhance_text_stream_emits_progress_events():
+    client = TestClient(build_app(service_factory=_StreamingService))
+
+    with client.stream("POST", "/enhance-text/stream", json={"text": "Add SSE"}) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        body = "".join(resp.iter_text())
+
+    events = [block.split("\n") for block in body.strip().split("\n\n")]
+    names = [lines[0].removeprefix("event: ") for lines in events]
+    assert names == ["accepted", "transcription", "summary", "section", "stored"]
+    stored = json.loads(events[-1][1].removeprefix("data: "))
+    assert stored["transcription_text"] == "Add SSE"
+
+
+def test_enhance_text_stream_reports_errors_as_events():
+    client = TestClient(build_app(service_factory=_FakeService))
+
+    resp = client.post("/enhance-text/stream", json={"text": "Add SSE"})
+
+    assert resp.status_code == 200
+    assert "event: error" in resp.text
+
+
+class _CountingService(_FakeService):
+    def __init__(self) -> None:
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def enhance_text(self, text: str, **_options):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return _FakeOutcome(text)
+
+
+def test_identical_concurrent_requests_share_one_run():
+    service = _CountingService()
+    app = build_app(service_factory=lambda: service)
+    results = []
+
+    with TestClient(app) as client:
+
+        def post() -> None:
+            results.append(client.post("/enhance-text", json={"text": "Same brief"}))
+
+        first = threading.Thread(target=post)
+        first.start()
+        assert service.started.wait(5)
+        second = threading.Thread(target=post)
+        second.start()
+        second.join(0.3)  # let the duplicate join the in-flight call
+        service.release.set()
+        first.join(5)
+        second.join(5)
+
+    assert service.calls == 1
+    assert [r.status_code for r in results] == [200, 200]
+    assert sorted(r.headers.get("X-Coalesced", "") for r in results) == ["", "true"]
+    assert app.state.metrics.coalesced_requests.value(route="/enhance-text") == 1
+
+
+def test_idempotency_key_replays_and_rejects_mismatches():
+    service = _CountingService()
+    service.release.set()
+    client = TestClient(build_app(service_factory=lambda: service))
+    headers = {"Idempotency-Key": "abc-123"}
+
+    first = client.post("/enhance-text", json={"text": "Brief"}, headers=headers)
+    again = client.post("/enhance-text", json={"text": "Brief"}, headers=headers)
+    other = client.post("/enhance-text", json={"text": "Other"}, headers=headers)
+
+    assert service.calls == 1
+    assert again.json() == first.json()
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert other.status_code == 422
+
+
+class _BatchService(_FakeService):
+    def __init__(self) -> None:
+        self.config = SimpleNamespace(
+            api=ApiConfig(batch_max_items=3), openai=SimpleNamespace(max_concurrency=3)
+        )
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def enhance_text(self, text: str, **_options):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            if text == "bad":
+                raise ConfigError("Cannot enhance this")
+            self.barrier.wait()  # both good briefs must be in flight together
+            outcome = _FakeOutcome(text)
+            outcome.timings = {"enhance_request": 12.5}
+            return outcome
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_enhance_text_batch_runs_concurrently_with_per_item_errors():
+    service = _BatchService()
+    client = TestClient(build_app(service_factory=lambda: service))
+
+    resp = client.post(
+        "/enhance-text/batch",
+        json={"items": [{"text": "first"}, {"text": "bad"}, {"text": "third"}]},
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["succeeded"], body["failed"]) == (2, 1)
+    results = body["results"]
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert results[0]["result"]["transcription_text"] == "first"
+    assert results[0]["timings"] == {"enhance_request": 12.5}
+    assert results[1] == {
+        "index": 1,
+        "ok": False,
+        "status_code": 400,
+        "result": None,
+        "error": "Cannot enhance this",
+        "timings": {},
+    }
+    assert service.peak >= 2
+
+    too_many = client.post("/enhance-text/batch", json={"items": [{"text": "x"}] * 4})
+    assert too_many.status_code == 413
+
+
+def test_prompt_listing_and_search_endpoints(tmp_path):
+    from lazy_ptt.prompt.enhancer import draft_prompt
+    from lazy_ptt.prompt.index import PromptIndex
+    from lazy_ptt.prompt.manager import PromptStorage
+
+    storage = PromptStorage(
+        tmp_path, "{story_id}.md", "meta.json", index=PromptIndex(tmp_path / "index.sqlite3")
+    )
+    for number in range(3):
+        storage.save(draft_prompt(f"Export invoices batch {number}"), story_id=f"US-{number}")
+    storage.save(draft_prompt("Add a login page"), story_id="US-9")
+    service = _FakeService()
+    service.storage = storage
+    client = TestClient(build_app(service_factory=lambda: service))
+
+    listed = client.get("/prompts", params={"limit": 3}).json()
+    assert (listed["total"], len(listed["items"]), listed["next_offset"]) == (4, 3, 3)
+
+    found = client.get("/prompts/search", params={"q": "invoices", "offset": 1}).json()
+    assert (found["total"], len(found["items"]), found["next_offset"]) == (3, 2, None)
+    assert "[invoices]" in found["items"][0]["snippet"]
+    assert client.get("/prompts/search").status_code == 422
+
+    service.storage = PromptStorage(tmp_path / "plain", "{story_id}.md", "meta.json")
+    assert client.get("/prompts").status_code == 404
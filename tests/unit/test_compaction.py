@@ -0,0 +1,24 @@
+from lazy_ptt.prompt.compaction import collapse_repeats, compact_transcript
+
+
+def test_compaction_removes_fillers_and_repeats() -> None:
+    result = compact_transcript("Um, so I want I want to add, uh, OAuth login to the the API.")
+
+    assert result.text == "So I want to add OAuth login to the API."
+    assert result.compacted_chars < result.original_chars
+    assert result.saved_tokens > 0
+
+
+def test_compaction_keeps_meaningful_words() -> None:
+    result = compact_transcript("Add umbrella support so I mean the API stays fast")
+
+    assert result.text == "Add umbrella support so I mean the API stays fast"
+    assert result.saved_chars == 0
+
+
+def test_collapse_repeats_prefers_longest_phrase() -> None:
+    assert collapse_repeats("we need to we need to ship it it") == "we need to ship it"
+
+
+def test_compaction_never_returns_empty_text() -> None:
+    assert compact_transcript("uh um").text == "uh um"
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import dataclasses
+import os
+
+import pytest
+
+from lazy_ptt.config import ConfigWatcher, diff_config, load_config
+
+
+@pytest.fixture()
+def config_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "lazy-ptt.yaml"
+    path.write_text("whisper:\n  beam_size: 3\n", encoding="utf-8")
+    return path
+
+
+def _rewrite(path, text):
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_load_config_is_cached_until_a_source_changes(config_file, monkeypatch):
+    first = load_config(config_file)
+    assert load_config(config_file) is first
+    assert first.whisper.beam_size == 3
+
+    _rewrite(config_file, "whisper:\n  beam_size: 1\n")
+    edited = load_config(config_file)
+    assert edited is not first
+    assert edited.whisper.beam_size == 1
+
+    monkeypatch.setenv("PTT_WHISPER_VAD_FILTER", "false")
+    assert load_config(config_file).whisper.vad_filter is False
+
+
+def test_diff_config_lists_changed_fields(config_file):
+    config = load_config(config_file)
+    edited = dataclasses.replace(
+        config, openai=dataclasses.replace(config.openai, temperature=0.9)
+    )
+
+    assert diff_config(config, config) == {}
+    assert diff_config(config, edited) == {
+        "openai.temperature": (config.openai.temperature, 0.9)
+    }
+
+
+def test_config_watcher_reports_edits_once(config_file):
+    watcher = ConfigWatcher(config_file, interval_seconds=0)
+    assert watcher.poll() is None  # baseline
+    assert watcher.poll() is None
+
+    _rewrite(config_file, "whisper:\n  beam_size: 2\n")
+    changed = watcher.poll()
+    assert changed is not None and changed.whisper.beam_size == 2
+    assert watcher.poll() is None
+
+    _rewrite(config_file, "whisper: [not, a, mapping\n")
+    assert watcher.poll() is None
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from lazy_ptt.cli import main
+from lazy_ptt.config import ConfigError
+from lazy_ptt.services.control import ControlServer, DaemonClient, DaemonError
+from lazy_ptt.services.workspaces import ServiceRef
+
+
+class _FakeService:
+    def __init__(self) -> None:
+        self.transcriber = SimpleNamespace(is_loaded=True)
+        self.calls = []
+
+    def _outcome(self, story_id):
+        return SimpleNamespace(
+            saved_prompt=SimpleNamespace(
+                prompt_path=Path(f"/prompts/{story_id}.md"), story_id=story_id, revision=2
+            ),
+            enhanced=SimpleNamespace(work_type="FEATURE", summary="Summary"),
+            compaction=None,
+            timings={"transcribe": 12.5},
+        )
+
+    def enhance_text(self, text, story_id=None, story_title=None, auto_move=False):
+        self.calls.append(("enhance_text", text, auto_move))
+        if not text.strip():
+            raise ConfigError("Cannot enhance empty text")
+        return self._outcome(story_id or "STORY-1")
+
+    def process_audio_file(self, path, story_id=None, story_title=None, auto_move=False):
+        self.calls.append(("process_audio", path, auto_move))
+        raise RuntimeError("decoder crashed")
+
+
+@pytest.fixture()
+def control(tmp_path):
+    service = _FakeService()
+    server = ControlServer(service, tmp_path / "daemon.sock")
+    server.start()
+    yield server, service
+    server.stop()
+
+
+def test_daemon_client_forwards_commands_and_errors(control):
+    server, service = control
+    client = DaemonClient.connect(server.socket_path)
+    assert client is not None
+
+    outcome = client.enhance_text("Add a login page", story_id="STORY-7", auto_move=True)
+    assert outcome.saved_prompt.prompt_path == Path("/prompts/STORY-7.md")
+    assert outcome.saved_prompt.revision == 2
+    assert outcome.enhanced.work_type == "FEATURE"
+    assert outcome.timings == {"transcribe": 12.5}
+    assert service.calls[0] == ("enhance_text", "Add a login page", True)
+
+    with pytest.raises(ConfigError, match="^Cannot enhance empty text$"):
+        client.enhance_text("  ")
+    with pytest.raises(DaemonError, match="RuntimeError: decoder crashed"):
+        client.process_audio_file(Path("note.wav"))
+    assert service.calls[-1][1] == Path("note.wav").resolve()
+    client.close()
+
+    server.stop()
+    assert not server.socket_path.exists()
+    assert DaemonClient.connect(server.socket_path) is None
+
+
+class _ConfigurableService(_FakeService):
+    label = "started"
+
+    def apply_config(self, config):
+        self.label = config
+        self.calls = []
+        return SimpleNamespace(applied=["label"], restart_required=[])
+
+    def enhance_text(self, text, story_id=None, story_title=None, auto_move=False):
+        return super().enhance_text(text, story_id=self.label)
+
+
+def test_control_requests_see_the_service_swapped_in_by_a_config_change(tmp_path):
+    started = _ConfigurableService()
+    services = ServiceRef(started)
+    server = ControlServer(services, tmp_path / "daemon.sock")
+    server.start()
+    try:
+        client = DaemonClient.connect(server.socket_path)
+        assert client.enhance_text("Add a login page").saved_prompt.story_id == "started"
+
+        services.apply_config("edited")
+        outcome = client.enhance_text("Add a login page")
+        client.close()
+    finally:
+        server.stop()
+
+    assert outcome.saved_prompt.story_id == "edited"
+    assert started.label == "started" and len(started.calls) == 1
+
+
+def test_cli_forwards_to_running_daemon(control, monkeypatch, capsys):
+    server, service = control
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("LAZY_PTT_STATE_DIR", str(server.socket_path.parent))
+
+    assert main(["enhance-text", "--text", "Fix the export bug", "--no-auto-move"]) == 0
+
+    assert service.calls == [("enhance_text", "Fix the export bug", False)]
+    assert "Prompt saved to: /prompts/STORY-1.md" in capsys.readouterr().out
@@ -58,3 +58,94 @@ def test_daemon_recovers_from_cycle_error():
     daemon.run()
 
     assert service.calls == 2
+
+
+class _PipelineService:
+    def __init__(self, captures: int):
+        self.remaining = captures
+        self.transcribed = []
+        self.completed = []
+
+    def capture_once(self):
+        if self.remaining == 0:
+            raise KeyboardInterrupt
+        self.remaining -= 1
+        return f'audio-{self.remaining}'
+
+    def transcribe_buffer(self, buffer):
+        if buffer == 'audio-1':
+            raise RuntimeError('decode failed')
+        self.transcribed.append(buffer)
+        return buffer.replace('audio', 'text')
+
+    def complete_transcription(self, transcription, auto_move: bool = False, **_kwargs):
+        self.completed.append(transcription)
+        return _FakeOutcome(len(self.completed))
+
+
+def test_pipelined_daemon_drains_queued_captures():
+    service = _PipelineService(captures=3)
+    captured = []
+    daemon = PTTDaemon(service, pipelined=True, queue_size=1, on_cycle=captured.append)
+
+    daemon.run()
+
+    assert service.transcribed == ['audio-2', 'audio-0']
+    assert service.completed == ['text-2', 'text-0']
+    assert len(captured) == 2
+    assert daemon.stats.stages['stt'].failed == 1
+    assert daemon.stats.stages['capture'].completed == 3
+
+
+class _EventSource:
+    def __init__(self, daemon_ref, events):
+        self._events = list(events)
+        self._daemon_ref = daemon_ref
+        self.started = False
+        self.stopped = False
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.stopped = True
+
+    def get(self, timeout=None):
+        if not self._events:
+            self._daemon_ref[0].request_stop()
+            return None
+        return self._events.pop(0)
+
+
+class _RecorderService:
+    def __init__(self):
+        self.recording = False
+        self.processed = []
+
+    def begin_capture(self):
+        self.recording = True
+
+    def end_capture(self):
+        self.recording = False
+        return 'buffer'
+
+    def process_audio_buffer(self, buffer, auto_move: bool = False, **_kwargs):
+        self.processed.append(buffer)
+        return _FakeOutcome(len(self.processed))
+
+
+def test_daemon_uses_persistent_hotkey_events():
+    service = _RecorderService()
+    ref = []
+    events = [
+        type('Event', (), {'kind': 'press'})(),
+        type('Event', (), {'kind': 'release'})(),
+    ]
+    source = _EventSource(ref, events)
+    daemon = PTTDaemon(service, hotkey_events=source, idle_sleep_seconds=0.01)
+    ref.append(daemon)
+
+    daemon.run()
+
+    assert service.processed == ['buffer']
+    assert source.started and source.stopped
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+
+from lazy_ptt.config import ConfigError
+from lazy_ptt.services.history import TimingHistory, parse_window, summarize
+from lazy_ptt.timing import add_timing_sink, log_timings, remove_timing_sink
+
+
+def _record(ts: float, **stages: float) -> dict:
+    return {
+        "ts": ts,
+        "event": "listen_once",
+        "total_ms": sum(stages.values()),
+        "stages_ms": stages,
+        "audio_seconds": 4.0,
+    }
+
+
+def test_history_rotates_and_keeps_backups(tmp_path: Path) -> None:
+    history = TimingHistory(tmp_path / "timings.jsonl", max_bytes=400, backups=2)
+    for i in range(30):
+        history.append(_record(float(i), transcribe=100.0 + i))
+
+    files = history.files()
+    assert [path.name for path in files] == [
+        "timings.jsonl.2",
+        "timings.jsonl.1",
+        "timings.jsonl",
+    ]
+    records = history.load()
+    assert records[-1]["ts"] == 29.0
+    assert [r["ts"] for r in records] == sorted(r["ts"] for r in records)
+    assert len(history.load(since=28.0)) == 2
+
+
+def test_log_timings_feeds_installed_sink(tmp_path: Path) -> None:
+    history = TimingHistory(tmp_path / "timings.jsonl")
+    add_timing_sink(history)
+    try:
+        log_timings("enhance_text", {"enhance_request": 12.5}, story_id="US-1")
+    finally:
+        remove_timing_sink(history)
+
+    (record,) = history.load()
+    assert record["event"] == "enhance_text"
+    assert record["stages_ms"] == {"enhance_request": 12.5}
+    assert record["story_id"] == "US-1"
+
+
+def test_summarize_percentiles_rtf_and_cache_rates() -> None:
+    now = 100_000.0
+    records = [
+        _record(now - 10, record=2000.0, model_load=5000.0, transcribe=800.0),
+        _record(now - 20, record=3000.0, transcribe=400.0),
+        _record(now - 30, record=1000.0, transcribe=400.0, enhance_request=900.0),
+        _record(now - 7200, record=1000.0, transcribe=4000.0),  # outside 1h
+    ]
+
+    (hour, day) = summarize(records, ["1h", "1d"], now=now)
+
+    assert hour.cycles == 3 and day.cycles == 4
+    stages = {stage.stage: stage for stage in hour.stages}
+    assert stages["transcribe"].count == 3
+    assert stages["transcribe"].p50 == 400.0
+    assert stages["enhance_request"].count == 1
+    assert stages["release_to_prompt"].p50 == pytest.approx(1300.0)
+    assert hour.real_time_factor["p50"] == pytest.approx(0.1)
+    assert hour.cache_hit_rates["whisper_model"] == pytest.approx(2 / 3, abs=1e-3)
+
+
+def test_parse_window() -> None:
+    assert parse_window("30m") == 1800
+    assert parse_window("7d") == 7 * 86400
+    with pytest.raises(ConfigError):
+        parse_window("soon")
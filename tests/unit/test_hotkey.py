@@ -0,0 +1,89 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from lazy_ptt.input.hotkey import (
+    HotkeyListenerError,
+    HotkeySpec,
+    PersistentHotkeyListener,
+    key_name,
+    parse_hotkey,
+)
+
+
+def _key(name: str):
+    return SimpleNamespace(name=name, char=None)
+
+
+def _char(char: str):
+    return SimpleNamespace(name=None, char=char)
+
+
+def test_parse_hotkey_handles_brackets_and_modifiers() -> None:
+    assert parse_hotkey("<f12>") == HotkeySpec(key="f12")
+    assert parse_hotkey("space") == HotkeySpec(key="space")
+    assert parse_hotkey("<ctrl>+<alt>+H") == HotkeySpec(
+        key="h", modifiers=frozenset({"ctrl", "alt"})
+    )
+    assert parse_hotkey("<ctrl_r>") == HotkeySpec(key="ctrl")
+    with pytest.raises(HotkeyListenerError):
+        parse_hotkey("<f1>+x")
+
+
+def test_key_name_normalises_pynput_keys() -> None:
+    assert key_name(_key("f12")) == "f12"
+    assert key_name(_key("ctrl_l")) == "ctrl"
+    assert key_name(_char("H")) == "h"
+
+
+def test_persistent_listener_ignores_auto_repeat() -> None:
+    listener = PersistentHotkeyListener("<f12>", debounce_seconds=0.05)
+
+    listener._on_press(_key("f12"))
+    listener._on_press(_key("f12"))  # held key repeat
+    listener._on_release(_key("f12"))
+    listener._on_press(_key("f12"))  # X11-style release/press repeat pair
+    listener._on_release(_key("f12"))
+    time.sleep(0.15)
+
+    kinds = [listener.get(timeout=0).kind for _ in range(listener.events.qsize())]
+    assert kinds == ["press", "release"]
+
+
+def test_persistent_listener_requires_modifiers() -> None:
+    listener = PersistentHotkeyListener(debounce_seconds=0)
+    listener.bind("notes", "<ctrl>+<shift>+n")
+
+    listener._on_press(_char("n"))
+    assert listener.get(timeout=0) is None
+
+    listener._on_press(_key("ctrl_l"))
+    listener._on_press(_key("shift"))
+    listener._on_press(_char("n"))
+    listener._on_release(_char("n"))
+
+    press = listener.get(timeout=0)
+    release = listener.get(timeout=0)
+    assert (press.kind, press.binding) == ("press", "notes")
+    assert (release.kind, release.binding) == ("release", "notes")
+
+
+def test_persistent_listener_fires_only_the_most_specific_binding() -> None:
+    listener = PersistentHotkeyListener("<f12>", debounce_seconds=0)
+    listener.bind("workspace:other", "<ctrl>+<f12>")
+
+    listener._on_press(_key("ctrl_l"))
+    listener._on_press(_key("f12"))
+    listener._on_release(_key("f12"))
+    listener._on_release(_key("ctrl_l"))
+    listener._on_press(_key("f12"))
+    listener._on_release(_key("f12"))
+
+    events = [listener.get(timeout=0) for _ in range(listener.events.qsize())]
+    assert [(event.kind, event.binding) for event in events] == [
+        ("press", "workspace:other"),
+        ("release", "workspace:other"),
+        ("press", "default"),
+        ("release", "default"),
+    ]
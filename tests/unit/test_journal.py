@@ -0,0 +1,117 @@
+import json
+from pathlib import Path
+
+from lazy_ptt.audio.recorder import AudioBuffer
+from lazy_ptt.config import ConfigError
+from lazy_ptt.prompt.enhancer import EnhancedPrompt
+from lazy_ptt.services.daemon import PTTDaemon
+from lazy_ptt.services.journal import JobJournal
+from lazy_ptt.stt.whisper import TranscriptionResult
+
+
+def _buffer(payload: bytes = b"wav") -> AudioBuffer:
+    return AudioBuffer(payload, sample_rate=16000, channels=1, duration_seconds=1.0)
+
+
+def _transcription(text: str) -> TranscriptionResult:
+    return TranscriptionResult(text=text, language="en", duration=1.0, temperature=0.0)
+
+
+def _prompt(text: str) -> EnhancedPrompt:
+    return EnhancedPrompt("FEATURE", text, [], [], [], [], [], None, text)
+
+
+def test_journal_tracks_unfinished_stages(tmp_path: Path) -> None:
+    journal = JobJournal(tmp_path / "journal.sqlite3")
+    captured = journal.record_captured(_buffer(b"audio-1"))
+    transcribed = journal.record_captured(_buffer())
+    journal.record_transcribed(transcribed, _transcription("add login"))
+    enhanced = journal.record_captured(_buffer())
+    journal.record_transcribed(enhanced, _transcription("add logout"))
+    journal.record_enhanced(enhanced, _prompt("add logout"))
+    done = journal.record_captured(_buffer())
+    journal.record_stored(done, tmp_path / "prompt.md")
+    journal.close()
+
+    jobs = {job.job_id: job for job in JobJournal(tmp_path / "journal.sqlite3").unfinished()}
+
+    assert set(jobs) == {captured, transcribed, enhanced}
+    assert jobs[captured].audio.wav_bytes == b"audio-1"
+    assert jobs[transcribed].audio is None
+    assert jobs[transcribed].transcription.text == "add login"
+    assert jobs[enhanced].enhanced.summary == "add logout"
+
+
+def test_journal_gives_up_after_max_attempts(tmp_path: Path) -> None:
+    journal = JobJournal(tmp_path / "journal.sqlite3", max_attempts=2)
+    job_id = journal.record_captured(_buffer())
+    journal.record_attempt(job_id, RuntimeError("boom"))
+    assert [job.attempts for job in journal.unfinished()] == [1]
+    journal.record_attempt(job_id, RuntimeError("boom"))
+    assert journal.unfinished() == []
+    journal.close()
+
+
+def test_journal_does_not_replay_permanent_failures(tmp_path: Path) -> None:
+    journal = JobJournal(tmp_path / "journal.sqlite3", max_attempts=3)
+    tap = journal.record_captured(_buffer())
+    garbled = journal.record_captured(_buffer())
+    journal.record_attempt(tap, ConfigError("Transcription returned empty text"))
+    journal.record_attempt(garbled, json.JSONDecodeError("Expecting value", "", 0))
+
+    assert [job.job_id for job in journal.unfinished()] == [garbled]
+    journal.close()
+
+
+class _ResumingService:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def transcribe_buffer(self, buffer):
+        self.calls.append(("transcribe", buffer.wav_bytes))
+        return _transcription(buffer.wav_bytes.decode())
+
+    def complete_transcription(
+        self, transcription, auto_move=False, on_enhanced=None, on_stored=None
+    ):
+        self.calls.append(("complete", transcription.text))
+        on_enhanced(_prompt(transcription.text))
+        return self._outcome(transcription.text, on_stored)
+
+    def store_enhanced(self, enhanced, transcription, auto_move=False, on_stored=None):
+        self.calls.append(("store", enhanced.summary))
+        return self._outcome(enhanced.summary, on_stored)
+
+    def listen_once(self, **_kwargs):
+        raise KeyboardInterrupt
+
+    def capture_once(self):
+        raise KeyboardInterrupt
+
+    @staticmethod
+    def _outcome(text, on_stored):
+        saved = type("Saved", (), {"prompt_path": Path(f"{text}.md")})()
+        on_stored(saved)
+        return type("Outcome", (), {"saved_prompt": saved, "enhanced": _prompt(text)})()
+
+
+def test_daemon_resumes_journaled_jobs(tmp_path: Path) -> None:
+    journal = JobJournal(tmp_path / "journal.sqlite3")
+    journal.record_captured(_buffer(b"from-audio"))
+    partial = journal.record_captured(_buffer())
+    journal.record_transcribed(partial, _transcription("from-transcript"))
+    almost = journal.record_captured(_buffer())
+    journal.record_transcribed(almost, _transcription("from-prompt"))
+    journal.record_enhanced(almost, _prompt("from-prompt"))
+
+    service = _ResumingService()
+    PTTDaemon(service, journal=journal).run()
+
+    assert service.calls == [
+        ("transcribe", b"from-audio"),
+        ("complete", "from-audio"),
+        ("complete", "from-transcript"),
+        ("store", "from-prompt"),
+    ]
+    assert journal.unfinished() == []
+    journal.close()
@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import sys
+import threading
+import zlib
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import List
+
+import numpy as np
+import pytest
+
+from lazy_ptt.config import ConfigError, WhisperConfig
+from lazy_ptt.stt.batching import BatcherClosedError, BatchingTranscriber, MicroBatcher
+from lazy_ptt.stt.remote import RemoteModelError
+from lazy_ptt.stt.server import ModelServer
+from lazy_ptt.stt.whisper import TranscriptionRequest, TranscriptionResult, WhisperTranscriber
+from lazy_ptt.timing import StageTimer, collect_timings
+
+
+def test_micro_batcher_groups_items_submitted_while_busy():
+    release = threading.Event()
+    batches: List[List[int]] = []
+
+    def run_batch(items: List[int]):
+        batches.append(items)
+        release.wait(5)
+        return [ValueError("odd") if item % 2 else item * 10 for item in items]
+
+    with MicroBatcher(run_batch, max_batch_size=3, max_wait_seconds=0.0) as batcher:
+        first = batcher.submit(0)
+        while not batches:
+            pass
+        rest = [batcher.submit(item) for item in (1, 2, 4, 6)]
+        release.set()
+        assert first.result(5) == 0
+        assert rest[1].result(5) == 20
+        assert rest[3].result(5) == 60
+        with pytest.raises(ValueError):
+            rest[0].result(5)
+
+    assert batches == [[0], [1, 2, 4], [6]]
+
+
+class _FakeModel(WhisperTranscriber):
+    """Real batching logic over fake decoders."""
+
+    def __init__(self) -> None:
+        super().__init__(WhisperConfig("tiny", "cpu", "int8", Path(".cache")))
+        self.loaded = False
+        self.calls: List[str] = []
+        self.batches: List[int] = []
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.loaded
+
+    def load(self) -> None:
+        self.loaded = True
+
+    def _generate_batch(self, clips, language, beam_size):
+        self.batches.append(len(clips))
+        return [f"{clip.size} samples b{beam_size}" for clip in clips]
+
+    def transcribe_samples(self, samples, language=None, beam_size=5):
+        self.calls.append("samples")
+        return TranscriptionResult(f"{samples.size} samples b{beam_size}", language, 1.0, 0.0)
+
+    def transcribe_file(self, path: Path, language=None):
+        self.calls.append("file")
+        if not Path(path).exists():
+            raise FileNotFoundError(path)
+        return TranscriptionResult(f"file {Path(path).read_bytes()[:4]!r}", language, 2.0, 0.0)
+
+
+@pytest.fixture()
+def model_server(tmp_path):
+    model = _FakeModel()
+    server = ModelServer(model, tmp_path / "whisper.sock", max_wait_seconds=0.005)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, model
+    server.shutdown()
+    server.close()
+    thread.join(5)
+
+
+def test_whisper_transcriber_client_mode_uses_shared_server(model_server, tmp_path):
+    server, model = model_server
+    config = WhisperConfig(
+        "tiny", "cpu", "int8", tmp_path / ".cache", server_socket=server.socket_path
+    )
+    client = WhisperTranscriber(config)
+
+    assert client.is_loaded is False
+    client.load()
+    assert client.is_loaded is True
+
+    results: List[TranscriptionResult] = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                client.transcribe_samples(np.zeros(1600, dtype=np.float32), "en", beam_size=1)
+            )
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert [r.text for r in results] == ["1600 samples b1"] * 4
+    assert results[0].language == "en"
+
+    audio = tmp_path / "clip.wav"
+    audio.write_bytes(b"RIFF....")
+    assert client.transcribe_file(audio).text == "file b'RIFF'"
+    with pytest.raises(RemoteModelError, match="FileNotFoundError"):
+        client.transcribe_file(tmp_path / "missing.wav")
+    assert model.calls.count("samples") + sum(model.batches) == 4
+
+
+def test_model_server_refuses_to_displace_a_live_server(model_server):
+    server, _model = model_server
+
+    with pytest.raises(ConfigError, match="already listening"):
+        ModelServer(_FakeModel(), server.socket_path)
+
+
+def test_transcribe_batch_decodes_short_clips_together(tmp_path):
+    model = _FakeModel()
+    short = np.zeros(16000, dtype=np.float32)
+    long = np.zeros(31 * 16000, dtype=np.float32)
+
+    results = model.transcribe_batch(
+        [
+            TranscriptionRequest(short, "en"),
+            TranscriptionRequest(long, "en"),
+            TranscriptionRequest(short, None),
+            TranscriptionRequest(short[:800], "en"),
+            TranscriptionRequest(tmp_path / "missing.wav", "en"),
+        ]
+    )
+
+    assert model.batches == [2]
+    assert [r.text for r in results[:4]] == [
+        "16000 samples b5",
+        "496000 samples b5",
+        "16000 samples b5",
+        "800 samples b5",
+    ]
+    assert results[0].duration == 1.0 and results[3].duration == 0.05
+    assert model.calls == ["samples", "samples"]
+    assert isinstance(results[4], Exception)
+
+
+_WORDS = {1: "add a login page", 2: "fix the logout bug"}
+
+
+def _clip(word: int) -> np.ndarray:
+    """Half a second of `word` between two quarter seconds of silence."""
+
+    silence = np.zeros(4000, dtype=np.float32)
+    return np.concatenate([silence, np.full(8000, word / 10, dtype=np.float32), silence])
+
+
+def _compression_ratio(text: str) -> float:
+    data = text.encode("utf-8")
+    return len(data) / len(zlib.compress(data))
+
+
+class _FakeFasterWhisper:
+    """A faster-whisper stand-in whose transcripts reveal what was decoded.
+
+    Word 3 only comes out right above temperature 0; at 0 it is a
+    repetitive loop that the compression-ratio check rejects.
+    """
+
+    max_length = 448
+    hf_tokenizer = None
+
+    def __init__(self, monkeypatch) -> None:
+        self.model = SimpleNamespace(is_multilingual=True, generate=self._generate)
+        self.transcribed: List[dict] = []
+        self.generated = 0
+        modules = {
+            "faster_whisper": {},
+            "faster_whisper.audio": {"pad_or_trim": lambda features: features},
+            "faster_whisper.tokenizer": {"Tokenizer": lambda *_a, **_k: self},
+            "faster_whisper.transcribe": {
+                "get_compression_ratio": _compression_ratio,
+                "get_suppressed_tokens": lambda _tokenizer, tokens: tokens,
+            },
+            "faster_whisper.vad": {
+                "VadOptions": lambda: None,
+                "get_speech_timestamps": lambda audio, _options: self._speech(audio),
+            },
+        }
+        for name, attributes in modules.items():
+            module = ModuleType(name)
+            module.__dict__.update(attributes)
+            monkeypatch.setitem(sys.modules, name, module)
+
+    @staticmethod
+    def _speech(audio):
+        voiced = np.flatnonzero(audio)
+        return [{"start": voiced[0], "end": voiced[-1] + 1}] if voiced.size else []
+
+    @staticmethod
+    def _text(word: int, samples: int, temperature: float) -> str:
+        if word == 3:
+            return "la " * 20 if temperature == 0.0 else f"lazy loading {samples}"
+        return f"{_WORDS[word]} {samples}"
+
+    # -- single decodes ---------------------------------------------------
+
+    def transcribe(self, audio, **options):
+        self.transcribed.append(options)
+        duration = audio.size / 16000
+        if options["vad_filter"]:
+            spans = self._speech(audio)
+            audio = audio[spans[0]["start"]:spans[0]["end"]] if spans else audio[:0]
+        if not audio.size or not audio.any():
+            return [], SimpleNamespace(language=options["language"], duration=duration)
+        word = int(round(audio.max() * 10))
+        for temperature in options["temperature"]:
+            text = self._text(word, audio.size, temperature)
+            if _compression_ratio(text) <= options["compression_ratio_threshold"]:
+                break
+        info = SimpleNamespace(language=options["language"], duration=duration)
+        return [SimpleNamespace(text=f" {text}")], info
+
+    # -- batched decodes --------------------------------------------------
+
+    def feature_extractor(self, clip):
+        return np.array([clip.max(), clip.size])
+
+    def get_prompt(self, _tokenizer, _previous):
+        return []
+
+    def encode(self, features):
+        return features
+
+    def decode(self, tokens):
+        return "".join(map(chr, tokens))
+
+    def _generate(self, features, prompts, **_options):
+        self.generated += len(prompts)
+        outputs = []
+        for value, samples in features:
+            word = int(round(value * 10))
+            # Whisper hallucinates over silence but flags it as probably no speech.
+            text = self._text(word, int(samples), 0.0) if word else "you"
+            outputs.append(
+                SimpleNamespace(
+                    sequences_ids=[[ord(char) for char in text]],
+                    scores=[-0.1 if word else -2.0],
+                    no_speech_prob=0.1 if word else 0.9,
+                )
+            )
+        return outputs
+
+
+class _DecodingModel(WhisperTranscriber):
+    def __init__(self, fake: _FakeFasterWhisper, vad_filter: bool) -> None:
+        super().__init__(
+            WhisperConfig("tiny", "cpu", "int8", Path(".cache"), vad_filter=vad_filter)
+        )
+        self._fake = fake
+
+    def _ensure_model(self):
+        return self._fake
+
+
+@pytest.mark.parametrize("vad_filter", [True, False])
+def test_batched_and_single_decodes_agree(monkeypatch, vad_filter):
+    fake = _FakeFasterWhisper(monkeypatch)
+    model = _DecodingModel(fake, vad_filter)
+    clips = [_clip(1), _clip(2), _clip(3), np.zeros(16000, dtype=np.float32)]
+
+    batched = model.transcribe_batch([TranscriptionRequest(clip, "en") for clip in clips])
+    # Only the clip that needs a higher temperature was decoded on its own.
+    assert len(fake.transcribed) == 1
+    assert fake.generated == (3 if vad_filter else 4)
+    single = [model.transcribe_samples(clip, "en") for clip in clips]
+
+    assert [(r.text, r.duration) for r in batched] == [(r.text, r.duration) for r in single]
+    samples = 8000 if vad_filter else 16000
+    assert [r.text for r in batched] == [
+        f"add a login page {samples}",
+        f"fix the logout bug {samples}",
+        f"lazy loading {samples}",
+        "",
+    ]
+    assert all(options == model._decode_options("en") for options in fake.transcribed)
+
+
+def test_long_files_are_decoded_once(tmp_path):
+    model = _FakeModel()
+    loads = []
+    model._load_samples = lambda audio: loads.append(audio) or np.zeros(
+        (31 if isinstance(audio, Path) else 1) * 16000, dtype=np.float32
+    )
+
+    results = model.transcribe_batch(
+        [
+            TranscriptionRequest(tmp_path / "long.wav", "en"),
+            TranscriptionRequest(np.zeros(16000, dtype=np.float32), "en"),
+            TranscriptionRequest(np.zeros(31 * 16000, dtype=np.float32), "en"),
+        ]
+    )
+
+    # The long file goes on to the single path as samples, not decoded again.
+    assert [r.text for r in results] == [
+        "496000 samples b5", "16000 samples b5", "496000 samples b5"
+    ]
+    assert len(loads) == 2 and model.calls == ["samples", "samples", "samples"]
+
+
+def test_batching_transcriber_reports_queue_wait_and_batch_sizes():
+    model = _FakeModel()
+    front = BatchingTranscriber(model, max_batch_size=4, max_wait_seconds=0.05)
+    timers = [StageTimer() for _ in range(3)]
+
+    def transcribe(timer: StageTimer) -> None:
+        with collect_timings(timer):
+            front.transcribe_samples(np.zeros(1600, dtype=np.float32), "en")
+
+    threads = [threading.Thread(target=transcribe, args=(timer,)) for timer in timers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    front.close()
+
+    stats = front.stats()
+    assert stats["items"] == 3
+    assert sum(size * count for size, count in stats["batch_sizes"].items()) == 3
+    assert set(stats["queue_wait_ms"]) == {"p50", "p90", "p99", "max"}
+    assert all({"stt_queue", "transcribe"} <= set(timer.as_dict()) for timer in timers)
+
+
+class _SlowLoadingModel:
+    config = None
+
+    def __init__(self) -> None:
+        self.is_loaded = False
+        self.loading = threading.Event()
+        self.release = threading.Event()
+
+    def load(self) -> None:
+        self.loading.set()
+        self.release.wait(5)
+        self.is_loaded = True
+
+    def transcribe_batch(self, requests):
+        return [TranscriptionResult(f"{r.audio.size}", r.language, 0.1, 0.0) for r in requests]
+
+
+def test_closed_batcher_rejects_new_items_and_finishes_queued_ones():
+    batcher = MicroBatcher(lambda items: [item * 2 for item in items], max_wait_seconds=0.05)
+    queued = batcher.submit(21)
+    batcher.close()
+
+    assert queued.result(5) == 42
+    with pytest.raises(BatcherClosedError):
+        batcher.submit(1)
+
+
+def test_retired_batching_transcriber_drains_in_flight_calls():
+    model = _SlowLoadingModel()
+    front = BatchingTranscriber(model, max_wait_seconds=0.0)
+    results = []
+    caller = threading.Thread(
+        target=lambda: results.append(front.transcribe_samples(np.zeros(160), "en"))
+    )
+    caller.start()
+    assert model.loading.wait(5)
+
+    front.close()  # e.g. `apply_config` swapped the model mid-load
+    assert front.batcher._thread.is_alive()
+    model.release.set()
+    caller.join(5)
+
+    assert [result.text for result in results] == ["160"]
+    assert not front.batcher._thread.is_alive()
+    assert front.transcribe_samples(np.zeros(80), "en").text == "80"  # late caller
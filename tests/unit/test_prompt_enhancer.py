@@ -1,7 +1,9 @@
 import json
+import threading
+import time
 
 from lazy_ptt.config import OpenAIConfig
-from lazy_ptt.prompt.enhancer import PromptEnhancer
+from lazy_ptt.prompt.enhancer import EnhancedPrompt, PromptEnhancer, PromptSection
 
 
 class _FakeResponseContent:
@@ -59,3 +61,130 @@ def test_prompt_enhancer_parses_response_payload() -> None:
     assert result.sections[0].title == "Implementation"
     assert result.acceptance_criteria == ["Prompt stored in project management"]
     assert result.suggested_story_id == "US-5.1"
+
+
+def test_prompt_enhancer_amend_merges_delta() -> None:
+    prior = EnhancedPrompt(
+        work_type="FEATURE",
+        summary="Implement push-to-talk workflow",
+        objectives=["Enable quick capture"],
+        risks=["Microphone unavailable"],
+        milestones=["Alpha"],
+        sections=[PromptSection(title="Implementation", content="Break down services.")],
+        acceptance_criteria=["Prompt stored"],
+        suggested_story_id="US-5.1",
+        original_brief="Implement push-to-talk workflow",
+    )
+    delta = {
+        "add_objectives": ["Support F12 hotkey"],
+        "remove_risks": ["microphone unavailable"],
+        "upsert_sections": [
+            {"title": "Implementation", "content": "Use a persistent listener."},
+            {"title": "Testing", "content": "Fake the recorder."},
+        ],
+    }
+    config = OpenAIConfig(
+        api_key="test-key",
+        model="test-model",
+        temperature=0.0,
+        max_output_tokens=500,
+        base_url=None,
+    )
+    enhancer = PromptEnhancer(config, client=_FakeOpenAIClient(delta))  # type: ignore[arg-type]
+
+    result = enhancer.amend(prior, "Also support the F12 hotkey")
+
+    assert result.summary == prior.summary
+    assert result.objectives == ["Enable quick capture", "Support F12 hotkey"]
+    assert result.risks == []
+    assert [s.content for s in result.sections] == [
+        "Use a persistent listener.",
+        "Fake the recorder.",
+    ]
+    assert result.original_brief == prior.original_brief
+    assert result.amendments == ["Also support the F12 hotkey"]
+    assert prior.sections[0].content == "Break down services."
+
+
+class _FakeStreamEvent:
+    def __init__(self, delta: str) -> None:
+        self.type = "response.output_text.delta"
+        self.delta = delta
+
+
+class _FakeStreamingResponsesClient:
+    def __init__(self, payload: dict) -> None:
+        self._text = json.dumps(payload)
+        self.received: list = []
+
+    def create(self, stream: bool = False, **_: object):
+        for start in range(0, len(self._text), 7):
+            self.received.append(start)
+            yield _FakeStreamEvent(self._text[start : start + 7])
+
+
+def test_prompt_enhancer_streams_summary_and_sections_before_completion() -> None:
+    payload = {
+        "work_type": "FEATURE",
+        "summary": "Stream the plan",
+        "sections": [
+            {"title": "API", "content": "Add an SSE route. "},
+            {"title": "Client", "content": "Render {partial} plans."},
+        ],
+        "acceptance_criteria": ["Events arrive early"],
+    }
+    client = _FakeOpenAIClient(payload)
+    client.responses = _FakeStreamingResponsesClient(payload)
+    config = OpenAIConfig(
+        api_key="test-key",
+        model="test-model",
+        temperature=0.0,
+        max_output_tokens=500,
+        base_url=None,
+    )
+    events = []
+
+    def on_progress(kind: str, data: dict) -> None:
+        events.append((kind, data, len(client.responses.received)))
+
+    result = PromptEnhancer(config, client=client).enhance("Stream it", on_progress=on_progress)
+
+    assert [(kind, data) for kind, data, _ in events] == [
+        ("summary", {"summary": "Stream the plan"}),
+        ("section", {"index": 0, "title": "API", "content": "Add an SSE route."}),
+        ("section", {"index": 1, "title": "Client", "content": "Render {partial} plans."}),
+    ]
+    # Every event fired before the final chunk was received.
+    assert all(chunks < len(client.responses.received) for _, _, chunks in events)
+    assert [section.title for section in result.sections] == ["API", "Client"]
+    assert result.acceptance_criteria == ["Events arrive early"]
+
+
+def test_prompt_enhancer_limits_concurrent_requests() -> None:
+    class _SlowResponses:
+        def __init__(self) -> None:
+            self.active = 0
+            self.peak = 0
+            self.lock = threading.Lock()
+
+        def create(self, **_: object) -> _FakeResponse:
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.05)
+            with self.lock:
+                self.active -= 1
+            return _FakeResponse(json.dumps({"summary": "ok"}))
+
+    client = _FakeOpenAIClient({})
+    client.responses = _SlowResponses()
+    config = OpenAIConfig("test-key", "test-model", 0.0, 500, None, max_concurrency=2)
+    enhancer = PromptEnhancer(config, client=client)
+
+    threads = [threading.Thread(target=enhancer.enhance, args=("brief",)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert client.responses.peak == 2
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+from lazy_ptt.prompt.enhancer import EnhancedPrompt, PromptSection, draft_prompt
+from lazy_ptt.prompt.index import PromptIndex, match_expression
+from lazy_ptt.prompt.manager import PromptStorage
+
+
+def _prompt(summary: str, brief: str, work_type: str = "FEATURE") -> EnhancedPrompt:
+    return EnhancedPrompt(
+        work_type=work_type,
+        summary=summary,
+        objectives=["Ship it"],
+        risks=[],
+        milestones=[],
+        sections=[PromptSection(title="Plan", content=f"Implement {summary.lower()}.")],
+        acceptance_criteria=[],
+        suggested_story_id=None,
+        original_brief=brief,
+    )
+
+
+def _storage(tmp_path: Path) -> PromptStorage:
+    index = PromptIndex(tmp_path / "state" / "prompt-index.sqlite3")
+    return PromptStorage(tmp_path / "staging", "{story_id}.md", "metadata.json", index=index)
+
+
+def test_saves_revisions_and_relocations_are_indexed(tmp_path: Path) -> None:
+    storage = _storage(tmp_path)
+    first = storage.save(_prompt("Dark mode toggle", "users want a dark theme"), story_id="US-1")
+    storage.save(_prompt("Fix CSV export", "export drops unicode", "BUG"), story_id="US-2")
+    storage.save_revision(first, _prompt("Dark mode toggle", "also remember the choice"))
+    storage.relocate_to_project_management(first, tmp_path / "pm")
+
+    page = storage.index.list()
+    assert page.total == 3
+    assert sorted(item.story_id for item in page.items if item.location == "staging") == [
+        "US-1",
+        "US-2",
+    ]
+    assert storage.index.list(work_type="bug").items[0].story_id == "US-2"
+    moved = storage.index.list(location="project-management").items
+    assert [Path(item.prompt_path).parent.parent.name for item in moved] == ["user-story-prompts"]
+
+    # A revision replaces its entry; the relocated copy is indexed separately.
+    found = storage.index.search("remember choice", limit=5)
+    assert {item.location: item.revision for item in found.items} == {
+        "staging": 2,
+        "project-management": 2,
+    }
+    assert "[choice]" in found.items[0].snippet
+
+
+def test_search_paginates_and_ignores_query_syntax(tmp_path: Path) -> None:
+    storage = _storage(tmp_path)
+    for number in range(5):
+        storage.save(_prompt(f"Export report {number}", "csv export"), story_id=f"US-{number}")
+
+    first = storage.index.search("export", limit=2)
+    second = storage.index.search("export", limit=2, offset=first.next_offset)
+    assert first.total == 5 and second.next_offset == 4
+    assert {item.story_id for item in first.items}.isdisjoint(
+        item.story_id for item in second.items
+    )
+    assert storage.index.search('report" (export*').total == 5
+    assert storage.index.search("expo").total == 5  # last word matches as a prefix
+    assert storage.index.search("  ").total == 0
+    assert match_expression("dark-mode") == '"dark" "mode"*'
+
+
+def test_rebuild_indexes_an_existing_tree(tmp_path: Path) -> None:
+    plain = PromptStorage(tmp_path / "staging", "{story_id}.md", "metadata.json")
+    plain.save(draft_prompt("Add a login page"), story_id="US-7")
+    plain.save(draft_prompt("Rate limit the API"), story_id="US-8")
+    index = PromptIndex(tmp_path / "index.sqlite3")
+
+    count = index.rebuild([("staging", tmp_path / "staging")], "metadata.json")
+
+    assert count == 2
+    assert [item.story_id for item in index.search("login").items] == ["US-7"]
+    assert index.rebuild([("staging", tmp_path / "staging")], "metadata.json") == 2
+    assert index.list().total == 2
@@ -1,7 +1,12 @@
 import json
 from pathlib import Path
 
-from lazy_ptt.prompt.enhancer import EnhancedPrompt, PromptSection
+from lazy_ptt.prompt.enhancer import (
+    EnhancedPrompt,
+    PromptSection,
+    apply_amendment,
+    draft_prompt,
+)
 from lazy_ptt.prompt.manager import PromptStorage
 
 
@@ -53,3 +58,69 @@ def test_relocate_copies_prompt(tmp_path: Path) -> None:
     assert dest_prompt.parent == expected_dir
     assert (expected_dir / "metadata.json").exists()
     assert (expected_dir / "README.txt").read_text(encoding="utf-8").strip() == "PTT Story"
+
+
+def test_save_revision_archives_previous_version(tmp_path: Path) -> None:
+    storage = PromptStorage(tmp_path, "{story_id}_prompt.md", "metadata.json")
+    saved = storage.save(_sample_prompt(), story_id="US-11")
+
+    loaded = storage.load_prompt(storage.find_saved_prompt("us-11"))
+    assert loaded.sections[0].title == "Implementation"
+    assert loaded.original_brief == "Add a PTT command"
+
+    loaded.summary = "Add push-to-talk workflow with F12"
+    loaded.amendments.append("Use F12")
+    updated = storage.save_revision(saved, loaded)
+
+    assert updated.revision == 2
+    archived = tmp_path / "US-11" / "revisions" / "rev-001" / "metadata.json"
+    assert json.loads(archived.read_text(encoding="utf-8"))["summary"] == (
+        "Add push-to-talk workflow"
+    )
+    metadata = storage.read_metadata(updated)
+    assert metadata["revision"] == 2
+    assert metadata["amendments"] == ["Use F12"]
+    assert "## Amendments" in updated.prompt_path.read_text(encoding="utf-8")
+
+
+def test_amending_legacy_metadata_keeps_sections_and_brief(tmp_path: Path) -> None:
+    # Early releases stored only the list fields in metadata; the plan body
+    # and the brief lived in the markdown alone.
+    prompt = _sample_prompt()
+    prompt.sections.append(PromptSection(title="Testing", content="Fake the mic.\n\nAnd the API."))
+    story_dir = tmp_path / "US-12"
+    story_dir.mkdir()
+    (story_dir / "US-12_prompt.md").write_text(prompt.to_markdown(), encoding="utf-8")
+    legacy = {
+        key: value
+        for key, value in prompt.to_dict().items()
+        if key not in {"sections", "original_brief", "amendments"}
+    }
+    (story_dir / "metadata.json").write_text(json.dumps(legacy), encoding="utf-8")
+    storage = PromptStorage(tmp_path, "{story_id}_prompt.md", "metadata.json")
+    saved = storage.find_saved_prompt("US-12")
+
+    amended = apply_amendment(
+        storage.load_prompt(saved), {"add_objectives": ["Support F12"]}, "Use F12"
+    )
+    updated = storage.save_revision(saved, amended)
+
+    reloaded = storage.load_prompt(updated)
+    assert [(s.title, s.content) for s in reloaded.sections] == [
+        ("Implementation", "Outline the service architecture."),
+        ("Testing", "Fake the mic.\n\nAnd the API."),
+    ]
+    assert reloaded.original_brief == "Add a PTT command"
+    assert "Outline the service architecture." in updated.prompt_path.read_text(encoding="utf-8")
+
+
+def test_relocating_a_renamed_revision_replaces_the_stale_copy(tmp_path: Path) -> None:
+    storage = PromptStorage(tmp_path / "staging", "{story_id}_{work_type}.md", "metadata.json")
+    pm_root = tmp_path / "project-management"
+    draft = storage.save(draft_prompt("Add a PTT command"), story_id="US-13")
+    storage.relocate_to_project_management(draft, pm_root)
+
+    enhanced = storage.save_revision(draft, _sample_prompt())
+    dest = storage.relocate_to_project_management(enhanced, pm_root)
+
+    assert sorted(path.name for path in dest.parent.glob("*.md")) == ["US-13_feature.md"]
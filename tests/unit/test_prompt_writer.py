@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import sqlite3
+from pathlib import Path
+from types import SimpleNamespace
+
+from lazy_ptt.audio.recorder import AudioBuffer
+from lazy_ptt.config import load_config
+from lazy_ptt.prompt.enhancer import draft_prompt
+from lazy_ptt.prompt.index import PromptIndex
+from lazy_ptt.prompt.manager import PromptStorage
+from lazy_ptt.prompt import writer as writer_module
+from lazy_ptt.prompt.writer import PromptWriter, write_atomic
+from lazy_ptt.services.daemon import PTTDaemon
+from lazy_ptt.services.journal import JobJournal
+from lazy_ptt.services.ptt_service import PTTService
+
+# Long enough that nothing is committed until something flushes.
+_NEVER = 60.0
+
+
+def _files(root: Path) -> list:
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*") if path.is_file())
+
+
+def test_atomic_write_replaces_without_leaving_temp_files(tmp_path: Path) -> None:
+    target = tmp_path / "story" / "prompt.md"
+    write_atomic(target, b"first")
+    write_atomic(target, b"second", fsync=True)
+
+    assert target.read_bytes() == b"second"
+    assert _files(tmp_path) == ["story/prompt.md"]
+
+
+def test_write_behind_save_returns_before_files_exist(tmp_path: Path) -> None:
+    writer = PromptWriter(flush_interval=_NEVER)
+    index = PromptIndex(tmp_path / "index.sqlite3")
+    storage = PromptStorage(
+        tmp_path / "staging", "{story_id}.md", "metadata.json", index=index, writer=writer
+    )
+
+    saved = storage.save(draft_prompt("Add a login page"), story_id="US-1")
+    moved = storage.relocate_to_project_management(saved, tmp_path / "pm", story_title="Login")
+
+    assert not saved.prompt_path.exists() and not moved.exists()
+    assert index.list().total == 0
+    storage.flush()
+    # The relocation copied a save that was still pending in the same batch.
+    assert moved.read_bytes() == saved.prompt_path.read_bytes()
+    assert json.loads(saved.metadata_path.read_text())["story_id"] == "US-1"
+    assert (moved.parent / "README.txt").read_text() == "Login\n"
+    assert index.list().total == 2
+    assert not [name for name in _files(tmp_path) if name.endswith(".tmp")]
+
+    # Reads flush on their own; after `close` saves fall back to synchronous writes.
+    revised = storage.save_revision(saved, draft_prompt("Add a login page with SSO"))
+    assert storage.read_metadata(revised)["revision"] == 2
+    storage.close()
+    later = storage.save(draft_prompt("Add a logout button"), story_id="US-2")
+    assert later.prompt_path.exists()
+
+
+class _FakeRecorder:
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> AudioBuffer:
+        return AudioBuffer(b"data", sample_rate=16000, channels=1, duration_seconds=1.0)
+
+
+class _FakeTranscriber:
+    def transcribe(self, _buffer, language=None):
+        return SimpleNamespace(text="Add dark mode", language=language, duration=1.0)
+
+
+class _FakeEnhancer:
+    def enhance(self, text, on_progress=None):
+        return draft_prompt(text)
+
+
+class _EventSource:
+    def __init__(self, daemon_ref, stop=None):
+        self._daemon_ref = daemon_ref
+        self._stop = stop
+        self._events = [
+            SimpleNamespace(kind=kind, binding="default") for kind in ("press", "release")
+        ]
+
+    def bind(self, name, hotkey):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def get(self, timeout=None):
+        if not self._events:
+            (self._stop or self._daemon_ref[0].request_stop)()
+            return None
+        return self._events.pop(0)
+
+
+def _write_behind_service(tmp_path, monkeypatch) -> PTTService:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("PTT_TIMING_HISTORY", "false")
+    monkeypatch.chdir(tmp_path)
+    config = load_config()
+    storage = PromptStorage(
+        config.paths.prompt_output_root,
+        "{story_id}.md",
+        "metadata.json",
+        writer=PromptWriter(flush_interval=_NEVER),
+    )
+    return PTTService(
+        config, _FakeRecorder(), _FakeTranscriber(), _FakeEnhancer(), storage, hotkey_listener=None
+    )
+
+
+def test_daemon_flushes_pending_writes_on_shutdown(tmp_path, monkeypatch) -> None:
+    service = _write_behind_service(tmp_path, monkeypatch)
+    storage = service.storage
+    ref = []
+    pending = []
+    daemon = PTTDaemon(
+        service,
+        auto_move=False,
+        hotkey_events=_EventSource(ref),
+        idle_sleep_seconds=0.01,
+        on_cycle=lambda outcome: pending.append(
+            (outcome.saved_prompt.prompt_path, outcome.saved_prompt.prompt_path.exists())
+        ),
+    )
+    ref.append(daemon)
+
+    daemon.run()
+
+    [(prompt_path, existed)] = pending
+    assert not existed
+    assert prompt_path.exists()
+    storage.close()
+
+
+def test_journal_marks_a_capture_stored_only_once_its_prompt_is_written(
+    tmp_path, monkeypatch
+) -> None:
+    service = _write_behind_service(tmp_path, monkeypatch)
+    journal = JobJournal(tmp_path / "journal.sqlite3")
+
+    def disk_full(path, data, fsync):
+        raise OSError(28, "No space left on device")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(writer_module, "_write_temp", disk_full)
+        ref = []
+        daemon = PTTDaemon(
+            service, hotkey_events=_EventSource(ref), journal=journal, idle_sleep_seconds=0.01
+        )
+        ref.append(daemon)
+        daemon.run()
+
+    # The commit failed, so the enhanced prompt is still waiting to be stored.
+    [job] = journal.unfinished()
+    assert job.stage == "enhanced"
+    assert not list(service.storage.output_root.rglob("*.md"))
+
+    # The next start replays it from the journal; no new capture this time.
+    events = _EventSource(ref)
+    events._events = []
+    ref[0] = PTTDaemon(service, hotkey_events=events, journal=journal, idle_sleep_seconds=0.01)
+    ref[0].run()
+    assert journal.unfinished() == []
+    assert len(list(service.storage.output_root.rglob("*.md"))) == 1
+    service.storage.close()
+    journal.close()
+
+
+def test_sigterm_stops_the_daemon_with_pending_writes_on_disk(tmp_path, monkeypatch) -> None:
+    service = _write_behind_service(tmp_path, monkeypatch)
+    journal = JobJournal(tmp_path / "journal.sqlite3")
+    ref = []
+    events = _EventSource(ref, stop=lambda: os.kill(os.getpid(), signal.SIGTERM))
+    daemon = PTTDaemon(service, hotkey_events=events, journal=journal, idle_sleep_seconds=0.01)
+    ref.append(daemon)
+    before = signal.getsignal(signal.SIGTERM)
+
+    with daemon.stop_on_sigterm():
+        daemon.run()  # returns only because SIGTERM requested the stop
+    journal.close()
+
+    assert signal.getsignal(signal.SIGTERM) is before
+    [prompt_path] = service.storage.output_root.rglob("*.md")
+    with sqlite3.connect(tmp_path / "journal.sqlite3") as db:
+        rows = db.execute("SELECT stage, prompt_path FROM jobs").fetchall()
+    assert rows == [("stored", str(prompt_path))]
+    service.storage.close()
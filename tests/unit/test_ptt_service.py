@@ -1,8 +1,11 @@
+import dataclasses
+import time
 from pathlib import Path
 
 from lazy_ptt.audio.recorder import AudioBuffer
 from lazy_ptt.config import (
     AppConfig,
+    CompactionConfig,
     OpenAIConfig,
     PTTConfig,
     PromptConfig,
@@ -11,6 +14,7 @@ from lazy_ptt.config import (
 )
 from lazy_ptt.prompt.enhancer import EnhancedPrompt, PromptSection
 from lazy_ptt.prompt.manager import PromptStorage
+from lazy_ptt.services.deferred import DeferredEnhancementWorker, EnhancementQueue
 from lazy_ptt.services.ptt_service import PTTService
 
 
@@ -155,3 +159,115 @@ def test_process_audio_buffer_moves_when_requested(tmp_path: Path) -> None:
     assert dest_dir.exists()
     assert (dest_dir / outcome.saved_prompt.prompt_path.name).exists()
     assert (dest_dir / "meta.json").exists()
+
+
+def test_compaction_preserves_original_brief(tmp_path: Path) -> None:
+    raw = "Um, implement implement push-to-talk, uh, capture"
+    service = _build_service(tmp_path, raw)
+    service.config = dataclasses.replace(
+        service.config, compaction=CompactionConfig(enabled=True)
+    )
+
+    buffer = AudioBuffer(b"data", sample_rate=16000, channels=1, duration_seconds=1.0)
+    outcome = service.process_audio_buffer(buffer, story_id="US-PTT")
+
+    assert service.enhancer.requests == ["Implement push-to-talk capture"]
+    assert outcome.enhanced.original_brief == raw
+    assert outcome.compaction is not None
+    assert outcome.compaction.saved_chars > 0
+
+
+class _OfflineEnhancer(_FakeEnhancer):
+    def enhance(self, text: str) -> EnhancedPrompt:
+        raise ConnectionError("offline")
+
+
+def test_deferred_mode_saves_draft_and_enhances_later(tmp_path: Path) -> None:
+    service = _build_service(tmp_path, "Implement push-to-talk")
+    queue = EnhancementQueue(tmp_path / "queue", retry_base_seconds=60)
+    service.enhancement_queue = queue
+    enhancer = service.enhancer
+    service.enhancer = _OfflineEnhancer()
+
+    buffer = AudioBuffer(b"data", sample_rate=16000, channels=1, duration_seconds=1.0)
+    outcome = service.process_audio_buffer(buffer, story_id="US-DRAFT")
+
+    assert outcome.deferred
+    assert outcome.enhanced.work_type == "DRAFT"
+    assert "Implement push-to-talk" in outcome.saved_prompt.prompt_path.read_text(encoding="utf-8")
+    assert len(queue) == 1
+
+    worker = DeferredEnhancementWorker(service, queue)
+    assert worker.run_pending() == 0
+    (job,) = queue.pending()
+    assert job.attempts == 1 and "offline" in (job.last_error or "")
+    assert queue.due() == []
+
+    service.enhancer = enhancer
+    assert worker.run_pending() == 0  # still backing off
+    assert queue.due(now=job.next_attempt_at + 1)
+    job.next_attempt_at = 0.0
+    queue._write(job)
+    assert worker.run_pending() == 1
+
+    assert len(queue) == 0
+    metadata = service.storage.read_metadata(service.storage.find_saved_prompt("US-DRAFT"))
+    assert metadata["work_type"] == "FEATURE"
+    assert metadata["original_brief"] == "Implement push-to-talk"
+    assert metadata["revision"] == 2
+
+
+def test_listen_once_records_stage_timings(tmp_path: Path) -> None:
+    service = _build_service(tmp_path, "Implement push-to-talk")
+
+    outcome = service.listen_once(story_id="US-PTT", story_title="PTT", auto_move=True)
+
+    assert {"record", "render", "storage_write", "relocate"} <= set(outcome.timings)
+    assert all(ms >= 0.0 for ms in outcome.timings.values())
+    # A second, independent call starts from a fresh timer.
+    again = service.enhance_text("Add a settings page", story_id="US-TWO")
+    assert "record" not in again.timings and "storage_write" in again.timings
+
+
+def test_apply_config_rebuilds_only_changed_components(tmp_path: Path) -> None:
+    service = _build_service(tmp_path, "Implement push-to-talk")
+    enhancers = []
+    service.enhancer.with_config = lambda openai: enhancers.append(openai) or _FakeEnhancer()
+    transcriber, recorder, storage = service.transcriber, service.recorder, service.storage
+    config = service.config
+    edited = dataclasses.replace(
+        config,
+        ptt=dataclasses.replace(config.ptt, hotkey="f8"),
+        whisper=dataclasses.replace(config.whisper, beam_size=1),
+        openai=dataclasses.replace(config.openai, temperature=0.7),
+        paths=dataclasses.replace(config.paths, prompt_output_root=tmp_path / "elsewhere"),
+    )
+
+    update = service.apply_config(edited)
+
+    assert sorted(update.applied) == ["openai.temperature", "ptt.hotkey", "whisper.beam_size"]
+    assert update.restart_required == ["paths.prompt_output_root"]
+    assert service.transcriber is transcriber
+    assert service.transcriber.config.beam_size == 1
+    assert service.recorder is recorder and service.storage is storage
+    assert enhancers == [edited.openai]
+    assert service.hotkey_listener.hotkey == "f8"
+    assert service.config.paths.prompt_output_root == tmp_path / "staging"
+    assert service.apply_config(service.config).applied == []
+
+
+def test_queued_job_is_claimed_by_one_process_only(tmp_path: Path) -> None:
+    daemon_queue = EnhancementQueue(tmp_path / "queue")
+    drain_queue = EnhancementQueue(tmp_path / "queue", claim_timeout_seconds=60)
+    daemon_queue.enqueue("US-1", tmp_path / "US-1.md", "Add dark mode")
+    (job,) = drain_queue.due()
+
+    assert daemon_queue.claim(job)
+    assert not drain_queue.claim(job)
+    assert drain_queue.due() == [] and len(drain_queue) == 1
+
+    # A claim abandoned by a crashed process is released once it times out.
+    assert [stale.job_id for stale in drain_queue.due(now=time.time() + 61)] == [job.job_id]
+    assert drain_queue.claim(job)
+    drain_queue.complete(job)
+    assert len(daemon_queue) == 0
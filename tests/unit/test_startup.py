@@ -0,0 +1,100 @@
+"""Start-up budgets for the CLI, measured with `python -X importtime`."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+from lazy_ptt.cli import build_parser
+from lazy_ptt.prompt.enhancer import draft_prompt
+from lazy_ptt.prompt.manager import PromptStorage
+
+# Dependencies that only the commands actually recording, transcribing or
+# enhancing may import.
+HEAVY_MODULES = ("numpy", "openai", "faster_whisper", "sounddevice", "pynput", "fastapi")
+# Import time (ms) on top of a bare interpreter; generous for slow CI machines.
+HELP_BUDGET_MS = 150
+CREATE_FEATURE_BUDGET_MS = 100
+
+
+def _import_profile(code: str, cwd: Optional[Path] = None, env: Optional[dict] = None):
+    """Modules imported by `code` and their self time in microseconds."""
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env={**os.environ, **(env or {})},
+        timeout=60,
+    )
+    modules: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us)
+    return proc, modules
+
+
+def _added_ms(modules: Dict[str, int]) -> float:
+    _, baseline = _import_profile("pass")
+    return sum(us for name, us in modules.items() if name not in baseline) / 1000.0
+
+
+def _run_cli(argv: List[str], **kwargs):
+    return _import_profile(
+        f"import sys; from lazy_ptt.cli import main; sys.exit(main({argv!r}))", **kwargs
+    )
+
+
+def _subcommands() -> List[str]:
+    parser = build_parser()
+    action = next(a for a in parser._actions if a.dest == "command")
+    return sorted(action.choices)
+
+
+@pytest.mark.parametrize("command", _subcommands())
+def test_subcommand_help_starts_without_heavy_imports(command):
+    proc, modules = _run_cli([command, "--help"])
+
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert not [name for name in HEAVY_MODULES if name in modules]
+    assert _added_ms(modules) < HELP_BUDGET_MS
+
+
+def test_create_feature_is_a_fast_file_copy(tmp_path):
+    staging = tmp_path / "prompts"
+    saved = PromptStorage(staging, "{story_id}_enhanced-prompt.md", "prompt-metadata.json").save(
+        draft_prompt("Move this prompt into project management"), story_id="US-1.1"
+    )
+    env = {
+        "OPENAI_API_KEY": "test",
+        "PTT_OUTPUT_ROOT": str(staging),
+        "PROJECT_MANAGEMENT_ROOT": str(tmp_path / "pm"),
+        "LAZY_PTT_STATE_DIR": str(tmp_path / "state"),
+    }
+
+    proc, modules = _run_cli(
+        ["create-feature", str(saved.prompt_path)], cwd=tmp_path, env=env
+    )
+
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert list((tmp_path / "pm").rglob(saved.prompt_path.name))
+    assert not [name for name in HEAVY_MODULES if name in modules]
+    assert _added_ms(modules) < CREATE_FEATURE_BUDGET_MS
+
+    # Without the prompt index, create-feature never loads SQLite at all.
+    saved.prompt_path.parent.joinpath("prompt-metadata.json").touch()
+    proc, modules = _run_cli(
+        ["create-feature", str(saved.prompt_path)],
+        cwd=tmp_path,
+        env={**env, "PTT_PROMPT_INDEX": "false"},
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert "sqlite3" not in modules
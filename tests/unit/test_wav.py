@@ -0,0 +1,36 @@
+import io
+import wave
+
+import numpy as np
+
+from lazy_ptt.audio.wav import Pcm16Decoder, parse_wav_header
+
+
+def _wav_bytes(samples: np.ndarray, rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(rate)
+        handle.writeframes(samples.astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def test_parse_header_and_decode_in_odd_chunks() -> None:
+    pcm = np.arange(-500, 500, dtype=np.int16) * 30
+    data = _wav_bytes(pcm)
+
+    wav = parse_wav_header(data[:64])
+    assert wav is not None and wav.whisper_native
+    assert wav.data_size == pcm.size * 2
+    assert parse_wav_header(data[:20]) is None
+    assert not parse_wav_header(_wav_bytes(pcm, rate=8000)).whisper_native
+
+    decoder = Pcm16Decoder(wav.data_size)
+    body = data[wav.data_offset :] + b"LIST\x04\x00\x00\x00junk"  # trailing chunk ignored
+    for start in range(0, len(body), 333):  # odd sizes split samples across chunks
+        decoder.feed(body[start : start + 333])
+    samples = decoder.finish()
+
+    assert samples.dtype == np.float32
+    np.testing.assert_allclose(samples, pcm / 32768.0)
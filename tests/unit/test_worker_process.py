@@ -0,0 +1,98 @@
+import os
+import signal
+from pathlib import Path
+
+import pytest
+
+from lazy_ptt.audio.recorder import AudioBuffer
+from lazy_ptt.config import (
+    AppConfig,
+    OpenAIConfig,
+    PromptConfig,
+    ProjectPaths,
+    PTTConfig,
+    WhisperConfig,
+)
+from lazy_ptt.prompt.enhancer import EnhancedPrompt
+from lazy_ptt.prompt.manager import PromptStorage
+from lazy_ptt.services.ptt_service import PTTService
+from lazy_ptt.services.worker_process import InferenceWorkerError, InferenceWorkerProcess
+from lazy_ptt.stt.whisper import TranscriptionResult
+
+
+class _EchoTranscriber:
+    def transcribe(self, buffer: AudioBuffer, language=None) -> TranscriptionResult:
+        if buffer.wav_bytes == b"crash":
+            os.kill(os.getpid(), signal.SIGKILL)
+        return TranscriptionResult(
+            text=buffer.wav_bytes.decode("utf-8"),
+            language=language,
+            duration=buffer.duration_seconds,
+            temperature=0.0,
+        )
+
+
+class _EchoEnhancer:
+    def enhance(self, text: str) -> EnhancedPrompt:
+        return EnhancedPrompt(
+            work_type="FEATURE",
+            summary=f"Summary for {text}",
+            objectives=[],
+            risks=[],
+            milestones=[],
+            sections=[],
+            acceptance_criteria=[],
+            suggested_story_id=None,
+            original_brief=text,
+        )
+
+
+def _fake_service(config: AppConfig) -> PTTService:
+    storage = PromptStorage(
+        config.paths.prompt_output_root,
+        config.prompt.filename_pattern,
+        config.prompt.metadata_filename,
+    )
+    return PTTService(config, None, _EchoTranscriber(), _EchoEnhancer(), storage, None)
+
+
+def _config(tmp_path: Path) -> AppConfig:
+    return AppConfig(
+        paths=ProjectPaths(
+            repository_root=tmp_path,
+            project_management_root=tmp_path / "pm",
+            prompt_output_root=tmp_path / "staging",
+        ),
+        ptt=PTTConfig("en", 16000, 64, 0.015, 120, "space", None),
+        whisper=WhisperConfig("tiny", "cpu", "int8", tmp_path / ".cache"),
+        openai=OpenAIConfig("test", "stub", 0.0, 100, None),
+        prompt=PromptConfig("{story_id}.md", "meta.json"),
+    )
+
+
+@pytest.fixture()
+def worker(tmp_path: Path):
+    worker = InferenceWorkerProcess(_config(tmp_path), service_factory=_fake_service)
+    worker.start()
+    yield worker
+    worker.stop()
+
+
+def test_worker_processes_audio_from_shared_memory(worker: InferenceWorkerProcess) -> None:
+    buffer = AudioBuffer(b"add oauth login", sample_rate=16000, channels=1, duration_seconds=2.0)
+
+    transcription = worker.transcribe_buffer(buffer)
+    outcome = worker.complete_transcription(transcription, story_id="US-W1")
+
+    assert transcription.text == "add oauth login"
+    assert outcome.enhanced.summary == "Summary for add oauth login"
+    assert outcome.saved_prompt.prompt_path.exists()
+
+
+def test_worker_restarts_after_crash(worker: InferenceWorkerProcess) -> None:
+    crash = AudioBuffer(b"crash", sample_rate=16000, channels=1, duration_seconds=0.1)
+    with pytest.raises(InferenceWorkerError):
+        worker.transcribe_buffer(crash)
+
+    assert worker.ping()
+    assert worker.restarts == 1
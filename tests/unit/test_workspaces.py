@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import dataclasses
+from types import SimpleNamespace
+
+import pytest
+
+from lazy_ptt.audio.recorder import AudioBuffer
+from lazy_ptt.config import ConfigError, WorkspaceConfig, load_config
+from lazy_ptt.prompt.enhancer import draft_prompt
+from lazy_ptt.services.control import ControlServer, DaemonClient
+from lazy_ptt.services.daemon import PTTDaemon
+from lazy_ptt.services.ptt_service import PTTService
+from lazy_ptt.services.workspaces import WorkspaceRegistry
+
+
+class _FakeRecorder:
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> AudioBuffer:
+        return AudioBuffer(b"data", sample_rate=16000, channels=1, duration_seconds=1.0)
+
+
+class _FakeTranscriber:
+    def transcribe(self, _buffer, language=None):
+        return SimpleNamespace(text="Add dark mode", language=language, duration=1.0)
+
+
+class _FakeEnhancer:
+    def enhance(self, text, on_progress=None):
+        return draft_prompt(text)
+
+    def with_config(self, openai):
+        return _FakeEnhancer()
+
+
+class _EventSource:
+    def __init__(self, daemon_ref, events):
+        self._daemon_ref = daemon_ref
+        self._events = [SimpleNamespace(kind=kind, binding=binding) for kind, binding in events]
+        self.bindings = {}
+
+    def bind(self, name, hotkey):
+        self.bindings[name] = hotkey
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def get(self, timeout=None):
+        if not self._events:
+            self._daemon_ref[0].request_stop()
+            return None
+        return self._events.pop(0)
+
+
+@pytest.fixture()
+def projects(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("PTT_TIMING_HISTORY", "false")
+    # Path variables describe the daemon's own project, never a workspace.
+    monkeypatch.setenv("PROJECT_MANAGEMENT_ROOT", str(tmp_path / "main" / "pm"))
+    monkeypatch.chdir(tmp_path)
+    other = tmp_path / "other"
+    (other / "config").mkdir(parents=True)
+    (other / "config" / "defaults.yaml").write_text(
+        "prompt:\n  filename_pattern: '{story_id}.md'\n", encoding="utf-8"
+    )
+    config = load_config()
+    service = PTTService(
+        config,
+        _FakeRecorder(),
+        _FakeTranscriber(),
+        _FakeEnhancer(),
+        PTTService._build_storage(config),
+        hotkey_listener=None,
+    )
+    workspaces = WorkspaceRegistry.from_config(
+        service, [WorkspaceConfig("other", other, hotkey="<f9>")]
+    )
+    return service, workspaces, other
+
+
+def test_workspaces_share_components_but_not_paths(projects):
+    service, workspaces, other = projects
+    workspace = workspaces.get("other")
+
+    assert workspace.service.transcriber is service.transcriber
+    assert workspace.service.enhancer is service.enhancer
+    assert workspace.service.config.paths.project_management_root == other / "project-management"
+    assert workspace.service.config.prompt.filename_pattern == "{story_id}.md"
+    assert workspace.service.config.paths.state_dir == other / ".lazy-ptt"
+    assert workspaces.active is workspaces.primary
+    with pytest.raises(ConfigError, match="Unknown workspace"):
+        workspaces.activate("missing")
+
+
+def test_daemon_routes_captures_by_workspace_hotkey(projects):
+    service, workspaces, other = projects
+    ref = []
+    source = _EventSource(
+        ref,
+        [
+            ("press", "workspace:other"),
+            ("release", "workspace:other"),
+            ("press", "default"),  # the default hotkey records into the active workspace
+            ("release", "default"),
+        ],
+    )
+    stored = []
+    daemon = PTTDaemon(
+        service,
+        auto_move=False,
+        hotkey_events=source,
+        workspaces=workspaces,
+        idle_sleep_seconds=0.01,
+        on_cycle=lambda outcome: stored.append(outcome.saved_prompt.prompt_path),
+    )
+    ref.append(daemon)
+
+    daemon.run()
+
+    assert source.bindings == {"workspace:other": "<f9>"}
+    assert len(stored) == 2
+    assert all(path.is_relative_to(other) for path in stored)
+    assert workspaces.active.name == "other"
+
+
+def test_config_changes_swap_in_updated_workspace_services(projects):
+    service, workspaces, _other = projects
+    before = workspaces.get("other").service
+    config = service.config
+    openai = dataclasses.replace(config.openai, temperature=0.7)
+    edits = [dataclasses.replace(config, openai=openai)]
+    ref = []
+    daemon = PTTDaemon(
+        service,
+        hotkey_events=_EventSource(ref, []),
+        workspaces=workspaces,
+        config_watcher=SimpleNamespace(poll=lambda: edits.pop() if edits else None),
+        idle_sleep_seconds=0.01,
+    )
+    ref.append(daemon)
+
+    daemon.run()
+
+    primary, updated = workspaces.primary.service, workspaces.get("other").service
+    assert daemon.service is primary and primary is not service
+    assert primary.config.openai.temperature == 0.7
+    assert updated is not before and updated.enhancer is primary.enhancer
+    # Requests still running on the old services keep a consistent view.
+    assert service.config is config and before.enhancer is service.enhancer
+
+
+def test_control_socket_switches_workspace(projects, tmp_path):
+    service, workspaces, other = projects
+    server = ControlServer(service, tmp_path / "daemon.sock", workspaces=workspaces)
+    server.start()
+    try:
+        client = DaemonClient.connect(server.socket_path)
+        assert [entry["active"] for entry in client.workspaces()] == [True, False]
+
+        listed = client.activate_workspace("other")
+        outcome = client.enhance_text("Add an export button", story_id="US-9")
+        client.close()
+    finally:
+        server.stop()
+
+    assert {entry["name"]: entry["active"] for entry in listed}["other"] is True
+    assert outcome.saved_prompt.prompt_path == other / "project-management/prompts/US-9/US-9.md"